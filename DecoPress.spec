@@ -8,7 +8,8 @@ a = Analysis(
     binaries=[],
     datas=[
         ('DecoPressLogo.ico', '.'),
-        ('PackingSlipTemplate.xlsx', '.')
+        ('PackingSlipTemplate.xlsx', '.'),
+        ('garment_keywords.json', '.')
     ],
     hiddenimports=['win32com.client'],
     hookspath=[],
@@ -9,7 +9,8 @@ a = Analysis(
     datas=[
         ('DecoPressLogo.jpg', '.'),
         ('DecoPressLogo.ico', '.'),
-        ('PackingSlipTemplate.xlsx', '.')
+        ('PackingSlipTemplate.xlsx', '.'),
+        ('garment_keywords.json', '.')
     ],
     hiddenimports=[
         'win32com.client',
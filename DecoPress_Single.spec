@@ -10,7 +10,8 @@ a = Analysis(
         ('DecoPressLogo.jpg', '.'),
         ('DecoPressLogo.ico', '.'),
         ('PackingSlipTemplate.xlsx', '.'),
-        ('DECOPRESS DAILY Template.xlsx', '.')
+        ('DECOPRESS DAILY Template.xlsx', '.'),
+        ('garment_keywords.json', '.')
     ],
     hiddenimports=[
         'win32com.client',
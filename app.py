@@ -3,6 +3,11 @@ from tkinter import ttk, messagebox
 import os
 import daily_orders
 import packing_slip
+import session_store
+import browser_host
+import office_converter
+import task_runner
+from utils import get_job_numbers, get_download_path
 import random
 import threading
 import subprocess
@@ -56,8 +61,9 @@ class LoadingScreen:
         "Did you know? The person who created this loading screen deserves a raise.",
     ]
     
-    def __init__(self, parent):
+    def __init__(self, parent, on_cancel=None):
         self.parent = parent
+        self.on_cancel = on_cancel
         
         # First withdraw the parent to prevent flashing
         parent.withdraw()
@@ -65,7 +71,7 @@ class LoadingScreen:
         # Create an independent toplevel window with higher visibility
         self.top = tk.Toplevel()  # Create without parent to make it more independent
         self.top.title("⚡ PROCESSING ORDERS ⚡")
-        self.top.geometry("550x350")
+        self.top.geometry("550x400")
         self.top.resizable(False, False)
         
         # Configure window appearance for maximum visibility
@@ -120,7 +126,7 @@ class LoadingScreen:
         
         # Calculate position
         width = 550
-        height = 350
+        height = 400
         x = (screen_width // 2) - (width // 2)
         y = (screen_height // 2) - (height // 2)
         
@@ -162,13 +168,31 @@ class LoadingScreen:
                                fg="#000080")  # Navy blue text
         self.fact_label.pack(pady=(0, 10))
         
+        # What the task is doing right now
+        self.status_label = tk.Label(main_frame,
+                                 text="Starting...",
+                                 font=("Arial", 10, "bold"),
+                                 bg="#FFD700",
+                                 fg="#000000")
+        self.status_label.pack(pady=(0, 5))
+        
         # "Please wait" label
         please_wait = tk.Label(main_frame,
                            text="Please wait - do not close this window",
                            font=("Arial", 10, "italic"),
                            bg="#FFD700",
                            fg="#8B0000")  # Dark red
-        please_wait.pack(pady=(10, 0))
+        please_wait.pack(pady=(5, 0))
+        
+        # Cancel stops the task at the next safe point
+        if self.on_cancel:
+            self.cancel_button = tk.Button(main_frame,
+                                       text="Cancel",
+                                       command=self.cancel,
+                                       font=("Arial", 10, "bold"),
+                                       bg="#FFFFFF",
+                                       fg="#8B0000")
+            self.cancel_button.pack(pady=(10, 0))
         
         # Start progress bar immediately
         self.progress.start(8)  # Faster animation
@@ -229,6 +253,19 @@ class LoadingScreen:
         
         update_fact()
     
+    def set_status(self, text):
+        """Show the task's current phase"""
+        try:
+            if self.top.winfo_exists():
+                self.status_label.config(text=text)
+        except Exception:
+            pass  # Window might have been destroyed
+    
+    def cancel(self):
+        """Ask the running task to stop"""
+        self.cancel_button.config(state=tk.DISABLED, text="Cancelling...")
+        self.on_cancel()
+    
     def close(self):
         """Close the loading screen"""
         try:
@@ -290,6 +327,39 @@ class DecoPressApp:
         
         self.setup_ui()
         
+        # Start the shared browser in the background so runs can attach to it
+        # Created here so on_close can stop a browser that is still starting
+        self.browser_host = browser_host.BrowserHost()
+        threading.Thread(target=self.start_browser_host, daemon=True).start()
+        
+        # Without Excel, PDFs go through one headless LibreOffice when it is installed
+        if not packing_slip.HAS_WIN32COM and office_converter.find_office_executable():
+            threading.Thread(target=self.start_office_converter, daemon=True).start()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+    def start_browser_host(self):
+        """Launch the shared browser host used by both tools"""
+        try:
+            self.browser_host.browser_path = daily_orders.ensure_browser_installed()
+            self.browser_host.start()
+        except Exception as e:
+            # The tools launch their own browser when no host is running
+            print(f"Could not start browser host: {str(e)}")
+    
+    def start_office_converter(self):
+        """Start the headless LibreOffice used for PDFs when Excel is not available"""
+        try:
+            office_converter.start_converter()
+        except Exception as e:
+            # Packing slip PDFs are drawn natively when no converter is running
+            print(f"Could not start office converter: {str(e)}")
+    
+    def on_close(self):
+        """Stop the shared browser host and office converter and close the app"""
+        self.browser_host.stop()
+        office_converter.stop_converter()
+        self.root.destroy()
+        
     def setup_ui(self):
         # Main container
         main_container = ttk.Frame(self.root, padding=30)
@@ -393,6 +463,11 @@ class DecoPressApp:
         )
         packing_btn.pack(pady=10, fill=tk.X)
         
+        batch_btn = self.create_button(
+            packing_frame, "Batch Packing Slips", self.run_batch_packing_slips, is_primary=False
+        )
+        batch_btn.pack(pady=(0, 10), fill=tk.X)
+        
         # Add a clear credentials button
         credentials_btn = self.create_button(
             main_container, "Clear Saved Credentials", self.clear_credentials, is_primary=False
@@ -555,6 +630,12 @@ class DecoPressApp:
         app_data_dir = os.path.join(os.path.expanduser("~"), ".decopress")
         credentials_file = os.path.join(app_data_dir, "credentials.json")
         
+        # Also drop the saved browser session so the next run logs in again
+        try:
+            session_store.clear_session_state()
+        except Exception as e:
+            print(f"Could not clear saved session: {str(e)}")
+        
         if os.path.exists(credentials_file):
             try:
                 os.remove(credentials_file)
@@ -579,86 +660,19 @@ class DecoPressApp:
             
         return btn
         
-    def run_daily_orders(self):
-        """Run daily orders script with loading screen"""
-        # Create a more visible loading screen
+    def run_in_background(self, func, on_success):
+        """
+        Run func on a worker thread behind the loading screen. Progress and
+        dialogs come back through task_runner; on_success(result) runs on the
+        Tk thread once the task is done.
+        """
+        if task_runner.is_busy():
+            messagebox.showinfo("Please wait", "Another task is still running.")
+            return
+        
         try:
-            # Show loading screen with a more direct approach
-            loading_screen = LoadingScreen(self.root)
-            
-            # Process events to let UI update, but don't try to force focus
-            for _ in range(5):  # Fewer update cycles
-                try:
-                    # Update window without forcing focus
-                    loading_screen.top.update_idletasks()
-                    
-                    # Process UI events
-                    self.root.update_idletasks()
-                except Exception as e:
-                    print(f"Error during initial loading screen update: {e}")
-                    pass
-            
-            # Now run the task directly (not in a thread)
-            try:
-                result_file = None
-                
-                # Keep refreshing the loading screen while running the task
-                def keep_alive():
-                    try:
-                        # Only update if the window still exists
-                        if hasattr(loading_screen, 'top') and loading_screen.top.winfo_exists():
-                            # Don't lift or try to take focus
-                            try:
-                                loading_screen.top.update()
-                            except Exception as e:
-                                print(f"Error updating loading screen: {e}")
-                            # Schedule the next update
-                            try:
-                                loading_screen.top.after(100, keep_alive)
-                            except Exception as e:
-                                print(f"Error scheduling next keep_alive: {e}")
-                    except Exception as e:
-                        print(f"Error in keep_alive: {e}")
-                        pass
-                
-                # Start the keep-alive function
-                loading_screen.top.after(100, keep_alive)
-                
-                # Run daily orders
-                result_file = daily_orders.run()
-                
-                # Add to recent files if successful
-                if result_file and os.path.exists(result_file):
-                    self.add_recent_file(result_file)
-                    
-                    # Close loading screen
-                    loading_screen.close()
-                    self.root.deiconify()
-                    
-                    # Show success message with filename
-                    messagebox.showinfo("Success", 
-                        f"Daily orders have been successfully exported!\n\nFile: {os.path.basename(result_file)}")
-                    
-                    # Open the file
-                    self.open_file(result_file)
-                else:
-                    # Close loading screen
-                    loading_screen.close()
-                    self.root.deiconify()
-                    
-                    # Generic success message if no file was returned
-                    messagebox.showinfo("Success", "Daily orders process completed.")
-                
-            except Exception as e:
-                # Close loading screen
-                try:
-                    loading_screen.close()
-                    self.root.deiconify()
-                except:
-                    pass
-                
-                # Show error
-                messagebox.showerror("Error", f"An error occurred: {str(e)}")
+            task = None
+            loading_screen = LoadingScreen(self.root, on_cancel=lambda: task.cancel())
         except Exception as e:
             # If loading screen creation fails
             try:
@@ -666,99 +680,110 @@ class DecoPressApp:
             except:
                 pass
             messagebox.showerror("Error", f"Could not create loading screen: {str(e)}")
+            return
+        
+        def on_done(result, error):
+            # Close loading screen
+            try:
+                loading_screen.close()
+                self.root.deiconify()
+            except:
+                pass
+            
+            if isinstance(error, task_runner.TaskCancelled):
+                messagebox.showinfo("Cancelled", "The task was cancelled.")
+            elif error is not None:
+                messagebox.showerror("Error", f"An error occurred: {str(error)}")
+            else:
+                try:
+                    on_success(result)
+                except Exception as e:
+                    messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        
+        task = task_runner.BackgroundTask(self.root, func, on_done, on_progress=loading_screen.set_status)
+        task.start()
+    
+    def run_daily_orders(self):
+        """Run daily orders script with loading screen"""
+        self.run_in_background(daily_orders.run, self.finish_daily_orders)
+    
+    def finish_daily_orders(self, result_file):
+        # Add to recent files if successful
+        if result_file and os.path.exists(result_file):
+            self.add_recent_file(result_file)
+            
+            # Show success message with filename
+            messagebox.showinfo("Success", 
+                f"Daily orders have been successfully exported!\n\nFile: {os.path.basename(result_file)}")
+            
+            # Open the file
+            self.open_file(result_file)
+        else:
+            # Generic success message if no file was returned
+            messagebox.showinfo("Success", "Daily orders process completed.")
     
     def run_packing_slip(self):
         """Run packing slip script with loading screen"""
-        # Create a more visible loading screen
-        try:
-            # Show loading screen with a more direct approach
-            loading_screen = LoadingScreen(self.root)
+        self.run_in_background(packing_slip.run, self.finish_packing_slip)
+    
+    def finish_packing_slip(self, result_files):
+        # Add to recent files if successful
+        if result_files:
+            excel_path, pdf_path = result_files
+            if excel_path and os.path.exists(excel_path):
+                self.add_recent_file(excel_path)
+            if pdf_path and os.path.exists(pdf_path):
+                self.add_recent_file(pdf_path)
             
-            # Process events to let UI update, but don't try to force focus
-            for _ in range(5):  # Fewer update cycles
-                try:
-                    # Update window without forcing focus
-                    loading_screen.top.update_idletasks()
-                    
-                    # Process UI events
-                    self.root.update_idletasks()
-                except Exception as e:
-                    print(f"Error during initial loading screen update: {e}")
-                    pass
+            # Show success message
+            messagebox.showinfo("Success", "Packing slip has been successfully created!")
             
-            # Now run the task directly (not in a thread)
-            try:
-                # Keep refreshing the loading screen while running the task
-                def keep_alive():
-                    try:
-                        # Only update if the window still exists
-                        if hasattr(loading_screen, 'top') and loading_screen.top.winfo_exists():
-                            # Don't lift or try to take focus
-                            try:
-                                loading_screen.top.update()
-                            except Exception as e:
-                                print(f"Error updating loading screen: {e}")
-                            # Schedule the next update
-                            try:
-                                loading_screen.top.after(100, keep_alive)
-                            except Exception as e:
-                                print(f"Error scheduling next keep_alive: {e}")
-                    except Exception as e:
-                        print(f"Error in keep_alive: {e}")
-                        pass
-                
-                # Start the keep-alive function
-                loading_screen.top.after(100, keep_alive)
-                
-                result_files = None
-                
-                # Run packing slip
-                result_files = packing_slip.run()
-                
-                # Add to recent files if successful
-                if result_files:
-                    excel_path, pdf_path = result_files
-                    if excel_path and os.path.exists(excel_path):
-                        self.add_recent_file(excel_path)
-                    if pdf_path and os.path.exists(pdf_path):
-                        self.add_recent_file(pdf_path)
-                
-                    # Close loading screen
-                    loading_screen.close()
-                    self.root.deiconify()
-                    
-                    # Show success message
-                    messagebox.showinfo("Success", "Packing slip has been successfully created!")
-                    
-                    # Open the PDF if available, otherwise Excel
-                    file_to_open = pdf_path if pdf_path and os.path.exists(pdf_path) else excel_path
-                    if file_to_open:
-                        self.open_file(file_to_open)
+            # Open the PDF if available, otherwise Excel
+            file_to_open = pdf_path if pdf_path and os.path.exists(pdf_path) else excel_path
+            if file_to_open:
+                self.open_file(file_to_open)
+        else:
+            # Generic success message if no file was returned
+            messagebox.showinfo("Success", "Packing slip process completed.")
+
+    def run_batch_packing_slips(self):
+        """Create packing slips for a list of jobs in one session"""
+        # Ask for the jobs before the loading screen covers the window
+        job_numbers = get_job_numbers()
+        if not job_numbers:
+            return
+        
+        def finish(results):
+            created = 0
+            failed = []
+            blank = []
+            for job_number, result in results.items():
+                if isinstance(result, tuple):
+                    created += 1
+                    excel_path, pdf_path, blank_fields = result
+                    for path in (excel_path, pdf_path):
+                        if path and os.path.exists(path):
+                            self.add_recent_file(path)
+                    if blank_fields:
+                        blank.append(f"{job_number}: {', '.join(blank_fields)}")
                 else:
-                    # Close loading screen
-                    loading_screen.close()
-                    self.root.deiconify()
-                    
-                    # Generic success message if no file was returned
-                    messagebox.showinfo("Success", "Packing slip process completed.")
-                
-            except Exception as e:
-                # Close loading screen
-                try:
-                    loading_screen.close()
-                    self.root.deiconify()
-                except:
-                    pass
-                
-                # Show error
-                messagebox.showerror("Error", f"An error occurred: {str(e)}")
-        except Exception as e:
-            # If loading screen creation fails
-            try:
-                self.root.deiconify()  # Make sure main window is shown
-            except:
-                pass
-            messagebox.showerror("Error", f"Could not create loading screen: {str(e)}")
+                    failed.append(f"{job_number}: {result}")
+            
+            summary = f"Created {created} of {len(job_numbers)} packing slips."
+            if blank:
+                # Batch slips leave the quantities nobody entered blank - say which
+                summary += "\n\nLeft blank, fill in by hand:\n" + "\n".join(blank[:15])
+                if len(blank) > 15:
+                    summary += f"\n... and {len(blank) - 15} more"
+            if failed:
+                summary += "\n\nFailed:\n" + "\n".join(failed[:15])
+                if len(failed) > 15:
+                    summary += f"\n... and {len(failed) - 15} more"
+            messagebox.showinfo("Batch Packing Slips", summary)
+            if created:
+                self.open_file(get_download_path())
+        
+        self.run_in_background(lambda: packing_slip.run_batch(job_numbers), finish)
 
 if __name__ == "__main__":
     root = tk.Tk()
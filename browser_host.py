@@ -0,0 +1,218 @@
+"""
+Long-lived shared browser that the daily orders and packing slip tools attach to.
+
+The host starts Chromium once with a remote debugging (CDP) port and a
+persistent profile under ~/.decopress, and writes the endpoint to
+~/.decopress/browser_host.json. Each run connects with connect_over_cdp and
+gets a fresh page in the shared default context, so the browser cold start
+and the login only happen once per app session. When no host is running the
+tools fall back to launching their own browser.
+"""
+import os
+import json
+import time
+import threading
+import subprocess
+import urllib.request
+from session_store import new_session_context, load_session_state
+
+HOST_PORT = 9333
+HOST_STARTUP_TIMEOUT = 20  # seconds
+
+def _get_app_data_dir():
+    """Get the application data directory"""
+    app_data_dir = os.path.join(os.path.expanduser("~"), ".decopress")
+    os.makedirs(app_data_dir, exist_ok=True)
+    return app_data_dir
+
+def _get_host_file():
+    return os.path.join(_get_app_data_dir(), "browser_host.json")
+
+def _endpoint_is_alive(endpoint):
+    """Check that a CDP endpoint answers /json/version"""
+    try:
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=1) as response:
+            return "webSocketDebuggerUrl" in json.loads(response.read().decode())
+    except Exception:
+        return False
+
+def get_host_endpoint():
+    """Return the CDP endpoint of a running browser host, or None"""
+    host_file = _get_host_file()
+    if not os.path.exists(host_file):
+        return None
+    try:
+        with open(host_file, "r") as f:
+            endpoint = json.load(f).get("endpoint")
+    except Exception as e:
+        print(f"Error reading browser host file: {str(e)}")
+        return None
+
+    if endpoint and _endpoint_is_alive(endpoint):
+        return endpoint
+    return None
+
+def _find_chromium_executable():
+    """Find the Chromium that Playwright would launch"""
+    from playwright.sync_api import sync_playwright
+    with sync_playwright() as p:
+        return p.chromium.executable_path
+
+class BrowserHost:
+    """Background Chromium process exposing a CDP endpoint"""
+
+    def __init__(self, port=HOST_PORT, browser_path=None, headless=True):
+        self.port = port
+        self.browser_path = browser_path
+        self.headless = headless
+        self.process = None
+        # stop() may run on another thread while start() is still launching
+        self._lock = threading.Lock()
+        self._stopped = False
+
+    @property
+    def endpoint(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        """Launch the browser and wait until the CDP endpoint answers"""
+        if self.is_running():
+            return self.endpoint
+
+        # Another app instance may already be hosting a browser
+        existing = get_host_endpoint()
+        if existing:
+            print(f"Browser host already running at {existing}")
+            return existing
+
+        executable = self.browser_path or _find_chromium_executable()
+        profile_dir = os.path.join(_get_app_data_dir(), "browser_profile")
+        args = [
+            executable,
+            f"--remote-debugging-port={self.port}",
+            f"--user-data-dir={profile_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+        ]
+        if self.headless:
+            args.append("--headless=new")
+        args.append("about:blank")
+
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError("Browser host was stopped during startup")
+            print(f"Starting browser host: {executable}")
+            self.process = subprocess.Popen(
+                args,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+
+        deadline = time.time() + HOST_STARTUP_TIMEOUT
+        while time.time() < deadline:
+            alive = _endpoint_is_alive(self.endpoint)
+            with self._lock:
+                if self._stopped:
+                    raise RuntimeError("Browser host was stopped during startup")
+                if not self.is_running():
+                    raise RuntimeError("Browser host exited during startup")
+                if alive:
+                    with open(_get_host_file(), "w") as f:
+                        json.dump({"endpoint": self.endpoint, "pid": self.process.pid}, f)
+                    print(f"✅ Browser host ready at {self.endpoint}")
+                    return self.endpoint
+            time.sleep(0.2)
+
+        self.stop()
+        raise RuntimeError("Browser host did not start in time")
+
+    def stop(self):
+        """Shut the browser down and remove the host file; a start() still in progress gives up"""
+        with self._lock:
+            self._stopped = True
+            process, self.process = self.process, None
+        # Leave a host started by another app instance alone
+        if process is None:
+            return
+
+        try:
+            process.terminate()
+            process.wait(timeout=5)
+        except Exception:
+            process.kill()
+        print("Browser host stopped")
+
+        try:
+            os.remove(_get_host_file())
+        except OSError:
+            pass
+
+class BrowserSession:
+    """A ready page plus the browser/context it belongs to"""
+
+    def __init__(self, browser, context, page, attached, own_context=False):
+        self.browser = browser
+        self.context = context
+        self.page = page
+        self.attached = attached
+        self.own_context = own_context
+
+    def close(self):
+        """Release the session - only close the browser if we launched it"""
+        try:
+            if self.attached and self.own_context:
+                self.context.close()
+            elif self.attached:
+                self.page.close()
+            else:
+                self.browser.close()
+        except Exception as e:
+            print(f"Error closing browser session: {str(e)}")
+
+def _seed_cookies(context):
+    """Give a fresh shared context the cookies of the saved session"""
+    state_path = load_session_state()
+    if not state_path or context.cookies():
+        return
+    try:
+        with open(state_path, "r") as f:
+            cookies = json.load(f).get("cookies", [])
+        if cookies:
+            context.add_cookies(cookies)
+    except Exception as e:
+        print(f"Could not seed shared browser with saved session: {str(e)}")
+
+def open_browser_session(p, browser_path=None, headless=True, context_options=None):
+    """
+    Get a page to work with: attach to the browser host if one is running,
+    otherwise launch a private browser like before. context_options (e.g.
+    java_script_enabled) give the session its own context with those settings.
+    """
+    endpoint = get_host_endpoint()
+    if endpoint:
+        try:
+            browser = p.chromium.connect_over_cdp(endpoint)
+            shared_context = browser.contexts[0] if browser.contexts else browser.new_context()
+            _seed_cookies(shared_context)
+            if context_options:
+                # Own context with the requested settings, logged in with the shared cookies
+                context = browser.new_context(**context_options)
+                context.add_cookies(shared_context.cookies())
+            else:
+                context = shared_context
+            page = context.new_page()
+            print(f"Attached to browser host at {endpoint}")
+            return BrowserSession(browser, context, page, attached=True, own_context=bool(context_options))
+        except Exception as e:
+            print(f"Could not attach to browser host, launching a browser instead: {str(e)}")
+
+    launch_options = {"headless": headless}
+    if browser_path:
+        launch_options["executable_path"] = browser_path
+    browser = p.chromium.launch(**launch_options)
+    context = new_session_context(browser, **(context_options or {}))
+    page = context.new_page()
+    return BrowserSession(browser, context, page, attached=False)
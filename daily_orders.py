@@ -4,17 +4,37 @@ import tempfile
 import tkinter as tk
 from tkinter import simpledialog
 from playwright.sync_api import sync_playwright
-import pandas as pd
 import os
-import shutil
 import re
+import queue
+import threading
 from datetime import datetime
-from openpyxl import load_workbook
 from utils import (
-    get_login_info, get_clean_text, get_download_path, 
-    get_current_date_formatted, LOGIN_URL, DASHBOARD_URL
+    get_download_path, get_current_date_formatted, DASHBOARD_URL, JOB_URL_TEMPLATE
 )
+from session_store import ensure_logged_in
+from browser_host import open_browser_session
+from job_list import ROW_SELECTOR, extract_job_rows, location_from_tags, get_page_count
+from job_list_client import prefetch_list_pages
+from page_pool import PagePool, DEFAULT_POOL_SIZE
+from lean_profile import LeanProfile, job_page_context_options
+import job_index
+import letter_codes
+from daily_snapshot import ScrapeSnapshot, HW_CHECK_FAILED
+from task_runner import report_progress, check_cancelled
+from tracer import span, traced, trace_run
+from template_cache import open_template, get_template_path, DAILY_REPORT_TEMPLATE
+import office_converter
+from waits import (
+    click_and_wait_for_list, run_and_wait_for_list, wait_for_element, goto_and_wait,
+    back_to_first_page, reset_wait_log, print_wait_summary
+)
+
+# Limits for the daily scrape
+MAX_PAGES = 3  # Increased to 3 pages
+MAX_ORDERS = 31  # Increased to 31 orders
 
+@traced()
 def ensure_browser_installed():
     """Ensure we can use a browser in bundled app"""
     if getattr(sys, 'frozen', False):
@@ -52,6 +72,7 @@ def ensure_browser_installed():
         print("Running in development mode, using normal Playwright setup")
         return None
 
+@traced()
 def ensure_paged_mode(page):
     """Ensure the page is in paged mode, not infinite scroll"""
     print("Checking if we need to enable paged mode...")
@@ -68,8 +89,8 @@ def ensure_paged_mode(page):
         if not is_expanded:
             print("Clicking settings button to open settings panel")
             settings_button.click()
-            # Give time for the panel to open
-            page.wait_for_timeout(1000)
+            # Wait for the panel to open
+            wait_for_element(page, 'input[name="list-mode"]', "settings panel", state="attached", timeout=5000)
             
         # Look for both radio buttons
         paged_radio = page.query_selector('input[name="list-mode"][value="PAGED"]')
@@ -100,12 +121,9 @@ def ensure_paged_mode(page):
         print("Infinite mode is active, switching to paged mode")
         paged_label = page.query_selector('label:has(input[name="list-mode"][value="PAGED"])')
         if paged_label:
-            paged_label.click()
+            # Wait for the list to reload after changing the setting
+            click_and_wait_for_list(page, paged_label, "paged mode")
             print("Clicked paged mode option")
-            
-            # Wait for page to reload after changing the setting
-            page.wait_for_load_state('networkidle')
-            page.wait_for_timeout(2000)
             print("Page should now be in paged mode")
             return
             
@@ -117,20 +135,21 @@ def ensure_paged_mode(page):
         # Try to close the panel if it might be open
         try:
             close_button = page.query_selector('.js-close-popup')
-            if close_button:
+            if close_button and close_button.is_visible():
                 close_button.click()
-                page.wait_for_timeout(500)
+                wait_for_element(page, '.js-close-popup', "settings panel close", state="hidden", timeout=2000)
         except:
             pass
 
+@traced()
 def apply_patch_supply_filter(page):
     """Apply the PATCH SUPPLY -PS - GAMMA filter before scraping orders"""
     print("Applying PATCH SUPPLY -PS - GAMMA filter...")
     
     try:
         # Wait to make sure favorites are loaded
-        page.wait_for_load_state('networkidle')
-        page.wait_for_timeout(1000)
+        wait_for_element(page, 'label:has-text("PATCH SUPPLY -PS - GAMMA")', "favorite filters",
+                         state="attached", timeout=5000)
         
         # Multiple approaches to find and click the filter
         methods = [
@@ -150,9 +169,8 @@ def apply_patch_supply_filter(page):
                 element = method()
                 if element:
                     print(f"Found filter element using method {methods.index(method) + 1}")
-                    element.click()
-                    page.wait_for_load_state('networkidle')
-                    page.wait_for_timeout(2000)  # Wait for filter to apply
+                    # Wait for the filtered list to come back
+                    click_and_wait_for_list(page, element, "patch supply filter")
                     
                     # Verify filter was applied - look for visible indication
                     active_filters = page.query_selector_all('.active-filter')
@@ -169,7 +187,7 @@ def apply_patch_supply_filter(page):
         try:
             # Try to click the filter using JavaScript
             print("Attempting to apply filter via JavaScript...")
-            js_success = page.evaluate('''() => {
+            click_filter_js = '''() => {
                 const elements = Array.from(document.querySelectorAll('label'));
                 const filterLabel = elements.find(el => 
                     el.textContent.includes('PATCH SUPPLY -PS - GAMMA') || 
@@ -180,13 +198,15 @@ def apply_patch_supply_filter(page):
                     return true;
                 }
                 return false;
-            }''')
+            }'''
+            
+            def click_filter():
+                if not page.evaluate(click_filter_js):
+                    raise LookupError("filter label not found")
             
-            if js_success:
-                print("Filter applied via JavaScript")
-                page.wait_for_load_state('networkidle')
-                page.wait_for_timeout(2000)
-                return True
+            run_and_wait_for_list(page, click_filter, "patch supply filter (JavaScript)")
+            print("Filter applied via JavaScript")
+            return True
         except Exception as e:
             print(f"JavaScript approach failed: {str(e)}")
         
@@ -196,243 +216,178 @@ def apply_patch_supply_filter(page):
         print(f"❌ Error applying filter: {str(e)}")
         return False
 
-def extract_process_codes(row):
-    """Extract process codes and quantities from a single row"""
-    process_codes = []
-    highest_qty = 0  # Track highest quantity for this row
-    
-    try:
-        # Critical: Only look at this specific row - not any other rows on the page
-        # This should limit our search to the current job only
-        
-        # First method: Use JavaScript but scope it specifically to this row
-        result = row.evaluate("""(row) => {
-            const processData = { codes: [], highestQty: 0 };
-            
-            // Only look for badges within THIS row, not on the entire page
-            const badgeContainers = row.querySelectorAll('.ew-badge-container.process-codes, .process-codes');
-            console.log('Found badge containers in row:', badgeContainers.length);
-            
-            for (const container of badgeContainers) {
-                const badges = container.querySelectorAll('.ew-badge');
-                console.log('Found badges in container:', badges.length);
-                
-                for (const badge of badges) {
-                    const codeElement = badge.querySelector('.process-code-badge');
-                    const qtyElement = badge.querySelector('.process-qty');
-                    
-                    if (codeElement) {
-                        const code = codeElement.textContent.trim();
-                        processData.codes.push(code);
-                        console.log('Found code:', code);
-                        
-                        // Get quantity if available
-                        if (qtyElement) {
-                            const qtyText = qtyElement.textContent.trim();
-                            const qty = parseInt(qtyText);
-                            console.log('Found qty for code', code, ':', qty);
-                            if (!isNaN(qty) && qty > processData.highestQty) {
-                                processData.highestQty = qty;
-                            }
-                        }
-                    }
+# How many job pages the in-page batch fetch loads at once
+HW_FETCH_CONCURRENCY = 6
+
+# Use the page pool once this many HW jobs need a real page visit
+PARALLEL_HW_MIN_JOBS = 3
+
+# Fetch job pages from inside the logged-in page and read their garment details
+FETCH_GARMENTS_JS = """async ([jobNumbers, urlTemplate, limit]) => {
+    const results = {};
+    const parser = new DOMParser();
+    let next = 0;
+
+    async function worker() {
+        while (next < jobNumbers.length) {
+            const jobNumber = jobNumbers[next++];
+            try {
+                const response = await fetch(urlTemplate.replace('{}', jobNumber), { credentials: 'same-origin' });
+                if (!response.ok) {
+                    results[jobNumber] = { error: `HTTP ${response.status}` };
+                    continue;
+                }
+                const doc = parser.parseFromString(await response.text(), 'text/html');
+                if (doc.querySelector('#txt_Username')) {
+                    results[jobNumber] = { error: 'redirected to login' };
+                    continue;
                 }
+                results[jobNumber] = {
+                    garments: Array.from(doc.querySelectorAll('tr.js-jobline-row'))
+                        .map(row => row.getAttribute('data-garment'))
+                        .filter(garment => garment),
+                    cells: Array.from(doc.querySelectorAll('td.jobline-garment'))
+                        .map(cell => cell.textContent.trim()),
+                };
+            } catch (e) {
+                results[jobNumber] = { error: String(e) };
             }
-            return processData;
-        }""", row)  # Pass the row as an argument to the JavaScript function
-        
-        if result:
-            process_codes = result['codes']
-            highest_qty = result['highestQty']
-            print(f"Row extraction result - Codes: {process_codes}, Highest Qty: {highest_qty}")
-        
-        # If JavaScript approach didn't work, fall back to a more direct approach
-        if not process_codes or highest_qty == 0:
-            # Try a direct approach using Playwright's API
-            # Get process codes directly
-            code_badges = row.query_selector_all(".process-code-badge")
-            for badge in code_badges:
-                code = badge.inner_text().strip()
-                if code:
-                    process_codes.append(code)
-            
-            # Try to find quantities directly in the row
-            qty_elements = row.query_selector_all(".process-qty")
-            for qty_element in qty_elements:
-                qty_text = qty_element.inner_text().strip()
-                try:
-                    qty = int(qty_text)
-                    if qty > highest_qty:
-                        highest_qty = qty
-                except ValueError:
-                    continue
-            
-            print(f"Direct extraction - Codes: {process_codes}, Highest Qty: {highest_qty}")
-        
+        }
+    }
+
+    await Promise.all(Array.from({ length: Math.min(limit, jobNumbers.length) }, worker));
+    return results;
+}"""
+
+def classify_garment_texts(garment_texts, cell_texts=()):
+    """
+    Find which materials (EMB, ETCH, SUB) the garments of a job mention.
+    The garment cells are only checked if the data-garment attributes found nothing.
+    """
+    # Garment keywords live in garment_keywords.json; one scan finds every material in a text
+    matcher = letter_codes.get_material_matcher()
+    flags = {"EMB": False, "ETCH": False, "SUB": False}
+    
+    def check(text, source):
+        found = matcher.match(text)
+        text = text.upper()
+        if "EMB" in found:
+            flags["EMB"] = True
+            print(f"{source} has EMB: {text}")
+        if "ETCH" in found:
+            flags["ETCH"] = True
+            print(f"{source} has ETCH material: {text}")
+        if "SUB" in found:
+            flags["SUB"] = True
+            print(f"{source} has SUB material: {text}")
+    
+    for garment_text in garment_texts:
+        check(garment_text, "Row")
+    
+    # Check garment cells directly if data-attribute approach didn't find everything
+    if not any(flags.values()):
+        for cell_text in cell_texts:
+            check(cell_text, "Cell")
+    
+    return flags
+
+def hw_code_from_flags(flags):
+    """Determine the final letter code based on what was found across all rows"""
+    # SUB is the default if no specific material is found (see letter_codes.MATERIAL_RULES)
+    return letter_codes.material_code(flags)
+
+@traced()
+def fetch_hw_garment_flags(page, job_numbers, concurrency=HW_FETCH_CONCURRENCY):
+    """
+    Fetch the job pages of many HW jobs at once from inside the logged-in page.
+    The page never navigates away. Returns {job_number: flags}; jobs that could
+    not be read in the batch are left out so the caller can fall back.
+    """
+    if not job_numbers:
+        return {}
+    
+    print(f"Fetching garment details for {len(job_numbers)} HW jobs ({concurrency} at a time)")
+    try:
+        results = page.evaluate(FETCH_GARMENTS_JS, [list(job_numbers), JOB_URL_TEMPLATE, concurrency])
     except Exception as e:
-        print(f"Error extracting process codes and quantities from row: {str(e)}")
+        print(f"Batch garment fetch failed: {str(e)}")
+        return {}
     
-    return process_codes, highest_qty
+    flags_by_job = {}
+    for job_number, result in results.items():
+        if result.get("error"):
+            print(f"Could not fetch job {job_number}: {result['error']}")
+            continue
+        # Job lines rendered by script are not in the fetched HTML - check those in the browser
+        if not result["garments"] and not result["cells"]:
+            continue
+        flags_by_job[job_number] = classify_garment_texts(result["garments"], result["cells"])
+    return flags_by_job
 
+def read_hw_garment_code(page, job_number):
+    """Open a job page and return the letter code for its garment material"""
+    # Construct the job URL
+    job_url = JOB_URL_TEMPLATE.format(job_number)
+    print(f"Navigating to job page: {job_url}")
+    
+    # Navigate to the job page and wait for its tables
+    goto_and_wait(page, job_url, "table", f"job page {job_number}", timeout=10000)
+    
+    # Read the data-garment attributes and the garment cells of every jobline row
+    garment_texts = page.eval_on_selector_all(
+        "tr.js-jobline-row",
+        "rows => rows.map(row => row.getAttribute('data-garment')).filter(garment => garment)"
+    )
+    cell_texts = page.eval_on_selector_all(
+        "td.jobline-garment",  # More specific selector
+        "cells => cells.map(cell => cell.innerText.trim())"
+    )
+    
+    return hw_code_from_flags(classify_garment_texts(garment_texts, cell_texts))
+
+@traced()
 def check_hw_garment_details(page, job_number):
     """
     Check garment details for HW jobs by clicking into the job page
     Returns the appropriate letter code based on garment material
     """
+    # Store the current URL to go back later
+    current_url = page.url
+    
     try:
-        # Construct the job URL
-        job_url = f"https://intranet.decopress.com/Jobs/job.aspx?ID={job_number}"
-        print(f"Navigating to job page: {job_url}")
-        
-        # Store the current URL to go back later
-        current_url = page.url
-        
-        # Navigate to the job page
-        page.goto(job_url)
-        page.wait_for_load_state('networkidle')
-        page.wait_for_selector("table", state="visible", timeout=10000)
-        
-        # Look for the jobline rows
-        jobline_rows = page.query_selector_all("tr.js-jobline-row")
-        
-        # Keywords for ETCH
-        etch_keywords = ['FAUX', 'LEATHER', 'LEATHERETTE', 'SUEDE', 'DENIM']
-        
-        # Keywords for SUB
-        sub_keywords = ['SIMWOVEN', 'WOVEN', 'DECO TWILL', 'DECOTWILL', 'TWILL']
-        
-        # Keywords for EMB - highest priority
-        emb_keywords = ['EMB', 'EMBROIDERY', 'EMBROIDERED']
-        
-        # Track what we find in all rows
-        found_emb = False
-        found_etch = False
-        found_sub = False
-        
-        # Check each row for garment details
-        for row in jobline_rows:
-            try:
-                # Try to get the data-garment attribute
-                garment_attr = row.get_attribute('data-garment')
-                if garment_attr:
-                    garment_text = garment_attr.upper()
-                    print(f"Found garment text: {garment_text}")
-                    
-                    # Check for EMB in this row
-                    row_has_emb = any(keyword in garment_text for keyword in emb_keywords)
-                    if row_has_emb:
-                        found_emb = True
-                        print(f"Row has EMB in garment: {garment_text}")
-                    
-                    # Check for ETCH keywords in this row
-                    row_has_etch = any(keyword in garment_text for keyword in etch_keywords)
-                    if row_has_etch:
-                        found_etch = True
-                        print(f"Row has ETCH material: {garment_text}")
-                    
-                    # Check for SUB keywords in this row
-                    row_has_sub = any(keyword in garment_text for keyword in sub_keywords)
-                    if row_has_sub:
-                        found_sub = True
-                        print(f"Row has SUB material: {garment_text}")
-            except Exception as e:
-                print(f"Error checking jobline row: {str(e)}")
-        
-        # Check garment cells directly if data-attribute approach didn't find everything
-        if not (found_emb or found_etch or found_sub):
-            garment_cells = page.query_selector_all("td.jobline-garment")  # More specific selector
-            for cell in garment_cells:
-                try:
-                    cell_text = cell.inner_text().strip().upper()
-                    
-                    # Check for EMB in this cell
-                    if any(keyword in cell_text for keyword in emb_keywords):
-                        found_emb = True
-                        print(f"Cell has EMB: {cell_text}")
-                    
-                    # Check for ETCH keywords in this cell
-                    if any(keyword in cell_text for keyword in etch_keywords):
-                        found_etch = True
-                        print(f"Cell has ETCH material: {cell_text}")
-                    
-                    # Check for SUB keywords in this cell
-                    if any(keyword in cell_text for keyword in sub_keywords):
-                        found_sub = True
-                        print(f"Cell has SUB material: {cell_text}")
-                except Exception as e:
-                    print(f"Error checking garment cell: {str(e)}")
+        hw_material_code = read_hw_garment_code(page, job_number)
         
         # Go back to the previous page
-        page.goto(current_url)
-        page.wait_for_load_state('networkidle')
+        goto_and_wait(page, current_url, ROW_SELECTOR, "back to job list")
         
-        # Determine the final letter code based on what was found across all rows
-        if found_emb and found_etch:
-            return "EMB/ETCH"
-        elif found_emb:
-            return "EMB"
-        elif found_etch:
-            return "ETCH"
-        elif found_sub:
-            return "SUB"
-        else:
-            # Default to SUB if no specific material is found
-            return "SUB"
+        return hw_material_code
     except Exception as e:
         print(f"Error checking HW garment details: {str(e)}")
         
         # Try to go back to the previous page
         try:
-            page.goto(current_url)
-            page.wait_for_load_state('networkidle')
+            goto_and_wait(page, current_url, ROW_SELECTOR, "back to job list")
         except:
             print("Error returning to previous page")
             
-        # Default to SUB if there was an error
-        return "SUB"
-
-def determine_letter_code(page, process_codes, description, job_number):
-    """Determine the letter code based on process codes and description"""
-    # Convert to uppercase for case-insensitive comparison
-    description_upper = description.upper() if description else ""
-    process_codes_upper = [code.upper() for code in process_codes]
-    
-    # Flag to track if we need to check HW details
-    has_hw = "HW" in process_codes_upper
-    
-    # Check immediate classifications first, but mark HW for later inspection
-    if "AP" in process_codes_upper and "EM" in process_codes_upper:
-        if has_hw:
-            # Mark for HW inspection even though it has EM
-            return "HW/EMB"
-        return "SUB/EMB"
-    elif "AP" in process_codes_upper:
-        if has_hw:
-            # Mark for HW inspection even though it has AP
-            return "HW/SUB"
-        return "SUB"
-    elif "EM" in process_codes_upper:
-        if has_hw:
-            # Mark for HW inspection even though it has EM
-            return "HW/EMB"
-        return "EMB"
-    elif "DS" in process_codes_upper:
-        if has_hw:
-            # Mark for HW inspection even though it has DS
-            return "HW/ETCH"
-        return "ETCH"
-    # Check for HW as last priority if no other codes matched
-    elif has_hw:
-        # Initially just mark as HW, we'll check details later
-        return "HW"
-    
-    # Default if nothing matches
-    return ""
-
-def has_paplique(process_codes):
-    """Check if the process Has Patch Apply"""
-    process_codes_upper = [code.upper() for code in process_codes]
-    return "PA" in process_codes_upper
+        # No code - the caller shows the default and checks the job again next run
+        return None
+
+@traced()
+def check_hw_garment_details_parallel(job_numbers, pool_size=DEFAULT_POOL_SIZE):
+    """
+    Visit many HW job pages at the same time using a pool of logged-in pages.
+    Returns {job_number: letter code}, with None for jobs that could not be read.
+    """
+    def read_code(page, job_number):
+        try:
+            return read_hw_garment_code(page, job_number)
+        except Exception as e:
+            print(f"Error checking HW garment details for {job_number}: {str(e)}")
+            return None
+    
+    with PagePool(size=min(pool_size, len(job_numbers)), context_options=job_page_context_options(), lean=True) as pool:
+        return dict(zip(job_numbers, pool.map(read_code, job_numbers)))
 
 def get_short_description(full_description):
     """Get the first four words from a description"""
@@ -448,148 +403,135 @@ def get_short_description(full_description):
     # Join back with spaces
     return " ".join(short_words)
 
-def extract_location_tags(row):
-    """Extract location tags from jobtag-container"""
-    location = ""
-    
+def order_from_record(record):
+    """
+    Build an order dict from a job list record (see job_list.extract_job_rows).
+    Returns None for rows that are not urgent or have no numeric job number.
+    """
+    days_text = record.get("Days Text")
+    if days_text is None:
+        print("Days element not found in row")
+        return None
+        
     try:
-        # Use JavaScript to extract tags from the jobtag-container
-        result = row.evaluate("""(row) => {
-            // Look for the jobtag-container within this row
-            const tagContainer = row.querySelector('.jobtag-container');
-            if (!tagContainer) return null;
-            
-            // Find all tag elements
-            const tagElements = tagContainer.querySelectorAll('li .jobtag.tag.showtag .tag-text');
-            const tags = Array.from(tagElements).map(el => el.textContent.trim().toLowerCase());
-            
-            // Return the array of tags
-            return tags;
-        }""", row)
+        days = int(days_text)
+    except ValueError:
+        print(f"Could not convert days text to integer: {days_text}")
+        return None
+    
+    # Changed to include days 0-4
+    if days not in (0, 1, 2, 3, 4):
+        return None
         
-        if result:
-            # Define priority order - earlier items take precedence
-            priority_tags = ["rfp", "@sub", "@laser", "qc"]
-            priority_codes = {"rfp": "RFP", "@sub": "SUB", "@laser": "LASER", "qc": "QC"}
-            
-            # Find the highest priority tag
-            for tag in priority_tags:
-                if tag in result:
-                    location = priority_codes[tag]
-                    print(f"Found location tag: {tag} -> {location}")
-                    break
-            
-            print(f"All job tags found: {result}, Selected location: {location}")
+    job_number = record["Job Number"]
+    # Only keep numeric job numbers
+    if not job_number.isdigit():
+        return None
+        
+    full_description = record["Description"]
+    process_codes = record["Process Codes"]
+    highest_qty = record["Highest Qty"]
+    print(f"Job {job_number} - Process codes: {process_codes}, Highest quantity: {highest_qty}")
     
-    except Exception as e:
-        print(f"Error extracting location tags: {str(e)}")
+    # Location from the job tags (rfp, @sub, @laser, qc)
+    location = location_from_tags(record["Tags"])
+    
+    # Determine letter code; HW jobs get a pending code ("HW", "HW/EMB", ...) until the garment check
+    letter_code = letter_codes.letter_code(process_codes)
     
-    return location
+    # Check for applique
+    has_pa = letter_codes.has_patch_apply(process_codes)
+    
+    job_status = record["Job Status"]
+    # Keep only text after hyphen if it exists
+    if " - " in job_status:
+        job_status = job_status.split(" - ")[1]
+    
+    return {
+        "Job Number": job_number,
+        "Customer": record["Customer"],
+        "Description": full_description,
+        "Short Description": get_short_description(full_description),
+        "Job Status": job_status,
+        "Order #": record["Order #"],
+        "Date In": record["Date In"],
+        "Ship Date": record["Ship Date"],
+        "Days Remaining": days,
+        "Process Codes": process_codes,
+        "Letter Code": letter_code,
+        "Has Patch Apply": has_pa,
+        "Quantity": highest_qty,
+        "Location": location
+    }
 
-def scrape_orders(page):
-    orders = []
+def orders_to_enrich(orders, snapshot=None):
+    """Orders whose HW letter code still has to be checked (not reused from the snapshot)"""
+    if snapshot is None:
+        return orders
+    return [order for order in orders if not snapshot.is_reused(order)]
+
+def _below(count, limit):
+    """count < limit, where a limit of None means no limit"""
+    return limit is None or count < limit
+
+def iter_order_pages(page, snapshot=None, max_pages=MAX_PAGES, max_orders=MAX_ORDERS):
+    """
+    Read the job list page by page, yielding the orders of each page as soon
+    as it has been read. Pass None for max_pages or max_orders to read the
+    whole list.
+    """
+    found = 0
     current_page = 1
-    max_pages = 3  # Increased to 3 pages
-    max_orders = 31  # Increased to 31 orders
     visited_pages = 0  # Track actual pages visited
     
     # Wait for the table to be present and visible
     page.wait_for_selector("table.data-results", state="visible", timeout=30000)
     print("Table found, starting to scrape...")
     
-    while visited_pages < max_pages and len(orders) < max_orders:
-        print(f"Processing page {current_page} (visited {visited_pages + 1} of {max_pages})")
-        # Wait for any loading indicators to disappear
-        page.wait_for_load_state('networkidle')
+    while _below(visited_pages, max_pages) and _below(found, max_orders):
+        check_cancelled()
+        print(f"Processing page {current_page} (visited {visited_pages + 1} of {max_pages or 'all'})")
+        report_progress(f"Reading page {current_page}", found)
         
-        rows = page.query_selector_all("table.data-results tbody tr")
-        print(f"Found {len(rows)} rows on current page")
+        # Read every row on this page in one round trip
+        with span(f"read rows page {current_page}"):
+            records = extract_job_rows(page)
+        print(f"Found {len(records)} rows on current page")
+        # The filtered list's page numbers do not match the full list, so no page is stored
+        job_index.record_rows(records)
         
-        for row in rows:
-            if len(orders) >= max_orders:
+        page_orders = []
+        for record in records:
+            if not _below(found, max_orders):
                 print(f"Reached maximum of {max_orders} orders")
                 break
                 
             try:
-                days_element = row.query_selector("span.js-days-to-due-date")
-                if not days_element:
-                    print("Days element not found in row")
-                    continue
-                    
-                days_text = days_element.inner_text().strip()
-                print(f"Days text found: {days_text}")
-                
-                try:
-                    days = int(days_text)
-                except ValueError:
-                    print(f"Could not convert days text to integer: {days_text}")
-                    continue
-                
-                # Changed to include days 0-4
-                if days in (0, 1, 2, 3, 4):
-                    job_number = get_clean_text(row.query_selector("td:nth-child(1)"))
-                    # Only keep numeric job numbers
-                    if not job_number.isdigit():
-                        continue
-                        
-                    description_element = row.query_selector("td:nth-child(3)")
-                    full_description = get_clean_text(description_element)
-                    
-                    # Get first four words
-                    short_description = get_short_description(full_description)
-                    
-                    # Extract process codes and their highest quantity
-                    process_codes, highest_qty = extract_process_codes(row)
-                    print(f"Job {job_number} - Process codes: {process_codes}, Highest quantity: {highest_qty}")
-                    
-                    # Extract location tags (rfp, @sub, @laser, qc)
-                    location = extract_location_tags(row)
-                    
-                    # Determine letter code
-                    letter_code = determine_letter_code(page, process_codes, full_description, job_number)
-                    
-                    # Check for applique
-                    has_pa = has_paplique(process_codes)
-                        
-                    job_status = get_clean_text(row.query_selector("td:nth-child(4)"))
-                    # Keep only text after hyphen if it exists
-                    if " - " in job_status:
-                        job_status = job_status.split(" - ")[1]
-                    
-                    order = {
-                        "Job Number": job_number,
-                        "Customer": get_clean_text(row.query_selector("td:nth-child(2)")),
-                        "Description": full_description,
-                        "Short Description": short_description,
-                        "Job Status": job_status,
-                        "Order #": get_clean_text(row.query_selector("td:nth-child(5)")),
-                        "Date In": get_clean_text(row.query_selector("td:nth-child(6)")),
-                        "Ship Date": get_clean_text(row.query_selector("td:nth-child(7)")),
-                        "Days Remaining": days,
-                        "Process Codes": process_codes,
-                        "Letter Code": letter_code,
-                        "Has Patch Apply": has_pa,
-                        "Quantity": highest_qty,
-                        "Location": location
-                    }
-                    orders.append(order)
-                    print(f"Added order with {days} days remaining, Letter Code: {letter_code}, Has Patch Apply: {has_pa}")
+                order = order_from_record(record)
+                if order:
+                    if snapshot:
+                        snapshot.apply(order, record)
+                    page_orders.append(order)
+                    found += 1
+                    report_progress(f"Reading page {current_page}", found)
+                    print(f"Added order with {order['Days Remaining']} days remaining, Letter Code: {order['Letter Code']}, Has Patch Apply: {order['Has Patch Apply']}")
             except Exception as e:
                 print(f"Error processing row: {str(e)}")
                 continue
+        yield page_orders
         
         # Increment visited pages counter
         visited_pages += 1
         
         # Move to next page if we haven't reached max pages and max orders
-        if visited_pages < max_pages and len(orders) < max_orders:
+        if _below(visited_pages, max_pages) and _below(found, max_orders):
             try:
                 # Find the next page link
                 next_page = page.query_selector(f"ul.pagination li[data-lp='{current_page + 1}'] a.page-link")
                 if next_page:
                     print(f"Clicking page {current_page + 1}")
-                    next_page.click()
-                    page.wait_for_timeout(2000)  # Wait for page load
+                    # Wait for the rows of the next page
+                    click_and_wait_for_list(page, next_page, f"page {current_page + 1}", expected_page=current_page + 1)
                     current_page += 1
                 else:
                     print("Next page link not found")
@@ -597,64 +539,172 @@ def scrape_orders(page):
             except Exception as e:
                 print(f"Error navigating to next page: {str(e)}")
                 break
-        elif len(orders) >= max_orders:
+        elif not _below(found, max_orders):
             print(f"Reached maximum of {max_orders} orders, stopping pagination")
         else:
             print("Reached maximum page limit")
             break
-            
+
+@traced()
+def scrape_orders(page, snapshot=None, max_pages=MAX_PAGES, max_orders=MAX_ORDERS):
+    orders = [order for page_orders in iter_order_pages(page, snapshot, max_pages, max_orders)
+              for order in page_orders]
     print(f"Total orders found: {len(orders)}")
     
     # Now process any HW jobs to determine their actual letter code
+    enrich_hw_orders(page, orders_to_enrich(orders, snapshot))
+    return orders
+
+def stream_orders(page, snapshot=None, max_pages=None, max_orders=None):
+    """
+    Yield finished orders while the list is still being read. The HW jobs of
+    each list page are read with the in-page batch fetch before the next page
+    is opened; the few it cannot read need the page itself, so they are
+    checked and yielded once the list is done.
+    """
+    deferred = []
+    for page_orders in iter_order_pages(page, snapshot, max_pages, max_orders):
+        hw_orders = [order for order in orders_to_enrich(page_orders, snapshot) if "HW" in order["Letter Code"]]
+        flags_by_job = fetch_hw_garment_flags(page, [order["Job Number"] for order in hw_orders])
+        waiting = set()
+        for order in hw_orders:
+            flags = flags_by_job.get(order["Job Number"])
+            if flags is None:
+                deferred.append(order)
+                waiting.add(order["Job Number"])
+                continue
+            original_code = order["Letter Code"]
+            apply_hw_material_code(order, hw_code_from_flags(flags))
+            print(f"Updated HW job {order['Job Number']} from {original_code} to {order['Letter Code']}")
+        
+        for order in page_orders:
+            if order["Job Number"] not in waiting:
+                yield order
+    
+    enrich_hw_orders(page, deferred)
+    yield from deferred
+
+def apply_hw_material_code(order, hw_material_code):
+    """
+    Update an order's HW letter code with the material found on its job page.
+    hw_material_code is None when the job page could not be read: the order
+    gets the default material and is flagged so the snapshot checks it again.
+    """
+    if hw_material_code is None:
+        print(f"⚠️ HW check failed for job {order['Job Number']} - using SUB until the next run")
+        order[HW_CHECK_FAILED] = True
+        hw_material_code = "SUB"
+    order["Letter Code"] = letter_codes.merge_hw_code(order["Letter Code"], hw_material_code)
+
+@traced()
+def enrich_hw_orders(page, orders):
+    """Replace HW letter codes with the code for the garment material"""
     print("Processing HW jobs to determine material types...")
+    
+    # Check every HW job page in one batch; only jobs it could not read are visited one by one
+    hw_job_numbers = [order["Job Number"] for order in orders if "HW" in order["Letter Code"]]
+    if not hw_job_numbers:
+        return
+    check_cancelled()
+    report_progress(f"Checking {len(hw_job_numbers)} HW jobs")
+    flags_by_job = fetch_hw_garment_flags(page, hw_job_numbers)
+    hw_codes = {job_number: hw_code_from_flags(flags) for job_number, flags in flags_by_job.items()}
+    
+    # Several jobs left over - visit them in parallel instead of one after another
+    remaining = [job_number for job_number in hw_job_numbers if job_number not in hw_codes]
+    if len(remaining) >= PARALLEL_HW_MIN_JOBS:
+        check_cancelled()
+        try:
+            hw_codes.update(check_hw_garment_details_parallel(remaining))
+        except Exception as e:
+            print(f"Parallel HW check failed, checking jobs one by one: {str(e)}")
+    
     for order in orders:
         # Check any order that has HW in its letter code
         if "HW" in order["Letter Code"]:
-            process_codes = order["Process Codes"]
             job_number = order["Job Number"]
-            description = order["Description"]
             
             # Get the original letter code
             original_code = order["Letter Code"]
             
             # Check the HW garment details
-            hw_material_code = check_hw_garment_details(page, job_number)
-            
-            # Special handling for combined codes
-            if original_code == "HW/EMB":
-                # If the material is ETCH, combine EMB and ETCH
-                if "ETCH" in hw_material_code:
-                    order["Letter Code"] = "EMB/ETCH"
-                else:
-                    # Otherwise keep just EMB
-                    order["Letter Code"] = "EMB"
-            elif original_code == "HW/SUB":
-                # If the material is ETCH, combine SUB and ETCH
-                if "ETCH" in hw_material_code:
-                    order["Letter Code"] = "SUB/ETCH"
-                else:
-                    # Otherwise keep just SUB
-                    order["Letter Code"] = "SUB"
-            elif original_code == "HW/ETCH":
-                # Already has ETCH, just keep it
-                order["Letter Code"] = "ETCH"
+            if job_number in hw_codes:
+                hw_material_code = hw_codes[job_number]
             else:
-                # For plain HW, use the determined code
-                order["Letter Code"] = hw_material_code
+                check_cancelled()
+                report_progress(f"Checking HW job {job_number}")
+                hw_material_code = check_hw_garment_details(page, job_number)
+            
+            apply_hw_material_code(order, hw_material_code)
             
             print(f"Updated HW job {job_number} from {original_code} to {order['Letter Code']}")
+
+@traced()
+def scrape_orders_http(page, snapshot=None, max_pages=MAX_PAGES, max_orders=MAX_ORDERS):
+    """
+    Scrape the same orders as scrape_orders, but read pages 2+ by replaying the
+    list's own data request over HTTP instead of clicking through the DOM.
+    Returns None if the request cannot be replayed, so the caller can fall back.
+    """
+    orders = []
+    
+    def add_orders(records):
+        check_cancelled()
+        job_index.record_rows(records)
+        for record in records:
+            if not _below(len(orders), max_orders):
+                print(f"Reached maximum of {max_orders} orders")
+                break
+            try:
+                order = order_from_record(record)
+                if order:
+                    if snapshot:
+                        snapshot.apply(order, record)
+                    orders.append(order)
+                    report_progress("Reading orders", len(orders))
+            except Exception as e:
+                print(f"Error processing row: {str(e)}")
+    
+    page.wait_for_selector("table.data-results", state="visible", timeout=30000)
+    with span("read rows page 1"):
+        add_orders(extract_job_rows(page))
+    page_limit = max_pages if max_pages is not None else float("inf")
+    last_page = min(get_page_count(page), page_limit)
+    
+    if last_page > 1 and _below(len(orders), max_orders):
+        # Pages 2..N arrive together, so they cost about one round trip
+        try:
+            with span("prefetch list pages", cat="navigation"):
+                other_pages = prefetch_list_pages(page, page_limit)
+        except Exception as e:
+            print(f"HTTP scrape failed, falling back to the browser: {str(e)}")
+            return _back_to_first_page(page)
+        if other_pages is None:
+            # Capturing the request may already have moved the list to page 2
+            return _back_to_first_page(page)
+        
+        for page_number, records in enumerate(other_pages, start=2):
+            if not records:
+                print(f"No rows parsed from page {page_number} - falling back to the browser")
+                return _back_to_first_page(page)
+            add_orders(records)
     
+    print(f"Total orders found: {len(orders)}")
+    enrich_hw_orders(page, orders_to_enrich(orders, snapshot))
     return orders
 
-def create_daily_report(orders):
-    """Create a daily report using the template"""
-    if not orders:
-        print("No orders to export")
-        return None
-    
+def _back_to_first_page(page):
+    """Return the list to page 1 before the browser scrape takes over"""
+    back_to_first_page(page)
+    return None
+
+# Orders waiting between the scrape and the report writer in streaming mode
+STREAM_QUEUE_SIZE = 50
+
+def get_daily_report_path():
+    """Where today's report is saved, or None if the template is missing"""
     # Get the template path
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    template_path = os.path.join(script_dir, "DECOPRESS DAILY Template.xlsx")
+    template_path = get_template_path(DAILY_REPORT_TEMPLATE)
     
     if not os.path.exists(template_path):
         print(f"❌ Template file not found: {template_path}")
@@ -664,202 +714,339 @@ def create_daily_report(orders):
     download_path = get_download_path()
     current_date = get_current_date_formatted()
     excel_filename = f"{current_date}_DECOPRESS_DAILY.xlsx"
-    excel_filepath = os.path.join(download_path, excel_filename)
+    return os.path.join(download_path, excel_filename)
+
+class DailyReportWriter:
+    """
+    Fills a draft of the daily report template one order at a time. Rows are
+    written as the orders arrive and put in Days Remaining order by finish().
+    """
     
-    try:
-        # Copy the template to the new file
-        shutil.copy2(template_path, excel_filepath)
-        
-        # Open the template with openpyxl
-        workbook = load_workbook(excel_filepath)
-        sheet = workbook.active
-        
-        # Get information about merged cells to avoid setting values to merged cells
-        merged_cell_ranges = sheet.merged_cells.ranges
-        merged_cells = []
-        for merged_range in merged_cell_ranges:
-            cells = []
-            for row in range(merged_range.min_row, merged_range.max_row + 1):
-                for col in range(merged_range.min_col, merged_range.max_col + 1):
-                    cells.append((row, col))
-            merged_cells.extend(cells)
-        print(f"Identified {len(merged_cells)} merged cells to avoid writing to")
+    # Map of column letters to their numerical indices
+    col_map = {'B': 2, 'C': 3, 'D': 4, 'E': 5, 'F': 6, 'H': 8, 'I': 9, 'J': 10, 'K': 11, 'L': 12}
+    # Columns filled from an order, moved together when the rows are sorted
+    order_columns = ['B', 'C', 'D', 'E', 'F', 'H', 'I', 'J']
+    
+    def __init__(self, draft, show_changes=False):
+        self.draft = draft
+        self.manifest = draft.manifest
+        # (days remaining, row) of every order written
+        self.rows = []
         
-        # Add today's date in a cell that's not merged
-        # Try different locations for the date
+        # Add today's date to the date cell (the top-left cell of its merged range)
         try:
             today = datetime.now()
             formatted_date = today.strftime("%m.%d.%y")  # Format as MM.DD.YY
-            
-            # Check if A3 is a merged cell
-            is_merged_a3 = False
-            for merged_range in sheet.merged_cells.ranges:
-                if "A3" in merged_range.coord:
-                    is_merged_a3 = True
-                    break
-            
-            # Try different cells for the date
-            date_cells = ["A3"]
-            date_placed = False
-            
-            for cell_coord in date_cells:
-                try:
-                    # Check if this cell is part of a merged range
-                    is_merged = False
-                    for merged_range in sheet.merged_cells.ranges:
-                        if cell_coord in merged_range.coord:
-                            is_merged = True
-                            break
-                    
-                    if not is_merged:
-                        sheet[cell_coord] = f"Date: {formatted_date}"
-                        date_placed = True
-                        print(f"Date placed in {cell_coord}")
-                        break
-                except Exception as e:
-                    print(f"Could not place date in {cell_coord}: {str(e)}")
-            
-            # If we couldn't place it in any of the preferred cells, try a different approach
-            if not date_placed:
-                # Find the main merge cell for D3 if it's merged
-                if is_merged_a3:
-                    for merged_range in sheet.merged_cells.ranges:
-                        if "D3" in merged_range.coord:
-                            main_cell = merged_range.coord.split(":")[0]  # Get the top-left cell of the merge
-                            try:
-                                sheet[main_cell] = f"Date: {formatted_date}"
-                                date_placed = True
-                                print(f"Date placed in merge cell {main_cell}")
-                                break
-                            except Exception as e:
-                                print(f"Could not place date in main merge cell {main_cell}: {str(e)}")
-            
-            # Last resort - just note that we couldn't place the date
-            if not date_placed:
-                print("⚠️ Could not place date in any cell. Template may have unusual merged cells.")
-        
+            date_cell = self.manifest.targets["date"]
+            draft.set_value(date_cell, f"Date: {formatted_date}")
+            print(f"Date placed in {date_cell}")
         except Exception as e:
             print(f"Error adding date: {str(e)}")
             # Continue without the date rather than failing
         
         # Start row for data (B5 is where the first job number goes)
-        current_row = 5
+        self.current_row = self.manifest.target_row("first_job")
+        # The legend below the data rows; rows are inserted above it when the orders outgrow the template
+        self.legend_row = self._find_legend_row()
         
-        # Map of column letters to their numerical indices
-        col_map = {'B': 2, 'C': 3, 'D': 4, 'E': 5, 'F': 6, 'H': 8, 'I': 9}
+        # Header for the change marks
+        if show_changes:
+            draft.set_value(self.manifest.targets["change"], "CHANGE")
+    
+    def _find_legend_row(self):
+        """First row under the first data row with template content in the order columns"""
+        columns = [self.col_map[column] for column in self.order_columns]
+        for row in range(self.current_row, self.draft.sheet.max_row + 1):
+            if any(self.manifest.is_merged(row, col) or self.draft.get_cell(row, col) is not None for col in columns):
+                return row
+        return None
+    
+    def add(self, order):
+        """Write one order on the next free row"""
+        draft, col_map = self.draft, self.col_map
+        try:
+            # Print all order fields for debugging
+            print(f"Processing order: {order}")
+            
+            # Out of data rows - push the legend down
+            if self.legend_row is not None and self.current_row >= self.legend_row:
+                draft.insert_rows(self.legend_row)
+                self.legend_row += 1
+            current_row = self.current_row
+            
+            # Job Number in column B
+            draft.set_cell(current_row, col_map['B'], order.get("Job Number", ""))
+            
+            # Short Description in column C
+            draft.set_cell(current_row, col_map['C'], order.get("Short Description", ""))
+            
+            # Letter Code in column D
+            draft.set_cell(current_row, col_map['D'], order.get("Letter Code", ""))
+            
+            # Location in column E
+            draft.set_cell(current_row, col_map['E'], order.get("Location", ""))
+            
+            # Quantity in column F - make sure we're adding it correctly
+            qty_value = order.get("Quantity", 0)
+            print(f"Adding quantity for job {order.get('Job Number', '')}: {qty_value}")
+            if qty_value and qty_value > 0:
+                draft.set_cell(current_row, col_map['F'], qty_value)
+            
+            # Has Patch Apply in column H (TRUE/FALSE)
+            draft.set_cell(current_row, col_map['H'], "TRUE" if order.get("Has Patch Apply") else "FALSE")
+            
+            # Days Remaining in column I
+            draft.set_cell(current_row, col_map['I'], order.get("Days Remaining", ""))
+            
+            # NEW / CHANGED since the last run in column J
+            if order.get("Change"):
+                draft.set_cell(current_row, col_map['J'], order["Change"])
+            
+            self.rows.append((order.get("Days Remaining", 0), current_row))
+            self.current_row += 1
+        except Exception as e:
+            print(f"Error adding row data for job {order.get('Job Number', '')}: {str(e)}")
+            # Continue with next row rather than failing completely
+    
+    def sort_rows(self):
+        """Reorder the written rows by Days Remaining (stable), moving cell values instead of orders"""
+        days = [days for days, _ in self.rows]
+        if days == sorted(days):
+            return
+        columns = [self.col_map[column] for column in self.order_columns]
+        slots = [row for _, row in self.rows]
+        ordered = sorted(self.rows, key=lambda item: item[0])
+        values = [[self.draft.get_cell(row, col) for col in columns] for _, row in ordered]
+        for row, row_values in zip(slots, values):
+            for col, value in zip(columns, row_values):
+                self.draft.set_cell(row, col, value)
+        self.rows = [(item[0], row) for item, row in zip(ordered, slots)]
+    
+    def finish(self, excel_filepath, dropped=None):
+        """Sort the rows, list the dropped jobs below them and save the report"""
+        with span("sort report rows"):
+            self.sort_rows()
         
-        # Fill in the data for each order
-        for order in orders:
-            try:
-                # Print all order fields for debugging
-                print(f"Processing order: {order}")
-                
-                # Check if we're trying to write to a merged cell first
-                if (current_row, col_map['B']) in merged_cells:
-                    print(f"Row {current_row}, Col B is a merged cell - skipping")
-                    current_row += 1
-                    continue
-                
-                # Job Number in column B
-                sheet.cell(row=current_row, column=col_map['B']).value = order.get("Job Number", "")
-                
-                # Short Description in column C
-                sheet.cell(row=current_row, column=col_map['C']).value = order.get("Short Description", "")
-                
-                # Letter Code in column D
-                sheet.cell(row=current_row, column=col_map['D']).value = order.get("Letter Code", "")
-                
-                # Location in column E
-                sheet.cell(row=current_row, column=col_map['E']).value = order.get("Location", "")
-                
-                # Quantity in column F - make sure we're adding it correctly
-                qty_value = order.get("Quantity", 0)
-                print(f"Adding quantity for job {order.get('Job Number', '')}: {qty_value}")
-                if qty_value and qty_value > 0:
-                    sheet.cell(row=current_row, column=col_map['F']).value = qty_value
-                
-                # Has Patch Apply in column H (TRUE/FALSE)
-                sheet.cell(row=current_row, column=col_map['H']).value = "TRUE" if order.get("Has Patch Apply") else "FALSE"
-                
-                # Days Remaining in column I
-                sheet.cell(row=current_row, column=col_map['I']).value = order.get("Days Remaining", "")
-                
-                current_row += 1
-            except Exception as e:
-                print(f"Error adding row data for job {order.get('Job Number', '')}: {str(e)}")
-                # Continue with next row rather than failing completely
+        # Jobs that were on the last run's report but not on this one, below the legend
+        if dropped:
+            self.current_row = max(self.current_row, self.draft.last_content_row() + 2)
+        for order in dropped or []:
+            self.draft.set_cell(self.current_row, self.col_map['J'], "DROPPED")
+            self.draft.set_cell(self.current_row, self.col_map['K'], order.get("Job Number", ""))
+            self.draft.set_cell(self.current_row, self.col_map['L'], order.get("Short Description", ""))
+            self.current_row += 1
         
         # Save the workbook
-        workbook.save(excel_filepath)
+        with span("save workbook", cat="io"):
+            self.draft.save(excel_filepath)
         print(f"✅ Created daily report using template: {excel_filepath}")
+        convert_report_to_pdf(excel_filepath)
+
+@traced()
+def create_daily_report(orders, dropped=None):
+    """
+    Create a daily report using the template, with the orders in Days
+    Remaining order. Orders marked by the scrape snapshot get NEW/CHANGED in
+    column J; dropped jobs are listed below them.
+    """
+    if not orders:
+        print("No orders to export")
+        return None
+    
+    excel_filepath = get_daily_report_path()
+    if not excel_filepath:
+        return None
+    
+    try:
+        # Fill in a draft of the cached template and write it out in one save
+        with open_template(DAILY_REPORT_TEMPLATE) as draft:
+            writer = DailyReportWriter(draft, show_changes=dropped is not None)
+            for order in orders:
+                writer.add(order)
+            writer.finish(excel_filepath, dropped)
         return excel_filepath
     except Exception as e:
         print(f"❌ Error creating report: {str(e)}")
         return None
 
-def run():
+class ReportStream:
+    """
+    Writes the daily report on a thread of its own while the scrape goes on.
+    Orders are handed over through a bounded queue, so a writer that falls
+    behind holds the scrape back instead of letting orders pile up.
+    """
+    
+    _END = object()
+    
+    def __init__(self, show_changes=False, maxsize=STREAM_QUEUE_SIZE):
+        self.show_changes = show_changes
+        self.orders = queue.Queue(maxsize=maxsize)
+        self.count = 0
+        self.report_path = None
+        self._dropped = None
+        self._aborted = False
+        self._ended = False
+        self._thread = threading.Thread(target=self._write, name="report writer", daemon=True)
+        self._thread.start()
+    
+    def put(self, order):
+        """Hand an order to the writer; blocks while the queue is full"""
+        self.orders.put(order)
+        self.count += 1
+    
+    def close(self, dropped=None):
+        """No more orders: wait for the report to be saved and return its path (or None)"""
+        self._dropped = dropped
+        self.orders.put(self._END)
+        self._thread.join()
+        return self.report_path
+    
+    def abort(self):
+        """Stop the writer without saving a report"""
+        self._aborted = True
+        self.close()
+    
+    def _take(self):
+        while True:
+            order = self.orders.get()
+            if order is self._END:
+                self._ended = True
+                return
+            yield order
+    
+    @traced("write report stream", cat="io")
+    def _write(self):
+        excel_filepath = get_daily_report_path()
+        try:
+            with open_template(DAILY_REPORT_TEMPLATE) as draft:
+                writer = DailyReportWriter(draft, show_changes=self.show_changes)
+                for order in self._take():
+                    writer.add(order)
+                if self._aborted or not excel_filepath:
+                    return
+                if not writer.rows:
+                    print("No orders to export")
+                    return
+                writer.finish(excel_filepath, self._dropped)
+                self.report_path = excel_filepath
+        except Exception as e:
+            print(f"❌ Error creating report: {str(e)}")
+        finally:
+            # Keep taking orders after an error so the scrape is never left blocked
+            if not self._ended:
+                for _ in self._take():
+                    pass
+
+def convert_report_to_pdf(excel_filepath):
+    """Queue a PDF copy of the report on the LibreOffice converter, if app.py started one"""
+    converter = office_converter.get_running_converter()
+    if not converter:
+        return None
+    
+    def report_result(future):
+        try:
+            print(f"✅ Created daily report PDF: {future.result()}")
+        except Exception as e:
+            print(f"❌ Error creating daily report PDF: {str(e)}")
+    
+    future = converter.submit(excel_filepath)
+    future.add_done_callback(report_result)
+    return future
+
+@traced()
+def stream_daily_report(page, snapshot, max_pages=None, max_orders=None):
+    """
+    Scrape and write the report at the same time: orders go to a ReportStream
+    as soon as they are finished, so no list of orders is built and the Excel
+    writing overlaps the scrape. Returns the report path.
+    """
+    report = ReportStream(show_changes=True)
+    try:
+        for order in stream_orders(page, snapshot, max_pages, max_orders):
+            snapshot.track(order)
+            report.put(order)
+            report_progress("Reading and writing orders", report.count)
+    except BaseException:
+        report.abort()
+        raise
+    
+    print(f"Total orders found: {report.count}")
+    if not report.count:
+        report.abort()
+        print("⚠️ No 0, 1, 2, 3, or 4-day orders found.")
+        return None
+    
+    snapshot.report()
+    dropped = snapshot.dropped()
+    snapshot.save()
+    report_progress("Writing the report")
+    report_path = report.close(dropped)
+    if report_path:
+        print(f"✅ Exported {report.count} urgent orders to Excel: {report_path}")
+    return report_path
+
+@trace_run
+def run(lean=True, stream=False, max_pages=MAX_PAGES, max_orders=MAX_ORDERS):
+    """
+    Scrape the urgent orders and write the daily report. With stream=True the
+    report is written while the list is read (see stream_daily_report); pass
+    None for max_pages or max_orders to read the whole list.
+    """
     # Ensure browser is installed
     browser_path = ensure_browser_installed()
     report_path = None  # Initialize report path variable
+    reset_wait_log()
+    # Rows that did not change since the last run keep their letter codes
+    snapshot = ScrapeSnapshot.load()
+    report_progress("Opening the job list")
 
     with sync_playwright() as p:
-        # Launch browser using system installation if available
-        launch_options = {
-            "headless": False,
-        }
-        
-        if browser_path:
-            launch_options["executable_path"] = browser_path
-            browser = p.chromium.launch(headless=True)
-        else:
-            # Let Playwright try to find its own browser
-            browser = p.chromium.launch(headless=True)
-            
-        context = browser.new_context()
-        page = context.new_page()
+        # Attach to the shared browser host, or launch a browser if none is running
+        session = open_browser_session(p, browser_path)
+        page = session.page
+        lean_profile = LeanProfile() if lean else None
 
         try:
-            # Login
-            page.goto(LOGIN_URL)
-            page.wait_for_load_state('networkidle')  # Wait for page to fully load
-            
-            username, password = get_login_info()
-            
-            # Check if login was cancelled
-            if not username or not password:
-                print("Login cancelled by user")
-                browser.close()
+            # Go to Job Status List, logging in only if the saved session is not valid
+            if not ensure_logged_in(page, DASHBOARD_URL):
                 return None
-                
-            page.wait_for_selector("#txt_Username", timeout=60000)
-            page.fill("#txt_Username", username)
-            page.fill("#txt_Password", password)
-            page.click("#btn_Login")
-            page.wait_for_selector("#jobStatusListResults", timeout=10000)
-
-            # Go to Job Status List
-            page.goto(DASHBOARD_URL)
             page.wait_for_selector("table.data-results")
             
             # Ensure paged mode is active (not infinite scroll)
             ensure_paged_mode(page)
 
             # Apply the PATCH SUPPLY -PS - GAMMA filter
+            check_cancelled()
+            report_progress("Filtering the job list")
             filter_applied = apply_patch_supply_filter(page)
             if not filter_applied:
                 print("⚠️ Continuing without filter")
 
-            # Scrape
+            # The settings popup and filter ran with the full page; scraping only needs the DOM
+            if lean_profile:
+                lean_profile.attach(page)
+
+            if stream:
+                # Page by page in the browser, so each page's orders can be written right away
+                print("Scraping urgent orders and writing the report as they arrive...")
+                return stream_daily_report(page, snapshot, max_pages, max_orders)
+            
+            # Scrape - over HTTP when the list request can be replayed, otherwise in the browser
             print("Scraping urgent orders...")
-            orders = scrape_orders(page)
+            orders = scrape_orders_http(page, snapshot, max_pages, max_orders)
+            if orders is None:
+                orders = scrape_orders(page, snapshot, max_pages, max_orders)
 
             # Create report using template
             if orders:
-                df = pd.DataFrame(orders)
-                df.sort_values("Days Remaining", inplace=True)
-                sorted_orders = df.to_dict('records')
+                snapshot.report(orders)
+                dropped = snapshot.dropped(orders)
+                snapshot.save(orders)
                 
-                report_path = create_daily_report(sorted_orders)
+                check_cancelled()
+                report_progress("Writing the report")
+                # The report puts the orders in Days Remaining order
+                report_path = create_daily_report(orders, dropped)
                 if report_path:
                     print(f"✅ Exported {len(orders)} urgent orders to Excel: {report_path}")
             else:
@@ -868,9 +1055,16 @@ def run():
         except Exception as e:
             print(f"❌ Error: {str(e)}")
         finally:
-            browser.close()
+            session.close()
+            print_wait_summary()
+            if lean_profile:
+                lean_profile.report()
             
     return report_path
 
 if __name__ == "__main__":
-    run() 
\ No newline at end of file
+    # --stream writes the report while scraping and reads the whole list (no page or order caps)
+    if "--stream" in sys.argv:
+        run(stream=True, max_pages=None, max_orders=None)
+    else:
+        run() 
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+Snapshot of the last daily scrape, so reruns only redo the work for jobs that
+changed.
+
+The snapshot (~/.decopress/daily_snapshot.json) keeps every order of the last
+run with a hash of the job list row it came from. On the next run a row with
+the same hash gets its stored order back, including the HW letter code, so
+its job page is not visited again. Rows with a new hash are built and enriched
+as usual. The report marks new and changed jobs and lists the jobs that
+dropped off since the last run. Jobs whose HW check failed are stored with a
+recheck mark, so the next run visits their job page again.
+"""
+import os
+import json
+import time
+import hashlib
+
+# Fields of an order that come from the row or its HW job page and are reused as stored
+_REUSED_FIELDS = [
+    "Customer", "Description", "Short Description", "Job Status", "Order #", "Date In",
+    "Ship Date", "Process Codes", "Letter Code", "Has Patch Apply", "Quantity", "Location",
+]
+
+# Set on an order whose HW job page could not be read (its letter code is only the default)
+HW_CHECK_FAILED = "HW Check Failed"
+
+CHANGE_NEW = "NEW"
+CHANGE_CHANGED = "CHANGED"
+
+def get_snapshot_path():
+    """Get the path of the daily scrape snapshot"""
+    app_data_dir = os.path.join(os.path.expanduser("~"), ".decopress")
+    os.makedirs(app_data_dir, exist_ok=True)
+    return os.path.join(app_data_dir, "daily_snapshot.json")
+
+def row_hash(record):
+    """
+    Hash of a job list record (job_list.EXTRACT_ROWS_JS format). The days
+    countdown is left out so a job does not count as changed every morning.
+    """
+    content = {key: value for key, value in record.items() if key != "Days Text"}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def clear_snapshot():
+    """Remove the snapshot so the next run enriches every job again"""
+    snapshot_path = get_snapshot_path()
+    if os.path.exists(snapshot_path):
+        os.remove(snapshot_path)
+        return True
+    return False
+
+class ScrapeSnapshot:
+    """The last run's orders, and the changes this run found against them"""
+
+    def __init__(self, jobs=None, saved_at=None):
+        # job number -> {"hash": ..., "order": {...}}
+        self.jobs = jobs or {}
+        self.saved_at = saved_at
+        self._hashes = {}
+        self._reused = set()
+        # job number -> order, for runs that stream orders instead of keeping a list
+        self._tracked = {}
+
+    @classmethod
+    def load(cls):
+        """The snapshot of the last run, or an empty one"""
+        try:
+            with open(get_snapshot_path(), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            snapshot = cls(data.get("jobs", {}), data.get("saved_at"))
+            age_minutes = (time.time() - snapshot.saved_at) / 60
+            print(f"Loaded snapshot of {len(snapshot.jobs)} jobs from {age_minutes:.0f} minutes ago")
+            return snapshot
+        except FileNotFoundError:
+            return cls()
+        except (ValueError, TypeError, OSError) as e:
+            print(f"Could not read the last scrape snapshot: {str(e)}")
+            return cls()
+
+    def apply(self, order, record):
+        """
+        Compare an order with the snapshot. An unchanged order gets the stored
+        fields back; returns True when the order still has to be enriched.
+        """
+        job_number = order["Job Number"]
+        content_hash = row_hash(record)
+        self._hashes[job_number] = content_hash
+
+        stored = self.jobs.get(job_number)
+        if stored is None:
+            # Without an earlier run there is nothing to compare against
+            order["Change"] = CHANGE_NEW if self.jobs else ""
+            return True
+        if stored["hash"] != content_hash:
+            order["Change"] = CHANGE_CHANGED
+            return True
+        if stored.get("recheck"):
+            # Same row, but its HW check failed last time - enrich it again
+            order["Change"] = ""
+            return True
+
+        for field in _REUSED_FIELDS:
+            if field in stored["order"]:
+                order[field] = stored["order"][field]
+        order["Change"] = ""
+        self._reused.add(job_number)
+        return False
+
+    def is_reused(self, order):
+        return order["Job Number"] in self._reused
+
+    def track(self, order):
+        """Keep a finished order, so dropped(), save() and report() work without an orders list"""
+        self._tracked[order["Job Number"]] = order
+
+    def _orders(self, orders):
+        return self._tracked.values() if orders is None else orders
+
+    def dropped(self, orders=None):
+        """Orders of the last run that this run did not find, in their old order"""
+        orders = self._orders(orders)
+        current = {order["Job Number"] for order in orders}
+        return [stored["order"] for job_number, stored in self.jobs.items() if job_number not in current]
+
+    def save(self, orders=None):
+        """Replace the snapshot with this run's orders"""
+        jobs = {}
+        for order in self._orders(orders):
+            job_number = order["Job Number"]
+            if job_number in self._hashes:
+                stored_order = {key: value for key, value in order.items() if key not in ("Change", HW_CHECK_FAILED)}
+                jobs[job_number] = {"hash": self._hashes[job_number], "order": stored_order}
+                if order.get(HW_CHECK_FAILED):
+                    jobs[job_number]["recheck"] = True
+        try:
+            with open(get_snapshot_path(), "w", encoding="utf-8") as f:
+                json.dump({"saved_at": time.time(), "jobs": jobs}, f, default=str)
+        except OSError as e:
+            print(f"Error saving scrape snapshot: {str(e)}")
+
+    def report(self, orders=None):
+        """Print how this run compares with the last one"""
+        orders = list(self._orders(orders))
+        new = sum(1 for order in orders if order.get("Change") == CHANGE_NEW)
+        changed = sum(1 for order in orders if order.get("Change") == CHANGE_CHANGED)
+        print(f"📸 {new} new, {changed} changed, {len(self._reused)} unchanged, "
+              f"{len(self.dropped(orders))} dropped since the last run")
+        failed = [order["Job Number"] for order in orders if order.get(HW_CHECK_FAILED)]
+        if failed:
+            print(f"⚠️ {len(failed)} HW checks failed and will be redone next run: {', '.join(str(job) for job in failed)}")
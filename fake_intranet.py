@@ -0,0 +1,436 @@
+"""
+Local stand-in for the intranet, for load and scaling tests of the scrapers.
+
+Serves the markup the scrapers read: the login form, JobStatusList.aspx with
+the list settings popup (paged/infinite mode), the PATCH SUPPLY favorite
+filter, the results table and its pagination, and job.aspx with job lines and
+shipment info. Paging, filtering and the mode switch re-render the results
+through a fetch to JobStatusList.aspx, like the real list, so the in-browser
+scrape, the HTTP prefetch and the job page checks all work against it.
+
+Jobs are synthetic (10 to 10,000, the same for the same seed), and every
+request can be slowed down by a fixed latency plus random jitter.
+
+    python fake_intranet.py --jobs 1000 --latency 80 --jitter 40
+    DECOPRESS_INTRANET_URL=http://127.0.0.1:8765 python daily_orders.py
+
+Any username and password log in.
+"""
+import sys
+import html
+import time
+import random
+import secrets
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, quote
+
+DEFAULT_PORT = 8765
+MIN_JOBS = 10
+MAX_JOBS = 10000
+PAGE_SIZE = 25
+# Infinite mode renders this many rows at once
+INFINITE_ROWS = 100
+# Pagination shows a window of page links around the current page
+PAGINATION_WINDOW = 10
+
+SESSION_COOKIE = "FakeIntranetSession"
+LIST_PATH = "/JobStatusList/JobStatusList.aspx"
+JOB_PATH = "/Jobs/job.aspx"
+FILTER_NAME = "PATCH SUPPLY -PS - GAMMA"
+FILTER_ID = "6699e45c-7880-4fb2-9c60-ac8a6ad19de1"
+
+_CUSTOMERS = ["Acme Outfitters", "Blue Ridge Athletics", "Cedar Creek Brewing", "Delta Uniforms",
+              "Evergreen Scouts", "Foxtail Apparel", "Granite State FC", "Harbor Marine Supply"]
+_ITEMS = ["Leather Patch Hats", "Woven Patches", "Embroidered Polos", "Twill Jerseys",
+          "Suede Patch Beanies", "Denim Jackets", "Team Hoodies", "Trucker Caps"]
+_STATUSES = ["1 - Art Approval", "2 - Ready For Production", "3 - In Production", "4 - Ready To Ship"]
+_PROCESS_CODES = ["HW", "EM", "AP", "DS", "PA", "SP"]
+_TAGS = ["rfp", "@sub", "@laser", "qc"]
+_GARMENTS = ["FAUX LEATHER PATCH", "LEATHERETTE", "SUEDE", "SIMWOVEN", "DECO TWILL",
+             "WOVEN LABEL", "EMBROIDERED PATCH", "COTTON TEE"]
+_CONTACTS = ["Alex Kim", "Jordan Lee", "Sam Rivera", "Taylor Brooks"]
+
+def generate_jobs(count, seed=1):
+    """Synthetic jobs for the list and the job pages, the same for the same seed"""
+    count = max(MIN_JOBS, min(MAX_JOBS, count))
+    rng = random.Random(seed)
+    jobs = []
+    for index in range(count):
+        codes = rng.sample(_PROCESS_CODES, rng.randint(1, 3))
+        qty = rng.choice([12, 24, 48, 50, 72, 100, 144, 250])
+        jobs.append({
+            "number": str(100000 + index),
+            "customer": rng.choice(_CUSTOMERS),
+            "description": f"{rng.choice(_ITEMS)} - {rng.choice(['Spring', 'Fall', 'Event', 'Reorder'])} {rng.randint(1, 99)}",
+            "status": rng.choice(_STATUSES),
+            "order": f"PO-{rng.randint(10000, 99999)}",
+            "date_in": f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/2025",
+            "ship_date": f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/2025",
+            "days": rng.randint(-3, 15),
+            "codes": [(code, qty if i == 0 else rng.randint(1, qty)) for i, code in enumerate(codes)],
+            "tags": rng.sample(_TAGS, rng.randint(0, 2)),
+            "patch_supply": rng.random() < 0.6,
+            "garments": rng.sample(_GARMENTS, rng.randint(1, 2)),
+            "contact": rng.choice(_CONTACTS),
+            "qty": qty,
+        })
+    return jobs
+
+def _e(value):
+    return html.escape(str(value), quote=True)
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>Intranet Login</title></head>
+<body>
+<form method="post" action="/login">
+  <input type="hidden" name="ReturnUrl" value="{return_url}">
+  <input id="txt_Username" name="txt_Username" type="text">
+  <input id="txt_Password" name="txt_Password" type="password">
+  <button id="btn_Login" type="submit">Log In</button>
+</form>
+</body></html>"""
+
+LIST_PAGE = """<!DOCTYPE html>
+<html><head><title>Job Status List</title>
+<style>.list-settings-popup[hidden] {{ display: none; }}</style>
+</head>
+<body>
+<a href="#" data-event="cw:list-settings" aria-expanded="false">Settings</a>
+<div class="list-settings-popup" hidden>
+  <label><input type="radio" name="list-mode" value="PAGED"{paged_checked}> Paged</label>
+  <label><input type="radio" name="list-mode" value="INFINITE"{infinite_checked}> Infinite scroll</label>
+  <button type="button" class="js-close-popup">Close</button>
+</div>
+<div class="favorite-filters">
+  <label data-label="{filter_name}"><input type="checkbox" data-id="{filter_id}"{filter_checked}> {filter_name}</label>
+</div>
+<div id="jobStatusListResults">{results}</div>
+<script>
+const state = {{ page: {page}, mode: "{mode}", filter: {filter_js} }};
+const settings = document.querySelector('a[data-event="cw:list-settings"]');
+const popup = document.querySelector('.list-settings-popup');
+
+async function loadList(changes) {{
+  Object.assign(state, changes);
+  const url = `{list_path}?handler=list&page=${{state.page}}&mode=${{state.mode}}&filter=${{state.filter ? 1 : 0}}`;
+  const response = await fetch(url, {{ credentials: 'same-origin', headers: {{ 'X-Requested-With': 'XMLHttpRequest' }} }});
+  document.getElementById('jobStatusListResults').innerHTML = await response.text();
+}}
+
+settings.addEventListener('click', (event) => {{
+  event.preventDefault();
+  const open = popup.hidden;
+  popup.hidden = !open;
+  settings.setAttribute('aria-expanded', String(open));
+}});
+document.querySelector('.js-close-popup').addEventListener('click', () => {{
+  popup.hidden = true;
+  settings.setAttribute('aria-expanded', 'false');
+}});
+for (const radio of document.querySelectorAll('input[name="list-mode"]')) {{
+  radio.addEventListener('change', () => {{
+    for (const other of document.querySelectorAll('input[name="list-mode"]')) {{
+      if (other === radio) other.setAttribute('checked', 'checked'); else other.removeAttribute('checked');
+    }}
+    loadList({{ mode: radio.value, page: 1 }});
+  }});
+}}
+document.querySelector('input[data-id="{filter_id}"]').addEventListener('change', (event) => {{
+  loadList({{ filter: event.target.checked, page: 1 }});
+}});
+document.getElementById('jobStatusListResults').addEventListener('click', (event) => {{
+  const link = event.target.closest('ul.pagination a.page-link');
+  if (!link) return;
+  event.preventDefault();
+  loadList({{ page: parseInt(link.parentElement.getAttribute('data-lp')) }});
+}});
+</script>
+</body></html>"""
+
+JOB_PAGE = """<!DOCTYPE html>
+<html><head><title>Job {number}</title></head>
+<body>
+<form>
+  <input id="orderNumber" value="{order}">
+  <input id="orderDescription" value="{description}">
+  <input id="customer" value="{customer}">
+  <select id="customerUser">
+    <option value="" hidden>Select a contact</option>
+    <option value="1" selected>{contact}</option>
+  </select>
+</form>
+<ul class="shipment-info">
+  <li class="media"><div class="media-body">{customer}</div></li>
+  <li class="media"><address class="mb-1">{street} Main St<br>Springfield, ST 0{zip}<span class="badge">Verified</span></address></li>
+  <li class="media"><div class="media-body">Attn: {contact}</div></li>
+  <li class="media"><div class="shipment-notes-container">Deliver to loading dock</div></li>
+</ul>
+<table class="job-joblines-list">
+  <tbody>
+  <tr class="js-jobline-row"><td>GSORT</td><td>Garment sort</td><td></td><td></td></tr>
+{joblines}
+  </tbody>
+</table>
+</body></html>"""
+
+def _row_html(job):
+    badges = "".join(
+        f'<span class="ew-badge"><span class="process-code-badge">{_e(code)}</span>'
+        f'<span class="process-qty">{qty}</span></span>'
+        for code, qty in job["codes"]
+    )
+    tags = "".join(
+        f'<li><span class="jobtag tag showtag"><span class="tag-text">{_e(tag.upper())}</span></span></li>'
+        for tag in job["tags"]
+    )
+    return (
+        "<tr>"
+        f'<td><a href="{JOB_PATH}?ID={job["number"]}">{job["number"]}</a></td>'
+        f'<td>{_e(job["customer"])}</td>'
+        f'<td>{_e(job["description"])}</td>'
+        f'<td>{_e(job["status"])}</td>'
+        f'<td>{_e(job["order"])}</td>'
+        f'<td>{_e(job["date_in"])}</td>'
+        f'<td>{_e(job["ship_date"])}<br><span class="js-days-to-due-date">{job["days"]}</span></td>'
+        f'<td><div class="ew-badge-container process-codes">{badges}</div></td>'
+        f'<td><ul class="jobtag-container">{tags}</ul></td>'
+        "</tr>"
+    )
+
+def _joblines_html(job):
+    rows = []
+    for index, garment in enumerate(job["garments"], start=1):
+        asset = f"PT-{job['number']}-{index}"
+        rows.append(
+            f'  <tr class="js-jobline-row" data-garment="{_e(garment)}">'
+            f'<td><a class="js-view-asset" href="#">{asset}</a></td>'
+            f'<td>{_e(job["description"])}</td>'
+            f'<td class="jobline-garment">{_e(garment)}</td>'
+            f'<td>{job["qty"]}</td></tr>'
+        )
+    return "\n".join(rows)
+
+class FakeIntranet:
+    """The stand-in server; start() runs it on a daemon thread"""
+
+    def __init__(self, jobs=200, latency_ms=0, jitter_ms=0, seed=1, host="127.0.0.1", port=DEFAULT_PORT):
+        self.jobs = generate_jobs(jobs, seed)
+        self.jobs_by_number = {job["number"]: job for job in self.jobs}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.host = host
+        self.port = port
+        # session token -> {"mode": ..., "filter": ...}; new sessions start in infinite mode, unfiltered
+        self.sessions = {}
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self.server = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def delay(self):
+        """Sleep for the configured latency plus jitter"""
+        if not self.latency_ms and not self.jitter_ms:
+            return
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        time.sleep(max(0.0, self.latency_ms + jitter) / 1000)
+
+    def list_jobs(self, filtered):
+        return [job for job in self.jobs if job["patch_supply"]] if filtered else self.jobs
+
+    def results_html(self, state, page_number):
+        """The #jobStatusListResults content: table, pagination and filter marker"""
+        jobs = self.list_jobs(state["filter"])
+        parts = []
+        if state["filter"]:
+            parts.append(f'<div class="active-filters"><span class="active-filter">{_e(FILTER_NAME)}</span></div>')
+
+        if state["mode"] == "PAGED":
+            page_count = max(1, -(-len(jobs) // PAGE_SIZE))
+            page_number = max(1, min(page_number, page_count))
+            shown = jobs[(page_number - 1) * PAGE_SIZE:page_number * PAGE_SIZE]
+        else:
+            page_count = 1
+            shown = jobs[:INFINITE_ROWS]
+
+        parts.append('<table class="data-results"><thead><tr><th>Job #</th><th>Customer</th>'
+                     '<th>Description</th><th>Status</th><th>Order #</th><th>Date In</th>'
+                     '<th>Ship Date</th><th>Process</th><th>Tags</th></tr></thead><tbody>')
+        parts.extend(_row_html(job) for job in shown)
+        parts.append("</tbody></table>")
+
+        if page_count > 1:
+            first = max(1, page_number - PAGINATION_WINDOW // 2)
+            last = min(page_count, first + PAGINATION_WINDOW - 1)
+            items = "".join(
+                f'<li class="page-item{" active" if number == page_number else ""}" data-lp="{number}">'
+                f'<a class="page-link" href="#">{number}</a></li>'
+                for number in range(first, last + 1)
+            )
+            parts.append(f'<ul class="pagination">{items}</ul>')
+        return "".join(parts)
+
+    def list_page_html(self, state):
+        return LIST_PAGE.format(
+            paged_checked=' checked="checked"' if state["mode"] == "PAGED" else "",
+            infinite_checked=' checked="checked"' if state["mode"] != "PAGED" else "",
+            filter_name=_e(FILTER_NAME),
+            filter_id=FILTER_ID,
+            filter_checked=" checked" if state["filter"] else "",
+            results=self.results_html(state, 1),
+            page=1,
+            mode=state["mode"],
+            filter_js="true" if state["filter"] else "false",
+            list_path=LIST_PATH,
+        )
+
+    def job_page_html(self, job):
+        number = int(job["number"])
+        return JOB_PAGE.format(
+            number=job["number"],
+            order=_e(job["order"]),
+            description=_e(job["description"]),
+            customer=_e(job["customer"]),
+            contact=_e(job["contact"]),
+            street=number % 900 + 100,
+            zip=number % 9000 + 1000,
+            joblines=_joblines_html(job),
+        )
+
+    def new_session(self):
+        token = secrets.token_hex(16)
+        with self._lock:
+            self.sessions[token] = {"mode": "INFINITE", "filter": False}
+        return token
+
+    def start(self):
+        """Serve on a daemon thread; returns self"""
+        intranet = self
+
+        class Handler(_Handler):
+            pass
+        Handler.intranet = intranet
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"✅ Fake intranet with {len(self.jobs)} jobs at {self.base_url} "
+              f"(latency {self.latency_ms} ms ± {self.jitter_ms} ms)")
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+            print(f"Fake intranet stopped after {self.requests_served} requests")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+class _Handler(BaseHTTPRequestHandler):
+    intranet = None
+
+    def log_message(self, format, *args):
+        # One line per request would drown the scraper output
+        pass
+
+    def _session(self):
+        for part in self.headers.get("Cookie", "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == SESSION_COOKIE:
+                return self.intranet.sessions.get(value)
+        return None
+
+    def _send(self, status, body="", content_type="text/html; charset=utf-8", headers=()):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _redirect(self, location, headers=()):
+        self._send(302, "", headers=[("Location", location), *headers])
+
+    def _count(self):
+        intranet = self.intranet
+        with intranet._lock:
+            intranet.requests_served += 1
+        intranet.delay()
+
+    def do_GET(self):
+        self._count()
+        parts = urlsplit(self.path)
+        query = {name: values[-1] for name, values in parse_qs(parts.query).items()}
+        path = parts.path.rstrip("/") or "/"
+
+        if path == "/":
+            return self._send(200, LOGIN_PAGE.format(return_url=_e(query.get("ReturnUrl", LIST_PATH))))
+
+        state = self._session()
+        if state is None:
+            return self._redirect(f"/?ReturnUrl={quote(self.path, safe='')}")
+
+        if path.lower() == LIST_PATH.lower():
+            if query.get("handler") == "list":
+                # The list's own paging/filter request; the settings stick to the session
+                if query.get("mode") in ("PAGED", "INFINITE"):
+                    state["mode"] = query["mode"]
+                if "filter" in query:
+                    state["filter"] = query["filter"] == "1"
+                page_number = int(query["page"]) if query.get("page", "").isdigit() else 1
+                return self._send(200, self.intranet.results_html(state, page_number))
+            return self._send(200, self.intranet.list_page_html(state))
+
+        if path.lower() == JOB_PATH.lower():
+            job = self.intranet.jobs_by_number.get(query.get("ID", ""))
+            if job is None:
+                # Unknown jobs go back to the list, like the real site
+                return self._redirect(LIST_PATH)
+            return self._send(200, self.intranet.job_page_html(job))
+
+        self._send(404, "<html><body>Not found</body></html>")
+
+    def do_POST(self):
+        self._count()
+        length = int(self.headers.get("Content-Length") or 0)
+        form = {name: values[-1] for name, values in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+        if urlsplit(self.path).path != "/login":
+            return self._send(404, "<html><body>Not found</body></html>")
+        if not form.get("txt_Username") or not form.get("txt_Password"):
+            return self._send(200, LOGIN_PAGE.format(return_url=_e(form.get("ReturnUrl", LIST_PATH))))
+
+        # Login always lands on the job list, like the real site
+        token = self.intranet.new_session()
+        self._redirect(LIST_PATH, headers=[("Set-Cookie", f"{SESSION_COOKIE}={token}; Path=/; HttpOnly")])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in intranet with synthetic jobs")
+    parser.add_argument("--jobs", type=int, default=200, help=f"number of jobs ({MIN_JOBS}-{MAX_JOBS})")
+    parser.add_argument("--latency", type=float, default=0, help="added latency per request in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="random +/- jitter per request in ms")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    intranet = FakeIntranet(args.jobs, args.latency, args.jitter, args.seed, port=args.port).start()
+    print(f"Point the tools at it with DECOPRESS_INTRANET_URL={intranet.base_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        intranet.stop()
+        sys.exit(0)
@@ -0,0 +1,251 @@
+"""
+Record a real intranet session to a HAR file and replay it, so the scrapers
+can be benchmarked and profiled without the live site.
+
+    python har_harness.py record [--har PATH] [--jobs N]
+    python har_harness.py bench [--har PATH] [--jobs N] [--runs N]
+
+record logs in (outside the recording, so no login exchange is written), then
+runs the benchmark phases against the live intranet with record_har_path set:
+the job list with paged mode and the patch supply filter, reading the list
+pages (without the HW checks, which have their own phase),
+check_hw_garment_details and get_job_details for the first N jobs. Cookies,
+auth headers and any username/password fields are scrubbed from the HAR.
+
+bench runs the same phases in a browser context that is served entirely by
+context.route_from_har (unknown requests are aborted) and reports wall time,
+main-frame navigations, Playwright calls on the page and requests per phase.
+
+The HTTP list prefetch (job_list_client) and the parallel page pool go around
+the browser context, so the phases use the in-browser paths.
+"""
+import os
+import re
+import json
+import time
+import argparse
+from collections import Counter
+from contextlib import contextmanager
+from urllib.parse import parse_qsl, urlencode
+from playwright.sync_api import sync_playwright
+import daily_orders
+import packing_slip
+from utils import DASHBOARD_URL
+from session_store import ensure_logged_in, new_session_context
+
+DEFAULT_JOBS = 5
+
+SCRUBBED = "[scrubbed]"
+_SECRET_HEADERS = {"cookie", "set-cookie", "authorization", "proxy-authorization"}
+_SECRET_FIELDS = re.compile(r"user(name)?$|pass(word)?$|pwd$", re.IGNORECASE)
+
+def get_recording_path():
+    """Default location of the recorded session"""
+    recordings_dir = os.path.join(os.path.expanduser("~"), ".decopress", "recordings")
+    os.makedirs(recordings_dir, exist_ok=True)
+    return os.path.join(recordings_dir, "session.har")
+
+class CountingPage:
+    """Forwards everything to a Playwright page and counts the calls made on it"""
+
+    def __init__(self, page, calls):
+        object.__setattr__(self, "_page", page)
+        object.__setattr__(self, "_calls", calls)
+
+    def __getattr__(self, name):
+        value = getattr(self._page, name)
+        if not callable(value):
+            return value
+        calls = self._calls
+
+        def call(*args, **kwargs):
+            calls[name] += 1
+            return value(*args, **kwargs)
+        return call
+
+    def __setattr__(self, name, value):
+        setattr(self._page, name, value)
+
+class PhaseMeter:
+    """Wall time, navigations, Playwright calls and requests of each benchmark phase"""
+
+    def __init__(self, page):
+        self.calls = Counter()
+        self.navigations = 0
+        self.requests = 0
+        self.results = []
+        self.page = CountingPage(page, self.calls)
+        page.on("framenavigated", self._on_navigated)
+        page.on("request", self._on_request)
+        self._main_frame = page.main_frame
+
+    def _on_navigated(self, frame):
+        if frame == self._main_frame:
+            self.navigations += 1
+
+    def _on_request(self, request):
+        self.requests += 1
+
+    @contextmanager
+    def phase(self, name):
+        calls, navigations, requests = sum(self.calls.values()), self.navigations, self.requests
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.results.append((
+                name,
+                time.perf_counter() - started,
+                self.navigations - navigations,
+                sum(self.calls.values()) - calls,
+                self.requests - requests,
+            ))
+
+    def report(self, title):
+        print(f"📊 {title}")
+        print(f"  {'phase':<28}{'wall (s)':>10}{'navigations':>13}{'calls':>8}{'requests':>10}")
+        for name, wall, navigations, calls, requests in self.results:
+            print(f"  {name:<28}{wall:>10.2f}{navigations:>13}{calls:>8}{requests:>10}")
+        totals = [sum(result[i] for result in self.results) for i in range(1, 5)]
+        print(f"  {'total':<28}{totals[0]:>10.2f}{totals[1]:>13}{totals[2]:>8}{totals[3]:>10}")
+
+def run_phases(meter, max_jobs=DEFAULT_JOBS):
+    """The scraping steps that are recorded and benchmarked, in a fixed order"""
+    page = meter.page
+    # The page pool would open browsers outside the recorded context
+    parallel_hw_min_jobs = daily_orders.PARALLEL_HW_MIN_JOBS
+    daily_orders.PARALLEL_HW_MIN_JOBS = float("inf")
+    try:
+        with meter.phase("open job list"):
+            page.goto(DASHBOARD_URL, wait_until="domcontentloaded")
+            page.wait_for_selector("table.data-results")
+            daily_orders.ensure_paged_mode(page)
+            daily_orders.apply_patch_supply_filter(page)
+
+        # Only the list pages - the HW checks are timed in their own phase
+        with meter.phase("read job list"):
+            orders = [order for page_orders in daily_orders.iter_order_pages(page) for order in page_orders]
+
+        hw_jobs = [order["Job Number"] for order in orders
+                   if "HW" in [code.upper() for code in order["Process Codes"]]][:max_jobs]
+        with meter.phase("check_hw_garment_details"):
+            for job_number in hw_jobs:
+                daily_orders.check_hw_garment_details(page, job_number)
+
+        jobs = [order["Job Number"] for order in orders][:max_jobs]
+        with meter.phase("get_job_details"):
+            for job_number in jobs:
+                packing_slip.get_job_details(page, job_number)
+        return orders
+    finally:
+        daily_orders.PARALLEL_HW_MIN_JOBS = parallel_hw_min_jobs
+
+def _scrub_pairs(pairs):
+    return [(name, SCRUBBED if _SECRET_FIELDS.search(name) else value) for name, value in pairs]
+
+def scrub_har(har_path):
+    """Remove cookies, auth headers and login fields from a recorded HAR"""
+    with open(har_path, "r", encoding="utf-8") as f:
+        har = json.load(f)
+
+    scrubbed = 0
+    for entry in har["log"]["entries"]:
+        for message in (entry["request"], entry["response"]):
+            for header in message.get("headers", []):
+                if header["name"].lower() in _SECRET_HEADERS:
+                    header["value"] = SCRUBBED
+                    scrubbed += 1
+            if message.get("cookies"):
+                scrubbed += len(message["cookies"])
+                message["cookies"] = []
+
+        post_data = entry["request"].get("postData")
+        if post_data:
+            for param in post_data.get("params", []):
+                if _SECRET_FIELDS.search(param["name"]):
+                    param["value"] = SCRUBBED
+                    scrubbed += 1
+            text = post_data.get("text")
+            if text and "application/x-www-form-urlencoded" in post_data.get("mimeType", ""):
+                pairs = parse_qsl(text, keep_blank_values=True)
+                if any(_SECRET_FIELDS.search(name) for name, _ in pairs):
+                    post_data["text"] = urlencode(_scrub_pairs(pairs))
+                    scrubbed += 1
+
+    with open(har_path, "w", encoding="utf-8") as f:
+        json.dump(har, f)
+    print(f"🧽 Scrubbed {scrubbed} credentials from {har_path}")
+
+def _launch(p):
+    browser_path = daily_orders.ensure_browser_installed()
+    launch_options = {"headless": True}
+    if browser_path:
+        launch_options["executable_path"] = browser_path
+    return p.chromium.launch(**launch_options)
+
+def record(har_path=None, max_jobs=DEFAULT_JOBS):
+    """Run the phases against the live intranet and save them as a HAR"""
+    har_path = har_path or get_recording_path()
+    with sync_playwright() as p:
+        browser = _launch(p)
+        try:
+            # Log in in a separate context so the recording starts authenticated
+            login_context = new_session_context(browser)
+            if not ensure_logged_in(login_context.new_page(), DASHBOARD_URL):
+                return None
+            state = login_context.storage_state()
+            login_context.close()
+
+            context = browser.new_context(storage_state=state, record_har_path=har_path,
+                                          record_har_content="embed")
+            meter = PhaseMeter(context.new_page())
+            try:
+                run_phases(meter, max_jobs)
+            finally:
+                # The HAR is written when the context closes
+                context.close()
+        finally:
+            browser.close()
+
+    scrub_har(har_path)
+    meter.report("Live run (recorded)")
+    print(f"✅ Recorded session: {har_path}")
+    return har_path
+
+def bench(har_path=None, max_jobs=DEFAULT_JOBS, runs=1):
+    """Run the phases against a recording; returns the per-phase results of every run"""
+    har_path = har_path or get_recording_path()
+    if not os.path.exists(har_path):
+        print(f"❌ No recording at {har_path} - run 'python har_harness.py record' first")
+        return None
+
+    all_results = []
+    with sync_playwright() as p:
+        browser = _launch(p)
+        try:
+            for run_number in range(1, runs + 1):
+                context = browser.new_context()
+                context.route_from_har(har_path, not_found="abort")
+                meter = PhaseMeter(context.new_page())
+                try:
+                    run_phases(meter, max_jobs)
+                finally:
+                    context.close()
+                meter.report(f"Replay run {run_number} of {runs}")
+                all_results.append(meter.results)
+        finally:
+            browser.close()
+    return all_results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record and replay intranet sessions for benchmarks")
+    parser.add_argument("command", choices=["record", "bench"])
+    parser.add_argument("--har", help="HAR file (default ~/.decopress/recordings/session.har)")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="job pages to visit per phase")
+    parser.add_argument("--runs", type=int, default=1, help="replay runs (bench only)")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.har, args.jobs)
+    else:
+        bench(args.har, args.jobs, args.runs)
@@ -0,0 +1,169 @@
+"""
+Local index of job list rows, so a job can be looked up without paging
+through the Job Status List.
+
+Every list walk (daily scrape, packing slip search, background refresh) writes
+the rows it read into a SQLite file under ~/.decopress, keyed by job number.
+Lookups are a single primary key read. Entries older than INDEX_MAX_AGE_HOURS
+are still returned, but start a background refresh of the list.
+"""
+import os
+import time
+import sqlite3
+import threading
+from contextlib import closing
+from utils import load_credentials, DASHBOARD_URL
+from job_list import extract_job_rows, get_page_count
+from job_list_client import prefetch_list_pages
+from waits import wait_for_rows, click_and_wait_for_list
+
+# Rows older than this trigger a background refresh
+INDEX_MAX_AGE_HOURS = 24
+
+# How many list pages a refresh reads
+REFRESH_MAX_PAGES = 10
+
+_COLUMNS = ["Customer", "Description", "Job Status", "Order #", "Date In", "Ship Date"]
+
+_refresh_lock = threading.Lock()
+
+def get_index_path():
+    """Get the path of the job index database"""
+    app_data_dir = os.path.join(os.path.expanduser("~"), ".decopress")
+    os.makedirs(app_data_dir, exist_ok=True)
+    return os.path.join(app_data_dir, "job_index.sqlite")
+
+def _connect():
+    connection = sqlite3.connect(get_index_path(), timeout=10)
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_number TEXT PRIMARY KEY,
+            customer TEXT,
+            description TEXT,
+            job_status TEXT,
+            order_number TEXT,
+            date_in TEXT,
+            ship_date TEXT,
+            page INTEGER,
+            updated_at REAL
+        )
+    """)
+    return connection
+
+def record_rows(records, page_number=None):
+    """
+    Store job list records (job_list.EXTRACT_ROWS_JS format). page_number is
+    the page of the unfiltered list; pass None for filtered lists so the known
+    page of a job is kept.
+    """
+    rows = [
+        (record["Job Number"], *(record.get(column) or "" for column in _COLUMNS), page_number, time.time())
+        for record in records if record.get("Job Number")
+    ]
+    if not rows:
+        return
+    try:
+        with closing(_connect()) as connection, connection:
+            connection.executemany("""
+                INSERT INTO jobs (job_number, customer, description, job_status, order_number,
+                                  date_in, ship_date, page, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_number) DO UPDATE SET
+                    customer = excluded.customer,
+                    description = excluded.description,
+                    job_status = excluded.job_status,
+                    order_number = excluded.order_number,
+                    date_in = excluded.date_in,
+                    ship_date = excluded.ship_date,
+                    page = COALESCE(excluded.page, jobs.page),
+                    updated_at = excluded.updated_at
+            """, rows)
+    except sqlite3.Error as e:
+        print(f"Error updating job index: {str(e)}")
+
+def lookup(job_number):
+    """Return (job_info, page, age in hours) for a job, or None if it is not indexed"""
+    try:
+        with closing(_connect()) as connection:
+            row = connection.execute(
+                "SELECT customer, description, job_status, order_number, date_in, ship_date, page, updated_at "
+                "FROM jobs WHERE job_number = ?", (job_number,)
+            ).fetchone()
+    except sqlite3.Error as e:
+        print(f"Error reading job index: {str(e)}")
+        return None
+    if row is None:
+        return None
+
+    job_info = {"Job Number": job_number}
+    job_info.update(zip(_COLUMNS, row[:6]))
+    age_hours = (time.time() - row[7]) / 3600
+    return job_info, row[6], age_hours
+
+def is_stale(age_hours):
+    return age_hours > INDEX_MAX_AGE_HOURS
+
+def clear_index():
+    """Remove the index so the next searches start from the job list again"""
+    index_path = get_index_path()
+    if os.path.exists(index_path):
+        os.remove(index_path)
+        return True
+    return False
+
+def index_job_list(page, max_pages=REFRESH_MAX_PAGES):
+    """Read up to max_pages of the (unfiltered) job list on page into the index"""
+    wait_for_rows(page)
+    record_rows(extract_job_rows(page), 1)
+    last_page = min(get_page_count(page), max_pages)
+    if last_page == 1:
+        return 1
+
+    other_pages = prefetch_list_pages(page, max_pages)
+    if other_pages is not None:
+        for page_number, records in enumerate(other_pages, start=2):
+            record_rows(records, page_number)
+        return 1 + len(other_pages)
+
+    # No replayable request - click through the pages
+    current_page = 2 if page.query_selector("ul.pagination li.active[data-lp='2']") else 1
+    while True:
+        if current_page > 1:
+            record_rows(extract_job_rows(page), current_page)
+        if current_page >= last_page:
+            return current_page
+        next_page = page.query_selector(f"ul.pagination li[data-lp='{current_page + 1}'] a.page-link")
+        if not next_page:
+            return current_page
+        if not click_and_wait_for_list(page, next_page, f"index page {current_page + 1}",
+                                       expected_page=current_page + 1):
+            return current_page
+        current_page += 1
+
+def _refresh(browser_path, max_pages):
+    from playwright.sync_api import sync_playwright
+    from browser_host import open_browser_session
+    from session_store import ensure_logged_in
+
+    try:
+        with sync_playwright() as p:
+            session = open_browser_session(p, browser_path)
+            try:
+                # Saved credentials only - no dialogs off the UI thread
+                if ensure_logged_in(session.page, DASHBOARD_URL, login_info=load_credentials):
+                    pages = index_job_list(session.page, max_pages)
+                    print(f"✅ Job index refreshed from {pages} list pages")
+            finally:
+                session.close()
+    except Exception as e:
+        print(f"Job index refresh failed: {str(e)}")
+    finally:
+        _refresh_lock.release()
+
+def refresh_in_background(browser_path=None, max_pages=REFRESH_MAX_PAGES):
+    """Re-read the job list into the index on a daemon thread (one refresh at a time)"""
+    if not _refresh_lock.acquire(blocking=False):
+        return None
+    thread = threading.Thread(target=_refresh, args=(browser_path, max_pages), daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,91 @@
+"""
+Bulk extraction of the Job Status List table.
+
+Reading a row cell by cell costs one Playwright round trip per cell, badge
+and tag. EXTRACT_ROWS_JS reads every row on the current page in a single
+evaluate call and returns plain records that the daily orders scrape and the
+packing slip job search both build on.
+"""
+
+ROW_SELECTOR = "table.data-results tbody tr"
+
+# Record keys match the order dict keys where the value is the same
+EXTRACT_ROWS_JS = """(rows) => {
+    // Same as utils.get_clean_text: only the text before any child elements
+    const cleanText = (el) => el ? (el.innerText || '').split('\\n')[0].trim() : '';
+    const cell = (row, n) => cleanText(row.querySelector(`td:nth-child(${n})`));
+
+    return rows.map(row => {
+        const daysElement = row.querySelector('span.js-days-to-due-date');
+
+        // Process codes and the highest quantity, scoped to this row only
+        let codes = [];
+        let highestQty = 0;
+        for (const container of row.querySelectorAll('.ew-badge-container.process-codes, .process-codes')) {
+            for (const badge of container.querySelectorAll('.ew-badge')) {
+                const codeElement = badge.querySelector('.process-code-badge');
+                if (!codeElement) continue;
+                codes.push(codeElement.textContent.trim());
+                const qtyElement = badge.querySelector('.process-qty');
+                const qty = qtyElement ? parseInt(qtyElement.textContent.trim()) : NaN;
+                if (!isNaN(qty) && qty > highestQty) highestQty = qty;
+            }
+        }
+
+        // Fall back to any badge in the row if the containers were not found
+        if (codes.length === 0 || highestQty === 0) {
+            codes = Array.from(row.querySelectorAll('.process-code-badge'))
+                .map(el => el.textContent.trim())
+                .filter(code => code);
+            for (const qtyElement of row.querySelectorAll('.process-qty')) {
+                const qty = parseInt(qtyElement.textContent.trim());
+                if (!isNaN(qty) && qty > highestQty) highestQty = qty;
+            }
+        }
+
+        const tags = Array.from(
+            row.querySelectorAll('.jobtag-container li .jobtag.tag.showtag .tag-text')
+        ).map(el => el.textContent.trim().toLowerCase());
+
+        return {
+            "Job Number": cell(row, 1),
+            "Customer": cell(row, 2),
+            "Description": cell(row, 3),
+            "Job Status": cell(row, 4),
+            "Order #": cell(row, 5),
+            "Date In": cell(row, 6),
+            "Ship Date": cell(row, 7),
+            "Days Text": daysElement ? daysElement.innerText.trim() : null,
+            "Process Codes": codes,
+            "Highest Qty": highestQty,
+            "Tags": tags,
+        };
+    });
+}"""
+
+# Location tags in priority order - earlier items take precedence
+LOCATION_TAG_PRIORITY = [("rfp", "RFP"), ("@sub", "SUB"), ("@laser", "LASER"), ("qc", "QC")]
+
+def extract_job_rows(page):
+    """Read every row of the job list on the current page in one round trip"""
+    return page.eval_on_selector_all(ROW_SELECTOR, EXTRACT_ROWS_JS)
+
+def location_from_tags(tags):
+    """Pick the location code (RFP, SUB, LASER, QC) from a row's job tags"""
+    for tag, location in LOCATION_TAG_PRIORITY:
+        if tag in tags:
+            return location
+    return ""
+
+def is_list_response(response):
+    """Check whether a network response is the job list's own data request"""
+    request = response.request
+    return request.resource_type in ("xhr", "fetch") and "JobStatusList" in request.url
+
+def get_page_count(page):
+    """Get the number of list pages from the pagination links"""
+    numbers = page.eval_on_selector_all(
+        "ul.pagination li[data-lp]",
+        "items => items.map(li => parseInt(li.getAttribute('data-lp'))).filter(n => !isNaN(n))"
+    )
+    return max(numbers) if numbers else 1
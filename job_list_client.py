@@ -0,0 +1,328 @@
+"""
+Direct HTTP access to the Job Status List data, without going through the DOM.
+
+The list pages itself with an XHR/postback. JobListClient captures that
+request once from the logged-in browser (by moving to page 2), then replays it
+for any page number over a pooled keep-alive requests.Session that carries
+the browser's session cookies. Responses are parsed into the same records as
+job_list.extract_job_rows, so callers can build orders exactly as before.
+"""
+import re
+import json
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from job_list import is_list_response, get_page_count
+
+# requests is optional - without it the scrape stays in the browser
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+REQUEST_TIMEOUT = 30  # seconds
+
+# How many list pages are fetched at the same time
+PREFETCH_WORKERS = 4
+
+# Headers that belong to the original browser connection, not the replay
+_SKIPPED_HEADERS = {"cookie", "host", "content-length", "connection", "accept-encoding"}
+
+# Elements that start a new line in innerText
+_BLOCK_TAGS = {"div", "p", "br", "ul", "ol", "li", "table", "tr", "h1", "h2", "h3", "h4", "h5", "h6"}
+_VOID_TAGS = {"br", "img", "input", "hr", "meta", "link", "col", "source", "wbr"}
+
+class JobRowParser(HTMLParser):
+    """Parse job list rows from HTML into job_list.EXTRACT_ROWS_JS records"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.records = []
+        self.page_numbers = []
+        self.saw_results_table = False
+        self._stack = []
+        self._row = None
+        self._cell = None
+
+    def _in_results_table(self):
+        return any(entry["tag"] == "table" and "data-results" in entry["classes"] for entry in self._stack)
+
+    def _has_ancestor_class(self, *classes):
+        return any(set(classes) <= entry["classes"] for entry in self._stack)
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = set((attrs.get("class") or "").split())
+
+        if tag == "li" and attrs.get("data-lp", "").isdigit():
+            self.page_numbers.append(int(attrs["data-lp"]))
+        if tag == "table" and "data-results" in classes:
+            self.saw_results_table = True
+
+        if tag == "tr" and (self._in_results_table() or not self.saw_results_table):
+            self._row = {"cells": [], "days": None, "codes": [], "qtys": [], "tags": []}
+        elif tag == "td" and self._row is not None and self._cell is None:
+            self._cell = []
+        elif tag in _BLOCK_TAGS and self._cell is not None:
+            self._cell.append("\n")
+
+        if tag in _VOID_TAGS:
+            return
+
+        capture = None
+        if self._row is not None:
+            if "js-days-to-due-date" in classes:
+                capture = "days"
+            elif "process-code-badge" in classes:
+                capture = "codes"
+            elif "process-qty" in classes:
+                capture = "qtys"
+            elif ("tag-text" in classes and self._has_ancestor_class("jobtag-container")
+                    and self._has_ancestor_class("jobtag", "tag", "showtag")):
+                capture = "tags"
+        self._stack.append({"tag": tag, "classes": classes, "capture": capture, "text": []})
+
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS:
+            return
+
+        # Pop up to the matching element (the markup is not always well formed)
+        while self._stack:
+            entry = self._stack.pop()
+            self._finish_capture(entry)
+            if entry["tag"] == tag:
+                break
+
+        if tag == "td" and self._cell is not None:
+            self._row["cells"].append(_first_line("".join(self._cell)))
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            if len(self._row["cells"]) >= 7:
+                self.records.append(_record_from_row(self._row))
+            self._row = None
+        elif tag in _BLOCK_TAGS and self._cell is not None:
+            self._cell.append("\n")
+
+    def _finish_capture(self, entry):
+        if not entry["capture"] or self._row is None:
+            return
+        text = " ".join("".join(entry["text"]).split())
+        if entry["capture"] == "days":
+            self._row["days"] = text
+        elif entry["capture"] == "tags":
+            self._row["tags"].append(text.lower())
+        elif text:
+            self._row[entry["capture"]].append(text)
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+        for entry in self._stack:
+            if entry["capture"]:
+                entry["text"].append(data)
+
+def _first_line(text):
+    """Same as utils.get_clean_text, for text parsed from HTML"""
+    for line in text.split("\n"):
+        line = " ".join(line.split())
+        if line:
+            return line
+    return ""
+
+def _record_from_row(row):
+    cells = row["cells"]
+    highest_qty = 0
+    for qty_text in row["qtys"]:
+        try:
+            highest_qty = max(highest_qty, int(qty_text))
+        except ValueError:
+            continue
+    return {
+        "Job Number": cells[0],
+        "Customer": cells[1],
+        "Description": cells[2],
+        "Job Status": cells[3],
+        "Order #": cells[4],
+        "Date In": cells[5],
+        "Ship Date": cells[6],
+        "Days Text": row["days"],
+        "Process Codes": row["codes"],
+        "Highest Qty": highest_qty,
+        "Tags": row["tags"],
+    }
+
+def _html_from_response(body):
+    """Get the HTML out of a list response (plain HTML, JSON-wrapped HTML or an ASP.NET delta)"""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+
+    # JSON responses carry the rendered rows in one of their string fields
+    html_parts = []
+    def collect(value):
+        if isinstance(value, str) and "<tr" in value:
+            html_parts.append(value)
+        elif isinstance(value, dict):
+            for item in value.values():
+                collect(item)
+        elif isinstance(value, list):
+            for item in value:
+                collect(item)
+    collect(data)
+    return "".join(html_parts)
+
+def parse_list_response(body):
+    """Parse a list response body into (records, page_numbers)"""
+    parser = JobRowParser()
+    parser.feed(_html_from_response(body))
+    parser.close()
+    return parser.records, parser.page_numbers
+
+def _replace_page_param(pairs, page_number):
+    """Swap the page number into (name, value) pairs; returns None if there is none"""
+    replaced = False
+    new_pairs = []
+    for name, value in pairs:
+        if "page" in name.lower() and value == "2":
+            value = str(page_number)
+            replaced = True
+        elif re.fullmatch(r"(?i)page\$2", value):
+            value = f"Page${page_number}"
+            replaced = True
+        new_pairs.append((name, value))
+    return new_pairs if replaced else None
+
+class JobListClient:
+    """Replays the job list's paging request over a pooled HTTP session"""
+
+    def __init__(self, cookies, url, method="GET", headers=None, post_data=None):
+        self.url = url
+        self.method = method
+        self.post_data = post_data
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(headers or {})
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie["name"], cookie["value"],
+                domain=cookie.get("domain"), path=cookie.get("path", "/")
+            )
+
+    @classmethod
+    def from_page(cls, page):
+        """
+        Capture the list's paging request by moving the browser to page 2.
+        Returns (client, page 2 records), or (None, None) if the list does not
+        page through a request we can replay.
+        """
+        if not HAS_REQUESTS:
+            print("requests is not installed - staying in the browser")
+            return None, None
+
+        next_page = page.query_selector("ul.pagination li[data-lp='2'] a.page-link")
+        if not next_page:
+            return None, None
+
+        try:
+            with page.expect_response(is_list_response, timeout=15000) as response_info:
+                next_page.click()
+            response = response_info.value
+        except Exception as e:
+            print(f"Could not capture the job list request: {str(e)}")
+            return None, None
+
+        request = response.request
+        headers = {
+            name: value for name, value in request.headers.items()
+            if name.lower() not in _SKIPPED_HEADERS and not name.startswith(":")
+        }
+        client = cls(page.context.cookies(), request.url, request.method, headers, request.post_data)
+        if client._build_request(3) is None:
+            print("Job list request has no page parameter we can change")
+            client.close()
+            return None, None
+
+        records, _ = parse_list_response(response.text())
+        print(f"Captured job list request: {request.method} {request.url}")
+        return client, records
+
+    def _build_request(self, page_number):
+        """Get (url, body) for a page, or None if the page number cannot be set"""
+        parts = urlsplit(self.url)
+        query = _replace_page_param(parse_qsl(parts.query, keep_blank_values=True), page_number)
+        url = urlunsplit(parts._replace(query=urlencode(query))) if query is not None else self.url
+
+        body = self.post_data
+        body_replaced = False
+        if body:
+            try:
+                data = json.loads(body)
+                pairs = _replace_page_param([(k, str(v)) for k, v in data.items()], page_number)
+                if pairs is not None:
+                    data.update({k: int(v) if isinstance(data[k], int) else v for k, v in pairs})
+                    body = json.dumps(data)
+                    body_replaced = True
+            except (ValueError, AttributeError):
+                pairs = _replace_page_param(parse_qsl(body, keep_blank_values=True), page_number)
+                if pairs is not None:
+                    body = urlencode(pairs)
+                    body_replaced = True
+
+        if query is None and not body_replaced:
+            return None
+        return url, body
+
+    def fetch_page(self, page_number):
+        """Fetch and parse one list page; returns (records, page_numbers)"""
+        built = self._build_request(page_number)
+        if built is None:
+            raise ValueError("Job list request has no page parameter")
+        url, body = built
+        response = self.session.request(self.method, url, data=body, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return parse_list_response(response.text)
+
+    def fetch_pages(self, page_numbers, max_workers=PREFETCH_WORKERS):
+        """Fetch several pages at the same time; results come back in page order"""
+        page_numbers = list(page_numbers)
+        if not page_numbers:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(page_numbers))) as executor:
+            return list(executor.map(self.fetch_page, page_numbers))
+
+    def close(self):
+        self.session.close()
+
+def prefetch_list_pages(page, max_page):
+    """
+    Read pages 2..max_page of the job list at once: page 2 comes from the
+    browser click that captures the request, the rest are fetched in parallel.
+    Returns the records of each page in order, or None if the request cannot
+    be replayed.
+    """
+    client, records = JobListClient.from_page(page)
+    if not client:
+        return None
+
+    try:
+        pages = [records]
+        fetched = 2
+        last_page = min(get_page_count(page), max_page)
+        # The pagination may only show a window of pages - keep going while pages reveal more
+        while fetched < last_page:
+            page_numbers = list(range(fetched + 1, last_page + 1))
+            print(f"Prefetching pages {page_numbers[0]}-{page_numbers[-1]} in parallel")
+            for page_records, known_pages in client.fetch_pages(page_numbers):
+                pages.append(page_records)
+                if known_pages:
+                    last_page = min(max(last_page, max(known_pages)), max_page)
+            fetched = page_numbers[-1]
+        return pages
+    finally:
+        client.close()
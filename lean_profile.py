@@ -0,0 +1,79 @@
+"""
+Lean browsing for the scraping paths.
+
+We only read DOM text and attributes, so images, fonts, media and analytics
+requests are wasted bandwidth while scraping. LeanProfile aborts them through
+page.route and keeps a count of what it blocked. It is attached per call site:
+the list settings popup and the filter clicks run without it, the list paging
+and job page visits run with it.
+"""
+from collections import Counter
+from urllib.parse import urlsplit
+
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# Third-party hosts that never matter for scraping
+BLOCKED_THIRD_PARTY = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "hotjar.com",
+    "facebook.net", "facebook.com", "clarity.ms", "newrelic.com", "nr-data.net",
+]
+
+# Typical transfer sizes, used to estimate what a blocked request would have cost
+ESTIMATED_BYTES = {"image": 40000, "font": 60000, "media": 500000, "script": 80000, "other": 20000}
+
+# Job pages are read for input values and data-* attributes. Set this to
+# False once job pages are confirmed to be fully server-rendered.
+JOB_PAGE_JAVASCRIPT = True
+
+def job_page_context_options():
+    """Context options for browsers that only visit job pages"""
+    return {"java_script_enabled": JOB_PAGE_JAVASCRIPT}
+
+class LeanProfile:
+    """Route handler that aborts heavy requests on the pages it is attached to"""
+
+    def __init__(self, block_types=BLOCKED_RESOURCE_TYPES, blocked_hosts=BLOCKED_THIRD_PARTY):
+        self.block_types = set(block_types)
+        self.blocked_hosts = list(blocked_hosts)
+        self.blocked = Counter()
+        self.estimated_bytes_saved = 0
+        self._targets = []
+
+    def _should_block(self, request):
+        if request.resource_type in self.block_types:
+            return True
+        host = urlsplit(request.url).hostname or ""
+        return any(host == blocked or host.endswith("." + blocked) for blocked in self.blocked_hosts)
+
+    def _count(self, request):
+        resource_type = request.resource_type
+        self.blocked[resource_type] += 1
+        self.estimated_bytes_saved += ESTIMATED_BYTES.get(resource_type, ESTIMATED_BYTES["other"])
+
+    def _handle_route(self, route):
+        if self._should_block(route.request):
+            self._count(route.request)
+            route.abort()
+        else:
+            route.continue_()
+
+    def attach(self, target):
+        """Start blocking on a page or context"""
+        if target not in self._targets:
+            target.route("**/*", self._handle_route)
+            self._targets.append(target)
+
+    def detach(self, target):
+        """Stop blocking, e.g. before clicking through UI that needs the full page"""
+        if target in self._targets:
+            target.unroute("**/*", self._handle_route)
+            self._targets.remove(target)
+
+    def report(self):
+        """Print what this run did not download"""
+        total = sum(self.blocked.values())
+        if not total:
+            return
+        details = ", ".join(f"{count} {resource_type}" for resource_type, count in self.blocked.most_common())
+        print(f"🪶 Lean mode blocked {total} requests ({details}), "
+              f"about {self.estimated_bytes_saved / 1024 / 1024:.1f} MB saved")
@@ -0,0 +1,246 @@
+"""
+Letter code rules for the daily report, as tables instead of if/elif chains.
+
+A job's letter code comes from its process codes (AP, EM, DS, HW, PA). HW
+jobs get a pending code ("HW", "HW/EMB", ...) until their garments have been
+checked. The garment material (EMB, ETCH, SUB flags) then turns the pending
+code into the final one ("HW/EMB" + ETCH -> "EMB/ETCH").
+
+The rules below are compiled once into lookup tables indexed by bit masks:
+one for the process codes a job has and one for its material flags. One job
+is then a table lookup.
+
+The material flags come from garment texts. The keywords for each material
+are read from garment_keywords.json (a copy in ~/.decopress wins over the one
+next to the scripts) and compiled into one regex that finds every material a
+text mentions in a single scan. tests/test_letter_codes.py has the expected
+code for each combination of rules.
+
+    python letter_codes.py    # times the lookups and benchmarks the garment matcher
+"""
+import os
+import re
+import json
+import time
+import random
+
+# Process codes the rules look at, one bit each
+PROCESS_CODES = ("AP", "EM", "DS", "HW", "PA")
+# Garment material flags, one bit each
+MATERIAL_FLAGS = ("EMB", "ETCH", "SUB")
+
+# (process codes the job must have, letter code, letter code when the job also has HW).
+# The first matching rule wins; HW codes are pending until the garment check.
+LETTER_CODE_RULES = [
+    ({"AP", "EM"}, "SUB/EMB", "HW/EMB"),
+    ({"AP"}, "SUB", "HW/SUB"),
+    ({"EM"}, "EMB", "HW/EMB"),
+    ({"DS"}, "ETCH", "HW/ETCH"),
+    (set(), "", "HW"),
+]
+
+# (material flags the garments must have, material code). The first matching rule
+# wins; SUB is also the default when no material keyword was found.
+MATERIAL_RULES = [
+    ({"EMB", "ETCH"}, "EMB/ETCH"),
+    ({"EMB"}, "EMB"),
+    ({"ETCH"}, "ETCH"),
+    (set(), "SUB"),
+]
+
+# Pending HW code -> (final code when the material has ETCH, final code otherwise).
+# Pending codes not listed here take the material code as it is.
+HW_MERGE_RULES = {
+    "HW/EMB": ("EMB/ETCH", "EMB"),
+    "HW/SUB": ("SUB/ETCH", "SUB"),
+    "HW/ETCH": ("ETCH", "ETCH"),
+}
+
+PATCH_APPLY_CODE = "PA"
+
+KEYWORDS_FILE = "garment_keywords.json"
+
+# Used when garment_keywords.json is missing or unreadable
+DEFAULT_MATERIAL_KEYWORDS = {
+    "EMB": ["EMB", "EMBROIDERY", "EMBROIDERED"],
+    "ETCH": ["FAUX", "LEATHER", "LEATHERETTE", "SUEDE", "DENIM"],
+    "SUB": ["SIMWOVEN", "WOVEN", "DECO TWILL", "DECOTWILL", "TWILL"],
+}
+
+_CODE_BITS = {code: 1 << index for index, code in enumerate(PROCESS_CODES)}
+_FLAG_BITS = {flag: 1 << index for index, flag in enumerate(MATERIAL_FLAGS)}
+
+def _codes_in(mask, names):
+    return {name for index, name in enumerate(names) if mask & (1 << index)}
+
+def _base_code(codes):
+    for required, code, code_with_hw in LETTER_CODE_RULES:
+        if required <= codes:
+            return code_with_hw if "HW" in codes else code
+    return ""
+
+def _material_code(flags):
+    for required, code in MATERIAL_RULES:
+        if required <= flags:
+            return code
+    return "SUB"
+
+def merge_hw_code(pending_code, material_code):
+    """Final letter code of an HW job once its garment material is known"""
+    if pending_code in HW_MERGE_RULES:
+        with_etch, without_etch = HW_MERGE_RULES[pending_code]
+        return with_etch if "ETCH" in material_code else without_etch
+    return material_code
+
+def _compile():
+    """Build the lookup tables from the rules"""
+    code_masks = range(1 << len(PROCESS_CODES))
+    flag_masks = range(1 << len(MATERIAL_FLAGS))
+    base = [_base_code(_codes_in(mask, PROCESS_CODES)) for mask in code_masks]
+    material = [_material_code(_codes_in(mask, MATERIAL_FLAGS)) for mask in flag_masks]
+    patch_apply = [bool(mask & _CODE_BITS[PATCH_APPLY_CODE]) for mask in code_masks]
+    return base, material, patch_apply
+
+_BASE_TABLE, _MATERIAL_TABLE, _PATCH_APPLY_TABLE = _compile()
+
+def code_mask(process_codes):
+    """Bit mask of the known process codes in a list like ["HW", "em"]"""
+    mask = 0
+    for code in process_codes:
+        mask |= _CODE_BITS.get(code.upper(), 0)
+    return mask
+
+def letter_code(process_codes):
+    """Letter code for a job's process codes (pending for HW jobs)"""
+    return _BASE_TABLE[code_mask(process_codes)]
+
+def has_patch_apply(process_codes):
+    return bool(_PATCH_APPLY_TABLE[code_mask(process_codes)])
+
+def material_code(flags):
+    """Material code from garment flags like {"EMB": True, "ETCH": False, "SUB": False}"""
+    mask = 0
+    for flag, bit in _FLAG_BITS.items():
+        if flags.get(flag):
+            mask |= bit
+    return _MATERIAL_TABLE[mask]
+
+def get_keywords_paths():
+    """Keyword files in the order they are tried: the user's copy, then the shipped one"""
+    user_path = os.path.join(os.path.expanduser("~"), ".decopress", KEYWORDS_FILE)
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return [user_path, os.path.join(script_dir, KEYWORDS_FILE)]
+
+def load_material_keywords():
+    """Material -> keywords, from the first keyword file that can be read"""
+    for path in get_keywords_paths():
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                keywords = json.load(f)
+            return {material.upper(): [keyword.upper() for keyword in words]
+                    for material, words in keywords.items()}
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"Error reading garment keywords from {path}: {str(e)}")
+    return DEFAULT_MATERIAL_KEYWORDS
+
+class MaterialMatcher:
+    """
+    Finds every material a garment text mentions in one regex scan. Keywords
+    match anywhere in the text, case-insensitively, like `keyword in text`.
+    """
+
+    def __init__(self, keywords):
+        self.materials = tuple(keywords)
+        materials_of = {}
+        for material, words in keywords.items():
+            for word in words:
+                if word:
+                    materials_of.setdefault(word.upper(), set()).add(material)
+        # The scan reports the longest keyword at each position, so a keyword also
+        # stands for the keywords inside it ("EMBROIDERY" -> "EMB")
+        self._materials_of = {
+            word: frozenset().union(*(found for inner, found in materials_of.items() if inner in word))
+            for word in materials_of
+        }
+        # Where, inside a keyword, another keyword could start and run past its end
+        # ("SUEDEMB": EMB starts in SUEDE); the scan below does not see those
+        self._overlaps = {}
+        for word in materials_of:
+            offsets = [offset for offset in range(1, len(word))
+                       if any(other.startswith(word[offset:]) and len(other) > len(word) - offset
+                              for other in materials_of)]
+            if offsets:
+                self._overlaps[word] = offsets
+        self._pattern = None
+        if materials_of:
+            self._pattern = re.compile("|".join(re.escape(word) for word in sorted(materials_of, key=len, reverse=True)))
+
+    def match(self, text):
+        """Set of materials the text mentions"""
+        found = set()
+        if self._pattern is None or not text:
+            return found
+        text = text.upper()
+        for match in self._pattern.finditer(text):
+            word = match.group()
+            found |= self._materials_of[word]
+            for offset in self._overlaps.get(word, ()):
+                overlapping = self._pattern.match(text, match.start() + offset)
+                if overlapping:
+                    found |= self._materials_of[overlapping.group()]
+        return found
+
+    def flags(self, texts):
+        """{"EMB": bool, ...} for everything the texts mention together"""
+        found = set()
+        for text in texts:
+            found |= self.match(text)
+        return {material: material in found for material in self.materials}
+
+_matcher = None
+
+def get_material_matcher():
+    """The matcher for the configured keywords, compiled on first use"""
+    global _matcher
+    if _matcher is None:
+        _matcher = MaterialMatcher(load_material_keywords())
+    return _matcher
+
+if __name__ == "__main__":
+    rng = random.Random(1)
+    count = 200000
+    choices = PROCESS_CODES + ("SP", "em", "hw")
+    process_codes = [rng.choices(choices, k=rng.randrange(4)) for _ in range(count)]
+
+    started = time.perf_counter()
+    [letter_code(job_codes) for job_codes in process_codes]
+    elapsed = time.perf_counter() - started
+    print(f"⏱ letter_code: {count} jobs in {elapsed * 1000:.0f} ms")
+
+    # Synthetic garment corpus: catalogue-style names, about one word in ten a material keyword
+    keywords = load_material_keywords()
+    matcher = MaterialMatcher(keywords)
+    words = ["NIKE", "CAP", "SNAPBACK", "TRUCKER", "HAT", "BLACK", "NAVY", "HEATHER", "OSFA", "RICHARDSON",
+             "112", "MESH", "BEANIE", "CUFFED", "POLO", "QUARTER", "ZIP", "FLEXFIT"]
+    words = words * 6 + [keyword for words_of in keywords.values() for keyword in words_of]
+    corpus = [" ".join(rng.choices(words, k=rng.randrange(4, 10))) for _ in range(count)]
+
+    def scan_each_list(text):
+        text = text.upper()
+        return {material for material, words_of in keywords.items() if any(keyword in text for keyword in words_of)}
+
+    started = time.perf_counter()
+    expected = [scan_each_list(text) for text in corpus]
+    elapsed = time.perf_counter() - started
+    print(f"⏱ keyword lists one by one: {count} garments in {elapsed * 1000:.0f} ms")
+
+    started = time.perf_counter()
+    found = [matcher.match(text) for text in corpus]
+    elapsed = time.perf_counter() - started
+    print(f"⏱ MaterialMatcher: {count} garments in {elapsed * 1000:.0f} ms")
+    assert found == expected
+    # Keywords run together without spaces, so matches overlap
+    packed = ["".join(rng.choices(words, k=3)) for _ in range(20000)]
+    assert [matcher.match(text) for text in packed] == [scan_each_list(text) for text in packed]
@@ -4,6 +4,8 @@ from playwright.sync_api import sync_playwright
 import pandas as pd
 from datetime import datetime
 import os
+from session_store import new_session_context, ensure_logged_in
+from waits import wait_for_rows, click_and_wait_for_list
 
 def get_login_info():
     root = tk.Tk()
@@ -40,8 +42,8 @@ def scrape_orders(page):
     
     while current_page <= max_pages:
         print(f"Processing page {current_page}")
-        # Wait for any loading indicators to disappear
-        page.wait_for_load_state('networkidle')
+        # Wait for the rows of this page
+        wait_for_rows(page)
         
         rows = page.query_selector_all("table.data-results tbody tr")
         print(f"Found {len(rows)} rows on current page")
@@ -96,8 +98,7 @@ def scrape_orders(page):
                 next_page = page.query_selector(f"ul.pagination li[data-lp='{current_page + 1}'] a.page-link")
                 if next_page:
                     print(f"Clicking page {current_page + 1}")
-                    next_page.click()
-                    page.wait_for_timeout(2000)  # Wait for page load
+                    click_and_wait_for_list(page, next_page, f"page {current_page + 1}", expected_page=current_page + 1)
                     current_page += 1
                 else:
                     print("Next page link not found")
@@ -115,26 +116,18 @@ def scrape_orders(page):
 def run():
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=False)
-        context = browser.new_context()
+        context = new_session_context(browser)
         page = context.new_page()
 
-        # Login
-        page.goto(LOGIN_URL)
-        page.wait_for_load_state('networkidle')  # Wait for page to fully load
+        # Go to Job Status List, logging in only if the saved session is not valid
         try:
-            username, password = get_login_info()
-            page.wait_for_selector("#txt_Username", timeout=60000)
-            page.fill("#txt_Username", username)
-            page.fill("#txt_Password", password)
-            page.click("#btn_Login")
-            page.wait_for_selector("#jobStatusListResults", timeout=10000)
+            if not ensure_logged_in(page, DASHBOARD_URL, login_info=get_login_info):
+                browser.close()
+                return
         except Exception as e:
             print(f"Login failed: {str(e)}")
             browser.close()
             return
-
-        # Go to Job Status List
-        page.goto(DASHBOARD_URL)
         page.wait_for_selector("table.data-results")
 
         # Scrape
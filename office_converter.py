@@ -0,0 +1,242 @@
+"""
+Persistent headless LibreOffice for XLSX -> PDF conversion where Excel is not
+available (HAS_WIN32COM is False).
+
+One soffice process is started with a UNO socket listener and a private
+profile under ~/.decopress, and every conversion goes through it, so there is
+no office start-up per file. Conversions are queued and done one at a time on
+a worker thread. A conversion that runs longer than CONVERT_TIMEOUT kills the
+process, and the next conversion starts a fresh one.
+
+The UNO bridge (the "uno" module that ships with LibreOffice, e.g. the
+python3-uno package) is optional. Without it the same queue runs
+"soffice --convert-to pdf" per file, which still works but pays the start-up
+cost every time.
+"""
+import os
+import time
+import queue
+import shutil
+import threading
+import subprocess
+from concurrent.futures import Future
+
+# The UNO bridge is optional - without it every file starts its own soffice
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    HAS_UNO = True
+except ImportError:
+    HAS_UNO = False
+
+OFFICE_PORT = 2002
+OFFICE_STARTUP_TIMEOUT = 30  # seconds
+CONVERT_TIMEOUT = 60  # seconds
+
+_OFFICE_PATHS = [
+    "/usr/bin/soffice",
+    "/usr/lib/libreoffice/program/soffice",
+    "/opt/libreoffice/program/soffice",
+    "/Applications/LibreOffice.app/Contents/MacOS/soffice",
+    r"C:\Program Files\LibreOffice\program\soffice.exe",
+]
+
+_STOP = object()
+
+def _get_profile_url():
+    """File URL of the converter's own LibreOffice profile"""
+    profile_dir = os.path.join(os.path.expanduser("~"), ".decopress", "office_profile")
+    os.makedirs(profile_dir, exist_ok=True)
+    return "file:///" + profile_dir.replace("\\", "/").lstrip("/")
+
+def find_office_executable():
+    """Find soffice on the PATH or in the usual install locations"""
+    for name in ("soffice", "libreoffice"):
+        path = shutil.which(name)
+        if path:
+            return path
+    for path in _OFFICE_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+def _property(name, value):
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+class OfficeConverter:
+    """Queue of XLSX -> PDF conversions served by one headless LibreOffice"""
+
+    def __init__(self, executable=None, port=OFFICE_PORT, timeout=CONVERT_TIMEOUT):
+        self.executable = executable or find_office_executable()
+        self.port = port
+        self.timeout = timeout
+        self.process = None
+        self._desktop = None
+        self._tasks = queue.Queue()
+        self._worker = None
+
+    def is_running(self):
+        return self._worker is not None and self._worker.is_alive()
+
+    def start(self):
+        """Start the worker thread, which starts LibreOffice"""
+        if not self.executable:
+            raise RuntimeError("LibreOffice (soffice) was not found")
+        if not self.is_running():
+            self._worker = threading.Thread(target=self._work, daemon=True)
+            self._worker.start()
+            print(f"✅ Office converter ready ({'persistent UNO' if HAS_UNO else 'per-file'} mode)")
+        return self
+
+    def submit(self, xlsx_path, pdf_path=None):
+        """Queue a conversion; the Future resolves to the PDF path"""
+        future = Future()
+        pdf_path = pdf_path or os.path.splitext(xlsx_path)[0] + ".pdf"
+        self._tasks.put((future, os.path.abspath(xlsx_path), os.path.abspath(pdf_path)))
+        return future
+
+    def convert(self, xlsx_path, pdf_path=None):
+        """Convert one file and wait for it"""
+        return self.submit(xlsx_path, pdf_path).result()
+
+    def stop(self):
+        """Finish queued conversions and shut the office process down"""
+        if self.is_running():
+            self._tasks.put(_STOP)
+            self._worker.join(timeout=10)
+        self._worker = None
+        self._kill_office()
+
+    def _work(self):
+        if HAS_UNO:
+            # Have LibreOffice up before the first report is written
+            try:
+                self._start_office()
+            except Exception as e:
+                print(f"Could not start LibreOffice yet: {str(e)}")
+        while True:
+            task = self._tasks.get()
+            if task is _STOP:
+                break
+            future, xlsx_path, pdf_path = task
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            # A hung conversion is ended by killing the office process
+            timed_out = threading.Event()
+            def on_timeout():
+                timed_out.set()
+                print(f"⚠️ Office conversion of {os.path.basename(xlsx_path)} hung - restarting LibreOffice")
+                self._kill_office()
+            watchdog = threading.Timer(self.timeout, on_timeout)
+            watchdog.start()
+            try:
+                if HAS_UNO:
+                    self._convert_uno(xlsx_path, pdf_path)
+                else:
+                    self._convert_cli(xlsx_path, pdf_path)
+                future.set_result(pdf_path)
+            except Exception as e:
+                if timed_out.is_set():
+                    e = TimeoutError(f"conversion took longer than {self.timeout} s")
+                else:
+                    # The bridge may be broken - reconnect next time
+                    self._desktop = None
+                future.set_exception(e)
+            finally:
+                watchdog.cancel()
+
+    def _start_office(self):
+        """Start soffice with a UNO listener and connect to it"""
+        self._kill_office()
+        args = [
+            self.executable, "--headless", "--invisible", "--nologo", "--norestore", "--nodefault",
+            f"-env:UserInstallation={_get_profile_url()}",
+            f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext",
+        ]
+        print(f"Starting LibreOffice: {self.executable}")
+        self.process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.time() + OFFICE_STARTUP_TIMEOUT
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError("LibreOffice exited during startup")
+            try:
+                context = resolver.resolve(
+                    f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+                )
+                self._desktop = context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+                return
+            except Exception:
+                time.sleep(0.3)
+        self._kill_office()
+        raise RuntimeError("LibreOffice did not start in time")
+
+    def _convert_uno(self, xlsx_path, pdf_path):
+        if self._desktop is None or self.process is None or self.process.poll() is not None:
+            self._start_office()
+        document = self._desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(xlsx_path), "_blank", 0, (_property("Hidden", True),)
+        )
+        try:
+            document.storeToURL(uno.systemPathToFileUrl(pdf_path), (_property("FilterName", "calc_pdf_Export"),))
+        finally:
+            document.close(True)
+
+    def _convert_cli(self, xlsx_path, pdf_path):
+        outdir = os.path.dirname(pdf_path)
+        self.process = subprocess.Popen(
+            [self.executable, "--headless", "--norestore", f"-env:UserInstallation={_get_profile_url()}",
+             "--convert-to", "pdf", "--outdir", outdir, xlsx_path],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            self.process.wait()
+        finally:
+            self.process = None
+        converted = os.path.join(outdir, os.path.splitext(os.path.basename(xlsx_path))[0] + ".pdf")
+        if not os.path.exists(converted):
+            raise RuntimeError("LibreOffice did not produce a PDF")
+        if converted != pdf_path:
+            os.replace(converted, pdf_path)
+
+    def _kill_office(self):
+        self._desktop = None
+        process = self.process
+        if process is None:
+            return
+        try:
+            process.terminate()
+            process.wait(timeout=5)
+        except Exception:
+            process.kill()
+        self.process = None
+
+_converter = None
+_converter_lock = threading.Lock()
+
+def start_converter():
+    """Start the shared converter (used by app.py when Excel is not available)"""
+    global _converter
+    with _converter_lock:
+        if _converter is None or not _converter.is_running():
+            _converter = OfficeConverter().start()
+        return _converter
+
+def get_running_converter():
+    """The shared converter if it has been started, else None"""
+    return _converter if _converter is not None and _converter.is_running() else None
+
+def stop_converter():
+    global _converter
+    with _converter_lock:
+        if _converter is not None:
+            _converter.stop()
+            _converter = None
@@ -1,19 +1,34 @@
 import tkinter as tk
 from tkinter import simpledialog
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 import pandas as pd
 from datetime import datetime
 import os
 import re
 import time
-import shutil
 import sys
 import tempfile
-from openpyxl import load_workbook
 from utils import (
-    get_login_info, get_clean_text, get_download_path, get_job_number,
-    get_current_date_formatted, LOGIN_URL, DASHBOARD_URL, JOB_URL_TEMPLATE,
-    get_shipment_details
+    get_download_path, get_job_number,
+    get_current_date_formatted, DASHBOARD_URL, JOB_URL_TEMPLATE,
+    get_shipment_details, get_job_numbers, get_login_info
+)
+from session_store import ensure_logged_in, is_login_page
+from browser_host import open_browser_session
+from page_pool import PagePool, DEFAULT_POOL_SIZE, login_with_saved_credentials
+from job_list import extract_job_rows, get_page_count
+from job_list_client import prefetch_list_pages
+from lean_profile import LeanProfile
+from template_cache import open_template, get_manifest, PACKING_SLIP_TEMPLATE
+from openpyxl.utils.cell import coordinate_to_tuple, get_column_letter
+from pdf_slip import render_packing_slips
+import office_converter
+import job_index
+from task_runner import run_on_ui_thread, report_progress, check_cancelled, is_cancelled
+from tracer import span, traced, trace_run
+from waits import (
+    wait_for_rows, click_and_wait_for_list, goto_and_wait, wait_for_element, back_to_first_page,
+    reset_wait_log, print_wait_summary
 )
 
 # Try to import win32com for PDF conversion (Windows only)
@@ -23,6 +38,10 @@ try:
 except ImportError:
     HAS_WIN32COM = False
 
+# Elements that show the job page has rendered its details
+JOB_PAGE_READY_SELECTOR = "input#orderNumber, ul.shipment-info, table.job-joblines-list"
+
+@traced()
 def ensure_browser_installed():
     """Ensure we can use a browser in bundled app"""
     if getattr(sys, 'frozen', False):
@@ -60,49 +79,95 @@ def ensure_browser_installed():
         print("Running in development mode, using normal Playwright setup")
         return None
 
-def find_job_in_job_list(page, job_number):
+def _job_info_from_records(records, job_number):
+    """Get the job info for job_number from job list records, or None"""
+    for record in records:
+        if record["Job Number"] == job_number:
+            return {
+                "Job Number": job_number,
+                "Customer": record["Customer"],
+                "Description": record["Description"],
+                "Job Status": record["Job Status"],
+                "Order #": record["Order #"],
+                "Date In": record["Date In"],
+                "Ship Date": record["Ship Date"],
+            }
+    return None
+
+@traced()
+def find_job_in_job_list(page, job_number, use_index=True):
     """Find job information in job status list."""
     max_pages = 10  # Maximum number of pages to search
     current_page = 1
     
+    # The local index answers without paging through the list
+    if use_index:
+        indexed = job_index.lookup(job_number)
+        if indexed:
+            job_info, _, age_hours = indexed
+            print(f"Found job {job_number} in the local index")
+            if job_index.is_stale(age_hours):
+                print(f"Index entry is {age_hours:.0f} hours old - refreshing the index in the background")
+                job_index.refresh_in_background()
+            return job_info
+    
     print(f"Searching for job number {job_number}...")
     job_info = {}
+    try_prefetch = True
     
     while current_page <= max_pages:
         print(f"Searching on page {current_page}")
         # Wait for table to load
         page.wait_for_selector("table.data-results", state="visible", timeout=30000)
-        page.wait_for_load_state('networkidle')
+        wait_for_rows(page)
         
-        # Find all rows
-        rows = page.query_selector_all("table.data-results tbody tr")
+        # Read all rows on this page in one round trip
+        records = extract_job_rows(page)
+        job_index.record_rows(records, current_page)
         
         # Search for job number in each row
-        for row in rows:
+        job_info = _job_info_from_records(records, job_number)
+        if job_info:
+            print(f"Found job {job_number} on page {current_page}")
+            return job_info
+        
+        # After page 1, read all the remaining pages at once when the list request can be replayed
+        if current_page == 1 and try_prefetch:
+            try_prefetch = False
+            if get_page_count(page) == 1:
+                break
             try:
-                row_job_number = get_clean_text(row.query_selector("td:nth-child(1)"))
-                if row_job_number == job_number:
-                    print(f"Found job {job_number} on page {current_page}")
-                    job_info = {
-                        "Job Number": job_number,
-                        "Customer": get_clean_text(row.query_selector("td:nth-child(2)")),
-                        "Description": get_clean_text(row.query_selector("td:nth-child(3)")),
-                        "Job Status": get_clean_text(row.query_selector("td:nth-child(4)")),
-                        "Order #": get_clean_text(row.query_selector("td:nth-child(5)")),
-                        "Date In": get_clean_text(row.query_selector("td:nth-child(6)")),
-                        "Ship Date": get_clean_text(row.query_selector("td:nth-child(7)")),
-                    }
-                    return job_info
+                other_pages = prefetch_list_pages(page, max_pages)
             except Exception as e:
-                print(f"Error processing row: {str(e)}")
+                print(f"Parallel page fetch failed: {str(e)}")
+                other_pages = None
+            if other_pages is not None:
+                for page_number, page_records in enumerate(other_pages, start=2):
+                    job_index.record_rows(page_records, page_number)
+                for page_number, page_records in enumerate(other_pages, start=2):
+                    job_info = _job_info_from_records(page_records, job_number)
+                    if job_info:
+                        print(f"Found job {job_number} on page {page_number}")
+                        return job_info
+                if all(other_pages):
+                    current_page = 1 + len(other_pages)
+                    break
+                # A page came back without rows - it may just not have parsed, so page through the list
+                print("Some prefetched pages had no rows - searching the list in the browser")
+                back_to_first_page(page)
+                continue
+            # The capture click may already have moved the list to page 2
+            active = page.query_selector("ul.pagination li.active[data-lp='2']")
+            if active:
+                current_page = 2
                 continue
         
         # Check if there's a next page
         next_page = page.query_selector(f"ul.pagination li[data-lp='{current_page + 1}'] a.page-link")
         if next_page:
             print(f"Moving to page {current_page + 1}")
-            next_page.click()
-            page.wait_for_timeout(2000)  # Wait for page load
+            # Wait for the rows of the next page
+            click_and_wait_for_list(page, next_page, f"page {current_page + 1}", expected_page=current_page + 1)
             current_page += 1
         else:
             print("No more pages to search")
@@ -111,14 +176,84 @@ def find_job_in_job_list(page, job_number):
     print(f"Job {job_number} not found after searching {current_page} pages")
     return None
 
+@traced()
 def get_job_details(page, job_number):
     """Get detailed job information from the Job page."""
     job_url = JOB_URL_TEMPLATE.format(job_number)
     print(f"Navigating to job page: {job_url}")
     
-    page.goto(job_url)
-    page.wait_for_load_state('networkidle')
+    # Wait for the job form rather than for the network to go idle
+    goto_and_wait(page, job_url, JOB_PAGE_READY_SELECTOR, f"job page {job_number}")
+    return read_job_details(page, job_number)
+
+@traced()
+def open_job_page(page, job_number, login_info=get_login_info):
+    """
+    Go straight to a job's page, logging in first if the session is not valid.
+    Returns False if the login was cancelled and raises LookupError if the
+    job does not exist. A page that is slow or comes up without its order
+    fields raises TimeoutError - search the job list for those instead.
+    """
+    job_url = JOB_URL_TEMPLATE.format(job_number)
+    print(f"Navigating to job page: {job_url}")
+    with span(f"goto job page {job_number}", cat="navigation"):
+        response = page.goto(job_url, wait_until="domcontentloaded")
+    
+    if is_login_page(page):
+        if not ensure_logged_in(page, job_url, login_info=login_info):
+            return False
+        response = None
+    
+    if response is not None and response.status >= 400:
+        raise LookupError(f"job page returned HTTP {response.status}")
+    # Unknown IDs get redirected to an error page or back to the list
+    if "job.aspx" not in page.url.lower():
+        raise LookupError(f"redirected to {page.url}")
+    if not wait_for_element(page, JOB_PAGE_READY_SELECTOR, f"job page {job_number}", state="attached", timeout=10000):
+        raise TimeoutError("job page did not show its job details in time")
     
+    order_number = page.query_selector("input#orderNumber")
+    customer = page.query_selector("input#customer")
+    if not any(elem and elem.get_attribute("value") for elem in (order_number, customer)):
+        raise TimeoutError("job page has no order number or customer")
+    return True
+
+def fetch_from_job_list(page, job_number, login_info=get_login_info):
+    """
+    Find a job in the job list and read its job page. Returns (job_info,
+    shipping_info), None if the login was cancelled, and raises LookupError
+    if the job is not in the list.
+    """
+    if not ensure_logged_in(page, DASHBOARD_URL, login_info=login_info):
+        return None
+    page.wait_for_selector("table.data-results")
+    
+    # Search for job in the job list
+    job_info = find_job_in_job_list(page, job_number)
+    if not job_info:
+        raise LookupError("not in the job list")
+    
+    # Get detailed job information
+    return job_info, get_job_details(page, job_number)
+
+def job_info_from_job_page(shipping_info, job_number):
+    """Build the job list fields from what get_job_details read off the job page"""
+    job_info = {
+        "Job Number": job_number,
+        "Customer": shipping_info.get("Customer", ""),
+        "Description": shipping_info.get("Description", ""),
+        "Order #": shipping_info.get("Order #", ""),
+    }
+    # Status and dates are only shown in the list - take them from the index when we have them
+    indexed = job_index.lookup(job_number)
+    if indexed:
+        for key, value in indexed[0].items():
+            job_info.setdefault(key, value)
+    return job_info
+
+@traced()
+def read_job_details(page, job_number):
+    """Read the shipping information from an open job page."""
     # Extract shipping information
     shipping_info = {}
     try:
@@ -223,178 +358,227 @@ def get_job_details(page, job_number):
     
     return shipping_info
 
-def set_cell_value_safely(sheet, cell_reference, value):
+def set_cell_value_safely(draft, cell_reference, value):
     """
-    Safely set a cell value, handling merged cells.
+    Safely set a cell value on a template draft, handling merged cells.
     For merged cells, it finds the top-left (primary) cell of the merged range and sets that instead.
     """
-    cell = sheet[cell_reference]
-    
-    # Check if this is a merged cell
-    for merged_range in sheet.merged_cells.ranges:
-        if cell.coordinate in merged_range:
-            # Get the top-left cell of the merged range (the primary cell)
-            primary_cell_coords = merged_range.coord.split(':')[0]
-            print(f"Cell {cell_reference} is part of merged range {merged_range.coord}, using {primary_cell_coords} instead")
-            sheet[primary_cell_coords] = value
-            return
-    
-    # Not a merged cell, set value directly
-    cell.value = value
+    # The template manifest knows the top-left (primary) cell of every merged range
+    primary_cell_coords = draft.manifest.resolve(cell_reference)
+    if primary_cell_coords != cell_reference:
+        print(f"Cell {cell_reference} is part of a merged range, using {primary_cell_coords} instead")
+    draft.set_value(primary_cell_coords, value)
 
-def create_packing_slip(job_info, shipping_info, shipment_details):
-    """Create a packing slip Excel file using the template."""
-    # Combine all information
-    data = {**job_info, **shipping_info, **shipment_details}
-    
-    # Get the template path
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    template_path = os.path.join(script_dir, "PackingSlipTemplate.xlsx")
-    
-    if not os.path.exists(template_path):
-        print(f"❌ Template file not found: {template_path}")
-        return None
-    
-    # Get the download path
-    download_path = get_download_path()
-    job_number = data.get("Job Number", "unknown")
-    
-    # Use job number as filename
-    excel_filename = f"{job_number}.xlsx"
-    pdf_filename = f"{job_number}.pdf"
-    
-    excel_filepath = os.path.join(download_path, excel_filename)
-    pdf_filepath = os.path.join(download_path, pdf_filename)
+@run_on_ui_thread
+def ask_quantities(expected_qty):
+    """Ask for the order quantity, ship quantity and number of boxes"""
+    root = tk.Tk()
+    root.withdraw()
     
-    # Copy the template to the new file
-    shutil.copy2(template_path, excel_filepath)
+    # Show the expected quantity in the dialog
+    order_qty_prompt = f"Enter the order quantity (expected: {expected_qty}):"
+    order_qty = simpledialog.askstring("Order Quantity", order_qty_prompt, parent=root)
     
-    # Open the template with openpyxl
-    workbook = load_workbook(excel_filepath)
-    sheet = workbook.active
+    ship_qty_prompt = f"Enter the ship quantity (expected: {expected_qty}):"
+    ship_qty = simpledialog.askstring("Ship Quantity", ship_qty_prompt, parent=root)
     
-    # Ask for ship date from user
+    # Get number of boxes
+    num_boxes = simpledialog.askstring("Number of Boxes", "Enter the number of boxes:", parent=root)
+    root.destroy()
+    return order_qty, ship_qty, num_boxes
+
+@run_on_ui_thread
+def ask_ship_date(prompt="Enter the ship date (MM/DD/YYYY):"):
+    """Ask for the ship date printed on the slips"""
     root = tk.Tk()
     root.withdraw()
-    ship_date = simpledialog.askstring("Ship Date", "Enter the ship date (MM/DD/YYYY):", parent=root)
+    ship_date = simpledialog.askstring("Ship Date", prompt, parent=root)
     root.destroy()
+    return ship_date
+
+# Slip fields nobody enters in batch mode, with the names the batch summary uses for them
+BATCH_QUANTITY_FIELDS = {"order_qty": "order qty", "ship_qty": "ship qty", "num_boxes": "# boxes"}
+
+def batch_blank_fields(data):
+    """Names of the quantity fields a batch slip leaves blank because they were not entered"""
+    return [name for field, name in BATCH_QUANTITY_FIELDS.items() if not data.get(field)]
+
+def packing_slip_cells(data, ship_date=None, interactive=True):
+    """
+    Work out what goes where on a packing slip: returns {cell: value} in
+    write order. Both the Excel file and the native PDF are made from this.
+    In batch mode (interactive=False) quantities that were not entered are
+    left blank (see batch_blank_fields).
+    """
+    cells = {}
+    # Where each field goes comes from the template manifest (template_cache.TEMPLATE_TARGETS)
+    targets = get_manifest(PACKING_SLIP_TEMPLATE).targets
     
-    # Fill in the data using the safe method that handles merged cells
-    # Date in G2 - NOT in A1
+    # Today's date at the top of the slip
     current_date = get_current_date_formatted("%m/%d/%Y")
-    set_cell_value_safely(sheet, "G2", current_date)
+    cells[targets["date"]] = current_date
     
-    # A13: Ship date (no text, just date)
+    # Ship date (no text, just date)
     if ship_date:
-        set_cell_value_safely(sheet, "A13", ship_date)  # Ship Date in A13
+        cells[targets["ship_date"]] = ship_date
     
-    # D13: ORDER# from input#orderNumber
-    set_cell_value_safely(sheet, "D13", data.get("Order #", ""))  # Order # in D13
+    # ORDER# from input#orderNumber
+    cells[targets["order_number"]] = data.get("Order #", "")
     
-    # B13: JOB# 
-    set_cell_value_safely(sheet, "B13", data.get("Job Number", ""))  # Job Number in B13
+    # JOB#
+    cells[targets["job_number"]] = data.get("Job Number", "")
     
-    # G13: Customer contact name (selected user)
-    set_cell_value_safely(sheet, "G13", data.get("Selected Contact", ""))  # Customer contact in G13
+    # Customer contact name (selected user)
+    cells[targets["contact"]] = data.get("Selected Contact", "")
     
-    # Ship To info - Put everything in E6
+    # Ship To info - everything goes in one cell
     full_shipment_info = data.get("Full Shipment Info", "")
     if full_shipment_info:
-        set_cell_value_safely(sheet, "E6", full_shipment_info)
+        cells[targets["ship_to"]] = full_shipment_info
     
     # Check for assets and add to the sheet
     assets = data.get("assets", [])
     if assets:
         # Get the order quantity from the first asset to show in the dialog
         expected_qty = assets[0].get("qty", "") if assets else ""
-        
-        # Ask for quantities with reference to the expected quantity
-        root = tk.Tk()
-        root.withdraw()
-        
-        # Show the expected quantity in the dialog
-        order_qty_prompt = f"Enter the order quantity (expected: {expected_qty}):"
-        order_qty = simpledialog.askstring("Order Quantity", order_qty_prompt, parent=root)
-        
-        ship_qty_prompt = f"Enter the ship quantity (expected: {expected_qty}):"
-        ship_qty = simpledialog.askstring("Ship Quantity", ship_qty_prompt, parent=root)
-        
-        # Get number of boxes
-        num_boxes = simpledialog.askstring("Number of Boxes", "Enter the number of boxes:", parent=root)
-        root.destroy()
-        
+
+        if interactive:
+            # Ask for quantities with reference to the expected quantity
+            order_qty, ship_qty, num_boxes = ask_quantities(expected_qty)
+        else:
+            # Batch mode: no guessed numbers - what was not entered stays blank to fill in by hand
+            order_qty = data.get("order_qty", "")
+            ship_qty = data.get("ship_qty", "")
+            num_boxes = data.get("num_boxes", "")
+
         # Process each asset (putting only unique ones in the sheet)
         processed_assets = set()
-        row_index = 16  # Start at row 16 for assets
-        
+        row_index, asset_col = coordinate_to_tuple(targets["first_asset"])
+        description_col = coordinate_to_tuple(targets["first_asset_description"])[1]
+
         for asset in assets:
             asset_tag = asset.get("asset_tag")
             if asset_tag and asset_tag not in processed_assets:
-                # Put asset tag in column A
-                set_cell_value_safely(sheet, f"A{row_index}", asset_tag)
-                
-                # Put description in column B
-                set_cell_value_safely(sheet, f"B{row_index}", asset.get("description", ""))
-                
+                # Asset tag and description, one row per asset
+                cells[f"{get_column_letter(asset_col)}{row_index}"] = asset_tag
+                cells[f"{get_column_letter(description_col)}{row_index}"] = asset.get("description", "")
+        
                 # Add to processed set to avoid duplicates
                 processed_assets.add(asset_tag)
                 row_index += 1
-                
-        # Set quantities for the first row (row 16)
-        if order_qty and order_qty.strip():
-            set_cell_value_safely(sheet, "F16", order_qty.strip())  # ORDER QTY in F16
-            set_cell_value_safely(sheet, "F28", order_qty.strip())  # Total ORDER QTY in F28
-            
-        if ship_qty and ship_qty.strip():
-            set_cell_value_safely(sheet, "H16", ship_qty.strip())  # SHIP QTY in H16
-            set_cell_value_safely(sheet, "H28", ship_qty.strip())  # Total SHIP QTY in H28
-            
-        if num_boxes and num_boxes.strip():
-            set_cell_value_safely(sheet, "I16", num_boxes.strip())  # # BOXES in I16
-            set_cell_value_safely(sheet, "I28", num_boxes.strip())  # Total # BOXES in I28
+        
+        # Quantities go on the first asset row and the totals row; ones not
+        # entered are written blank so the template's sample numbers never show
+        for value, first_row, total in ((order_qty, "order_qty", "total_order_qty"),
+                                        (ship_qty, "ship_qty", "total_ship_qty"),
+                                        (num_boxes, "num_boxes", "total_boxes")):
+            value = (value or "").strip()
+            cells[targets[first_row]] = value
+            cells[targets[total]] = value
     else:
         # If no assets found, use the regular shipment details
-        set_cell_value_safely(sheet, "F16", data.get("order_qty", ""))  # ORDER QTY in F16
-        set_cell_value_safely(sheet, "H16", data.get("ship_qty", ""))  # SHIP QTY in H16
-        set_cell_value_safely(sheet, "I16", data.get("num_boxes", ""))  # # BOXES in I16
-        
+        cells[targets["order_qty"]] = data.get("order_qty", "")
+        cells[targets["ship_qty"]] = data.get("ship_qty", "")
+        cells[targets["num_boxes"]] = data.get("num_boxes", "")
+
         # Totals row
-        set_cell_value_safely(sheet, "F28", data.get("order_qty", ""))  # Total ORDER QTY in F28
-        set_cell_value_safely(sheet, "H28", data.get("ship_qty", ""))  # Total SHIP QTY in H28
-        set_cell_value_safely(sheet, "I28", data.get("num_boxes", ""))  # Total # BOXES in I28
+        cells[targets["total_order_qty"]] = data.get("order_qty", "")
+        cells[targets["total_ship_qty"]] = data.get("ship_qty", "")
+        cells[targets["total_boxes"]] = data.get("num_boxes", "")
     
     # Partial shipment info (if applicable)
     if "partial_shipment" in data:
-        set_cell_value_safely(sheet, "G5", f"Partial Shipment: {data['partial_shipment']}")
+        cells[targets["partial_shipment"]] = f"Partial Shipment: {data['partial_shipment']}"
     
     # Comments (if provided)
     if "comments" in data:
-        set_cell_value_safely(sheet, "A25", "Comments:")
-        set_cell_value_safely(sheet, "B25", data["comments"])
+        cells[targets["comments_label"]] = "Comments:"
+        cells[targets["comments"]] = data["comments"]
+    
+    return cells
+
+@traced()
+def write_packing_slip(cells, job_number, pdf=True):
+    """Write the packing slip files for one job; returns (excel path, pdf path or None)."""
+    # Get the download path
+    download_path = get_download_path()
     
-    # Save the workbook
-    workbook.save(excel_filepath)
+    # Use job number as filename
+    excel_filepath = os.path.join(download_path, f"{job_number}.xlsx")
+    pdf_filepath = os.path.join(download_path, f"{job_number}.pdf")
+    
+    # Fill in a draft of the cached template and write it out in one save
+    try:
+        with open_template(PACKING_SLIP_TEMPLATE) as draft:
+            # Use the safe method that handles merged cells
+            for cell_reference, value in cells.items():
+                set_cell_value_safely(draft, cell_reference, value)
+            with span("save workbook", cat="io"):
+                draft.save(excel_filepath)
+    except FileNotFoundError as e:
+        print(f"❌ {str(e)}")
+        return None
     
     # Convert to PDF if possible
     pdf_created = False
-    if HAS_WIN32COM:
+    if not pdf:
+        pass
+    elif HAS_WIN32COM:
         try:
             excel = win32com.client.Dispatch("Excel.Application")
             excel.Visible = False
             wb = excel.Workbooks.Open(os.path.abspath(excel_filepath))
             ws = wb.Worksheets[0]
-            ws.ExportAsFixedFormat(0, os.path.abspath(pdf_filepath))
+            with span("excel pdf export", cat="io"):
+                ws.ExportAsFixedFormat(0, os.path.abspath(pdf_filepath))
             wb.Close()
             excel.Quit()
             pdf_created = True
             print(f"✅ Created PDF: {pdf_filepath}")
         except Exception as e:
             print(f"❌ Error creating PDF: {str(e)}")
+    else:
+        # No Excel - use the running LibreOffice converter, or draw the slip ourselves
+        converter = office_converter.get_running_converter()
+        if converter:
+            try:
+                with span("libreoffice pdf export", cat="io"):
+                    converter.convert(excel_filepath, pdf_filepath)
+                pdf_created = True
+                print(f"✅ Created PDF with LibreOffice: {pdf_filepath}")
+            except Exception as e:
+                print(f"⚠️ LibreOffice conversion failed, drawing the PDF instead: {str(e)}")
+        if not pdf_created:
+            try:
+                with span("render pdf", cat="io"):
+                    render_packing_slips([cells], pdf_filepath)
+                pdf_created = True
+                print(f"✅ Created PDF: {pdf_filepath}")
+            except Exception as e:
+                print(f"❌ Error creating PDF: {str(e)}")
     
     print(f"✅ Created packing slip from template: {excel_filepath}")
     return excel_filepath, pdf_filepath if pdf_created else None
 
-def run():
+@traced()
+def create_packing_slip(job_info, shipping_info, shipment_details, ship_date=None, interactive=True):
+    """
+    Create a packing slip Excel file using the template. With interactive=False
+    (batch mode) no dialogs are shown: ship_date is used as given and the
+    quantities come from shipment_details or are left blank.
+    """
+    # Combine all information
+    data = {**job_info, **shipping_info, **shipment_details}
+    
+    # Ask for ship date from user
+    if interactive:
+        ship_date = ask_ship_date()
+    
+    cells = packing_slip_cells(data, ship_date, interactive)
+    return write_packing_slip(cells, data.get("Job Number", "unknown"))
+
+@trace_run
+def run(lean=True, direct=True):
     """Main function to run the packing slip generation process."""
     # Get job number
     job_number = get_job_number()
@@ -406,59 +590,52 @@ def run():
     shipment_details = get_shipment_details(job_number)
     
     # Ensure browser is installed
+    report_progress("Starting browser")
     browser_path = ensure_browser_installed()
+    reset_wait_log()
     
     with sync_playwright() as p:
-        # Launch browser using system installation if available
-        # Use headless mode by default to avoid focus/modal issues
-        launch_options = {
-            "headless": True,  # Run in headless mode to avoid focus issues
-        }
-        
-        if browser_path:
-            launch_options["executable_path"] = browser_path
-            browser = p.chromium.launch(**launch_options)
-        else:
-            # Let Playwright try to find its own browser
-            browser = p.chromium.launch(**launch_options)
-            
-        context = browser.new_context()
-        page = context.new_page()
+        # Attach to the shared browser host, or launch a headless browser if none is running
+        session = open_browser_session(p, browser_path)
+        page = session.page
+        lean_profile = LeanProfile() if lean else None
         
         try:
-            # Login
-            page.goto(LOGIN_URL)
-            page.wait_for_load_state('networkidle')
+            # Only DOM text is read - skip images, fonts and trackers
+            if lean_profile:
+                lean_profile.attach(page)
             
-            username, password = get_login_info()
-            
-            # Check if login was cancelled
-            if not username or not password:
-                print("Login cancelled by user")
-                browser.close()
-                return
-                
-            page.wait_for_selector("#txt_Username", timeout=60000)
-            page.fill("#txt_Username", username)
-            page.fill("#txt_Password", password)
-            page.click("#btn_Login")
-            page.wait_for_selector("#jobStatusListResults", timeout=10000)
+            job_info = None
+            if direct:
+                # One navigation: everything the slip needs is on the job page
+                report_progress(f"Reading job {job_number}")
+                try:
+                    if not open_job_page(page, job_number):
+                        return
+                    shipping_info = read_job_details(page, job_number)
+                    job_info = job_info_from_job_page(shipping_info, job_number)
+                except LookupError as e:
+                    print(f"❌ Job {job_number} not found: {str(e)}")
+                    return
+                except Exception as e:
+                    print(f"Direct job page lookup failed, searching the job list: {str(e)}")
             
-            # Go to Job Status List and find the job
-            page.goto(DASHBOARD_URL)
-            page.wait_for_selector("table.data-results")
-            
-            # Search for job in the job list
-            job_info = find_job_in_job_list(page, job_number)
             if not job_info:
-                print(f"❌ Job {job_number} not found")
-                browser.close()
-                return
-            
-            # Get detailed job information
-            shipping_info = get_job_details(page, job_number)
+                # Go to Job Status List, logging in only if the saved session is not valid
+                check_cancelled()
+                report_progress(f"Searching the job list for {job_number}")
+                try:
+                    found = fetch_from_job_list(page, job_number)
+                except LookupError:
+                    print(f"❌ Job {job_number} not found")
+                    return
+                if not found:
+                    return
+                job_info, shipping_info = found
             
             # Create packing slip
+            check_cancelled()
+            report_progress("Writing packing slip")
             excel_path, pdf_path = create_packing_slip(job_info, shipping_info, shipment_details)
             
             print(f"✅ Successfully created packing slip for job {job_number}")
@@ -475,9 +652,119 @@ def run():
         except Exception as e:
             print(f"❌ Error: {str(e)}")
         finally:
-            browser.close()
+            session.close()
+            print_wait_summary()
+            if lean_profile:
+                lean_profile.report()
             
     return excel_path, pdf_path if 'pdf_path' in locals() and pdf_path else None
 
+@traced()
+def fetch_job(page, job_number):
+    """Read one job for a batch on a pool page; returns (job_info, shipping_info)"""
+    try:
+        opened = open_job_page(page, job_number, login_info=login_with_saved_credentials)
+    except (TimeoutError, PlaywrightTimeoutError) as e:
+        print(f"Job page {job_number} did not load, searching the job list: {str(e)}")
+        found = fetch_from_job_list(page, job_number, login_info=login_with_saved_credentials)
+        if not found:
+            raise RuntimeError("not logged in")
+        return found
+    if not opened:
+        raise RuntimeError("not logged in")
+    shipping_info = read_job_details(page, job_number)
+    return job_info_from_job_page(shipping_info, job_number), shipping_info
+
+@trace_run
+def run_batch(job_numbers=None, ship_date=None, concurrency=DEFAULT_POOL_SIZE):
+    """
+    Create packing slips for many jobs in one session: log in once, read the
+    job pages in parallel on a page pool and write every slip. Returns
+    {job_number: (excel_path, pdf_path, blank fields) or error message};
+    see batch_blank_fields for the quantities left to fill in by hand.
+    """
+    if job_numbers is None:
+        job_numbers = get_job_numbers()
+    if not job_numbers:
+        print("❌ No job numbers provided")
+        return {}
+    
+    if ship_date is None:
+        ship_date = ask_ship_date("Enter the ship date for all slips (MM/DD/YYYY):")
+    
+    print(f"Creating packing slips for {len(job_numbers)} jobs")
+    browser_path = ensure_browser_installed()
+    reset_wait_log()
+    
+    # Log in once here, where a dialog is allowed - the pool pages reuse the saved session
+    with sync_playwright() as p:
+        session = open_browser_session(p, browser_path)
+        try:
+            if not ensure_logged_in(session.page, DASHBOARD_URL):
+                return {}
+        finally:
+            session.close()
+    
+    results = {}
+    slips = []
+    try:
+        with PagePool(size=min(concurrency, len(job_numbers)), browser_path=browser_path, lean=True) as pool:
+            futures = {job_number: pool.submit(fetch_job, job_number) for job_number in job_numbers}
+            # Slips are written here, in order, while the pool keeps reading the next jobs
+            for done, (job_number, future) in enumerate(futures.items()):
+                if is_cancelled():
+                    # Keep the slips written so far; jobs not started yet are dropped
+                    for pending_job, pending in futures.items():
+                        if pending_job not in results and pending.cancel():
+                            results[pending_job] = "cancelled"
+                    if job_number in results:
+                        continue
+                report_progress("Creating packing slips", done, len(futures))
+                try:
+                    job_info, shipping_info = future.result()
+                    data = {**job_info, **shipping_info}
+                    cells = packing_slip_cells(data, ship_date, interactive=False)
+                    # One PDF for the whole batch is written below
+                    created = write_packing_slip(cells, job_number, pdf=False)
+                    results[job_number] = created + (batch_blank_fields(data),) if created else "template not found"
+                    if created:
+                        slips.append((job_number, cells))
+                except LookupError as e:
+                    results[job_number] = f"not found ({str(e)})"
+                except Exception as e:
+                    results[job_number] = str(e)
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+    finally:
+        print_wait_summary()
+    
+    # All slips of the batch as pages of one PDF
+    if slips:
+        report_progress("Writing the batch PDF")
+        pdf_path = os.path.join(get_download_path(), f"{get_current_date_formatted()}_PACKING_SLIPS.pdf")
+        try:
+            with span("render batch pdf", cat="io"):
+                render_packing_slips([cells for _, cells in slips], pdf_path)
+            print(f"✅ Created PDF with {len(slips)} packing slips: {pdf_path}")
+            for job_number, _ in slips:
+                results[job_number] = (results[job_number][0], pdf_path, results[job_number][2])
+        except Exception as e:
+            print(f"❌ Error creating PDF: {str(e)}")
+    
+    # Per-job summary
+    succeeded = [job for job, result in results.items() if isinstance(result, tuple)]
+    print(f"Packing slips: {len(succeeded)} of {len(job_numbers)} created")
+    for job_number in job_numbers:
+        result = results.get(job_number, "not processed")
+        if isinstance(result, tuple):
+            check = f" (left blank: {', '.join(result[2])})" if result[2] else ""
+            print(f"  ✅ {job_number}: {result[1] or result[0]}{check}")
+        else:
+            print(f"  ❌ {job_number}: {result}")
+    return results
+
 if __name__ == "__main__":
-    run() 
\ No newline at end of file
+    if "--batch" in sys.argv:
+        run_batch()
+    else:
+        run() 
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+Pool of pre-authenticated browser pages for running job page visits in parallel.
+
+Playwright's sync API objects belong to the thread that created them, so each
+pool slot is a worker thread with its own Playwright connection and its own
+logged-in page (attached to the browser host when one is running, otherwise a
+private browser started from the saved session). Tasks are checked out to a
+free page and the page is health-checked before it is handed back to the pool,
+so concurrent tasks never share navigation state.
+"""
+import queue
+import threading
+from concurrent.futures import Future
+from utils import load_credentials, DASHBOARD_URL
+from session_store import ensure_logged_in, is_login_page
+from lean_profile import LeanProfile
+
+DEFAULT_POOL_SIZE = 3
+
+_STOP = object()
+
+def login_with_saved_credentials():
+    """Re-login hook for worker pages - never shows a dialog off the UI thread"""
+    return load_credentials()
+
+class PagePool:
+    """N logged-in pages that tasks can check out with submit() or map()"""
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, browser_path=None, login_hook=login_with_saved_credentials,
+                 home_url=DASHBOARD_URL, context_options=None, lean=False):
+        self.size = size
+        self.browser_path = browser_path
+        self.login_hook = login_hook
+        self.home_url = home_url
+        self.context_options = context_options
+        # One shared LeanProfile so the run report covers every pool page
+        self.lean_profile = LeanProfile() if lean else None
+        self._tasks = queue.Queue()
+        self._workers = []
+        self._ready = threading.Semaphore(0)
+        self._lock = threading.Lock()
+        self._started = 0
+
+    def start(self):
+        """Start the workers and wait until every page is logged in"""
+        for index in range(self.size):
+            worker = threading.Thread(target=self._worker, args=(index,), daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        for _ in range(self.size):
+            self._ready.acquire()
+        if self._started == 0:
+            raise RuntimeError("No page in the pool could log in")
+        print(f"✅ Page pool ready with {self._started} of {self.size} pages")
+        return self
+
+    def _worker(self, index):
+        from playwright.sync_api import sync_playwright
+        from browser_host import open_browser_session
+
+        with sync_playwright() as p:
+            session = None
+            try:
+                session = open_browser_session(p, self.browser_path, context_options=self.context_options)
+                if self.lean_profile:
+                    self.lean_profile.attach(session.page)
+                if not ensure_logged_in(session.page, self.home_url, login_info=self.login_hook):
+                    raise RuntimeError("login failed")
+                with self._lock:
+                    self._started += 1
+            except Exception as e:
+                print(f"Pool page {index} could not start: {str(e)}")
+                if session:
+                    session.close()
+                self._ready.release()
+                return
+            self._ready.release()
+
+            try:
+                while True:
+                    task = self._tasks.get()
+                    if task is _STOP:
+                        break
+                    future, func, args = task
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        future.set_result(func(session.page, *args))
+                    except Exception as e:
+                        future.set_exception(e)
+                    self._check_health(session)
+            finally:
+                session.close()
+
+    def _check_health(self, session):
+        """Make sure a returned page is still usable and logged in"""
+        try:
+            if session.page.is_closed():
+                print("Pool page was closed - opening a new one")
+                session.page = session.context.new_page()
+                if self.lean_profile:
+                    self.lean_profile.attach(session.page)
+            page = session.page
+            page.evaluate("1")
+            if is_login_page(page):
+                print("Pool page was logged out - logging in again")
+                ensure_logged_in(page, self.home_url, login_info=self.login_hook)
+        except Exception as e:
+            print(f"Pool page health check failed: {str(e)}")
+
+    def submit(self, func, *args):
+        """Run func(page, *args) on the next free page; returns a Future"""
+        future = Future()
+        self._tasks.put((future, func, args))
+        return future
+
+    def map(self, func, items):
+        """Run func(page, item) for every item in parallel; results keep the item order"""
+        futures = [self.submit(func, item) for item in items]
+        return [future.result() for future in futures]
+
+    def close(self):
+        """Stop the workers and close their pages"""
+        for _ in self._workers:
+            self._tasks.put(_STOP)
+        for worker in self._workers:
+            worker.join(timeout=30)
+        self._workers = []
+        if self.lean_profile:
+            self.lean_profile.report()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
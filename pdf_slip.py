@@ -0,0 +1,391 @@
+"""
+Native PDF rendering of packing slips, without Excel.
+
+The page is drawn from PackingSlipTemplate.xlsx itself: column widths, row
+heights, merged ranges, borders, fills and fonts. Everything that never
+changes is turned into one PDF form XObject, built once per process. Each
+slip is that background plus the cells create_packing_slip fills in, so a
+page costs a few hundred bytes of text operators. Several slips go into one
+multi-page PDF.
+
+Only the standard Helvetica fonts are used, so nothing has to be embedded.
+"""
+import os
+import re
+import zlib
+import threading
+from datetime import date, datetime
+from openpyxl.utils.cell import coordinate_to_tuple, get_column_letter
+from template_cache import open_template, get_template_path, PACKING_SLIP_TEMPLATE
+
+PAGE_WIDTH = 612   # US Letter, points
+PAGE_HEIGHT = 792
+
+DEFAULT_ROW_HEIGHT = 15.0
+DEFAULT_COLUMN_WIDTH = 8.43  # characters
+CELL_PADDING = 2.0
+LINE_SPACING = 1.15
+
+
+# Advance widths (1/1000 em) of ASCII 32-126 in Helvetica and Helvetica-Bold
+_HELVETICA_WIDTHS = [int(w) for w in (
+    "278 278 355 556 556 889 667 191 333 333 389 584 278 333 278 278 556 556 556 556 556 556 556 556 556 556 "
+    "278 278 584 584 584 556 1015 667 667 722 722 667 611 778 722 278 500 667 556 833 722 778 667 778 722 667 "
+    "611 722 667 944 667 667 611 278 278 278 469 556 333 556 556 500 556 556 278 556 556 222 222 500 222 833 "
+    "556 556 556 556 333 500 278 556 500 722 500 500 500 334 260 334 584"
+).split()]
+_HELVETICA_BOLD_WIDTHS = [int(w) for w in (
+    "278 333 474 556 556 889 722 238 333 333 389 584 278 333 278 278 556 556 556 556 556 556 556 556 556 556 "
+    "333 333 584 584 584 611 975 722 722 722 722 667 611 778 722 278 556 722 611 833 722 778 667 778 722 667 "
+    "611 722 667 944 667 667 611 333 278 333 584 556 333 556 611 556 611 556 333 611 611 278 278 556 278 889 "
+    "611 611 611 611 389 556 333 611 556 778 556 556 500 389 280 389 584"
+).split()]
+
+_BORDER_WIDTHS = {"hair": 0.25, "thin": 0.5, "medium": 1.0, "thick": 1.5, "double": 1.5}
+
+_SUM_FORMULA = re.compile(r"=SUM\(([A-Z]+)(\d+):([A-Z]+)(\d+)\)", re.IGNORECASE)
+
+def text_width(text, size, bold=False):
+    """Width of text in points"""
+    widths = _HELVETICA_BOLD_WIDTHS if bold else _HELVETICA_WIDTHS
+    total = 0
+    for char in text:
+        code = ord(char)
+        total += widths[code - 32] if 32 <= code <= 126 else 556
+    return total * size / 1000.0
+
+def _pdf_string(text):
+    """Escape text as a PDF literal string in WinAnsi encoding"""
+    raw = text.encode("cp1252", errors="replace").decode("latin-1")
+    return "(" + raw.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").replace("\r", "") + ")"
+
+def _color(hex_rgb):
+    """'FF0C0C0C' -> 'r g b' operands"""
+    hex_rgb = hex_rgb[-6:]
+    return " ".join(f"{int(hex_rgb[i:i + 2], 16) / 255:.3f}" for i in (0, 2, 4))
+
+def _format_value(value, number_format=""):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%m-%d-%y" if "yy" in number_format and "yyyy" not in number_format else "%m/%d/%Y")
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def _wrap(text, width, size, bold):
+    """Split text into lines that fit width (explicit newlines are kept)"""
+    lines = []
+    for paragraph in text.split("\n"):
+        words = paragraph.split(" ")
+        line = ""
+        for word in words:
+            candidate = f"{line} {word}" if line else word
+            if line and text_width(candidate, size, bold) > width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return lines
+
+class _CellStyle:
+    __slots__ = ("size", "bold", "color", "horizontal", "vertical", "wrap", "number_format")
+
+    def __init__(self, cell):
+        font = cell.font
+        self.size = float(font.sz or 10)
+        self.bold = bool(font.b)
+        color = font.color
+        if color is not None and color.type == "rgb" and isinstance(color.rgb, str):
+            self.color = _color(color.rgb)
+        elif color is not None and color.type == "theme" and color.theme == 0:
+            self.color = "1 1 1"  # theme 0 is the light background color
+        else:
+            self.color = "0 0 0"
+        self.horizontal = cell.alignment.horizontal or "general"
+        self.vertical = cell.alignment.vertical or "bottom"
+        self.wrap = bool(cell.alignment.wrap_text)
+        self.number_format = cell.number_format or ""
+
+class SlipLayout:
+    """Geometry and styles of the packing slip template, in PDF points"""
+
+    def __init__(self, sheet, manifest):
+        self.manifest = manifest
+        self.max_row, self.max_col = self._print_extent(sheet)
+
+        col_widths = []
+        for col in range(1, self.max_col + 1):
+            dimension = sheet.column_dimensions.get(get_column_letter(col))
+            width = dimension.width if dimension is not None and dimension.width else DEFAULT_COLUMN_WIDTH
+            col_widths.append((width * 7 + 5) * 0.75)  # Excel character width -> pixels -> points
+        row_heights = []
+        for row in range(1, self.max_row + 1):
+            dimension = sheet.row_dimensions.get(row)
+            height = dimension.height if dimension is not None and dimension.height else None
+            row_heights.append(height or sheet.sheet_format.defaultRowHeight or DEFAULT_ROW_HEIGHT)
+
+        # Column/row start offsets, with one extra entry for the far edge
+        self.col_x = [0.0]
+        for width in col_widths:
+            self.col_x.append(self.col_x[-1] + width)
+        self.row_y = [0.0]
+        for height in row_heights:
+            self.row_y.append(self.row_y[-1] + height)
+
+        # Fit the sheet between the template's margins, centered horizontally
+        margins = sheet.page_margins
+        left = (margins.left or 0.7) * 72
+        top = (margins.top or 0.75) * 72
+        available = PAGE_WIDTH - 2 * left
+        self.scale = min(1.0, available / self.col_x[-1])
+        self.origin_x = (PAGE_WIDTH - self.col_x[-1] * self.scale) / 2
+        self.origin_y = PAGE_HEIGHT - top
+
+        self.ranges = {}  # top-left (row, col) -> (min_row, min_col, max_row, max_col)
+        for merged_range in sheet.merged_cells.ranges:
+            self.ranges[(merged_range.min_row, merged_range.min_col)] = (
+                merged_range.min_row, merged_range.min_col, merged_range.max_row, merged_range.max_col
+            )
+
+        self.styles = {}
+        self.values = {}
+        for (row, col), cell in sheet._cells.items():
+            if row <= self.max_row and col <= self.max_col:
+                self.styles[(row, col)] = _CellStyle(cell)
+                if cell.value is not None:
+                    self.values[(row, col)] = cell.value
+
+        # Cells whose text changes per slip - everything else goes into the background
+        self.dynamic = {coordinate_to_tuple(coordinate) for coordinate in manifest.targets.values()}
+        # Besides the named targets, the asset rows between the first asset and the totals
+        asset_columns = [coordinate_to_tuple(manifest.targets[name])[1]
+                         for name in ("first_asset", "first_asset_description")]
+        for row in range(manifest.target_row("first_asset"), manifest.target_row("total_order_qty")):
+            for column in asset_columns:
+                self.dynamic.add(manifest.resolve_cell(row, column))
+        self.dynamic.update(cell for cell, value in self.values.items()
+                            if isinstance(value, str) and value.startswith("="))
+
+    @staticmethod
+    def _print_extent(sheet):
+        """Last row and column that have text, borders or a merged range"""
+        max_row = max_col = 1
+        for merged_range in sheet.merged_cells.ranges:
+            max_row = max(max_row, merged_range.max_row)
+            max_col = max(max_col, merged_range.max_col)
+        for (row, col), cell in sheet._cells.items():
+            border = cell.border
+            has_border = any(getattr(border, side).style for side in ("left", "right", "top", "bottom"))
+            has_text = isinstance(cell.value, str) and cell.value.strip() or (
+                cell.value is not None and not isinstance(cell.value, str))
+            if has_border or has_text:
+                max_row = max(max_row, row)
+                max_col = max(max_col, col)
+        return max_row, max_col
+
+    def point(self, x, y):
+        """Sheet offsets (points from A1's top-left) -> PDF coordinates"""
+        return self.origin_x + x * self.scale, self.origin_y - y * self.scale
+
+    def rect(self, row, col):
+        """(x, y, width, height) of a cell or its merged range, PDF coordinates (y is the bottom)"""
+        min_row, min_col, max_row, max_col = self.ranges.get((row, col), (row, col, row, col))
+        max_row = min(max_row, self.max_row)
+        max_col = min(max_col, self.max_col)
+        x, top = self.point(self.col_x[min_col - 1], self.row_y[min_row - 1])
+        right, bottom = self.point(self.col_x[max_col], self.row_y[max_row])
+        return x, bottom, right - x, top - bottom
+
+    def draw_text(self, ops, row, col, value):
+        """Append the operators that draw a value inside its cell"""
+        style = self.styles.get((row, col))
+        if style is None:
+            return
+        text = _format_value(value, style.number_format)
+        if not text.strip():
+            return
+
+        x, y, width, height = self.rect(row, col)
+        size = style.size * self.scale
+        inner_width = width - 2 * CELL_PADDING
+        lines = _wrap(text, inner_width, size, style.bold) if style.wrap or "\n" in text else [text]
+        line_height = size * LINE_SPACING
+        block = line_height * len(lines)
+
+        # Baseline of the first line
+        if style.vertical == "top":
+            baseline = y + height - CELL_PADDING - size * 0.8
+        elif style.vertical == "center":
+            baseline = y + (height + block) / 2 - size * 0.9
+        else:
+            baseline = y + CELL_PADDING + size * 0.2 + (len(lines) - 1) * line_height
+
+        font = "F2" if style.bold else "F1"
+        horizontal = style.horizontal
+        if horizontal == "general":
+            horizontal = "left" if isinstance(value, str) else "right"
+
+        # Clip to the cell like Excel does in print
+        ops.append(f"q {x:.2f} {y:.2f} {width:.2f} {height:.2f} re W n BT /{font} {size:.2f} Tf {style.color} rg")
+        for index, line in enumerate(lines):
+            line_width = text_width(line, size, style.bold)
+            if horizontal in ("center", "centerContinuous"):
+                line_x = x + (width - line_width) / 2
+            elif horizontal == "right":
+                line_x = x + width - CELL_PADDING - line_width
+            else:
+                line_x = x + CELL_PADDING
+            ops.append(f"1 0 0 1 {line_x:.2f} {baseline - index * line_height:.2f} Tm {_pdf_string(line)} Tj")
+        ops.append("ET Q")
+
+    def background(self, sheet):
+        """Operators for fills, borders and static text"""
+        ops = []
+
+        # Fills
+        for (row, col), cell in sheet._cells.items():
+            if row > self.max_row or col > self.max_col or not self._is_anchor(row, col):
+                continue
+            fill = cell.fill
+            if fill is None or fill.fill_type != "solid" or fill.fgColor.type != "rgb":
+                continue
+            rgb = fill.fgColor.rgb
+            if not isinstance(rgb, str) or rgb[-6:].upper() == "FFFFFF":
+                continue
+            x, y, width, height = self.rect(row, col)
+            ops.append(f"{_color(rgb)} rg {x:.2f} {y:.2f} {width:.2f} {height:.2f} re f")
+
+        # Borders - shared edges are drawn once, edges inside a merged range not at all
+        segments = {}
+        for (row, col), cell in sheet._cells.items():
+            if row > self.max_row or col > self.max_col:
+                continue
+            border = cell.border
+            for side, edge in (("top", (row - 1, col - 1, row - 1, col)),
+                               ("bottom", (row, col - 1, row, col)),
+                               ("left", (row - 1, col - 1, row, col - 1)),
+                               ("right", (row - 1, col, row, col))):
+                style = getattr(border, side).style
+                if style and not self._inside_merge(row, col, side):
+                    segments[edge] = max(segments.get(edge, 0), _BORDER_WIDTHS.get(style, 0.5))
+        ops.append("0 0 0 RG")
+        for (row1, col1, row2, col2), line_width in sorted(segments.items(), key=lambda item: item[1]):
+            x1, y1 = self.point(self.col_x[col1], self.row_y[row1])
+            x2, y2 = self.point(self.col_x[col2], self.row_y[row2])
+            ops.append(f"{line_width * self.scale:.2f} w {x1:.2f} {y1:.2f} m {x2:.2f} {y2:.2f} l S")
+
+        # Static labels
+        for (row, col), value in self.values.items():
+            if (row, col) not in self.dynamic and self._is_anchor(row, col):
+                self.draw_text(ops, row, col, value)
+        return "\n".join(ops)
+
+    def _is_anchor(self, row, col):
+        """True for normal cells and the top-left cell of a merged range"""
+        top_left = self.manifest.merged.get((row, col))
+        return top_left is None or top_left == (row, col)
+
+    def _inside_merge(self, row, col, side):
+        top_left = self.manifest.merged.get((row, col))
+        if top_left is None:
+            return False
+        min_row, min_col, max_row, max_col = self.ranges[top_left]
+        return ((side == "top" and row > min_row) or (side == "bottom" and row < max_row)
+                or (side == "left" and col > min_col) or (side == "right" and col < max_col))
+
+    def overlay(self, cells):
+        """Operators for one slip's values; cells is {coordinate: value} as written to the workbook"""
+        written = {}
+        for coordinate, value in cells.items():
+            written[self.manifest.resolve_cell(*coordinate_to_tuple(coordinate))] = value
+
+        values = {cell: self.values.get(cell) for cell in self.dynamic}
+        values.update(written)
+        ops = []
+        for (row, col), value in values.items():
+            if isinstance(value, str) and value.startswith("="):
+                value = self._evaluate(value, values)
+            self.draw_text(ops, row, col, value)
+        return "\n".join(ops)
+
+    def _evaluate(self, formula, values):
+        """The template only uses =SUM(range) - anything else is left blank"""
+        match = _SUM_FORMULA.fullmatch(formula.strip())
+        if not match:
+            return None
+        min_row, min_col = coordinate_to_tuple(match.group(1) + match.group(2))
+        max_row, max_col = coordinate_to_tuple(match.group(3) + match.group(4))
+        total = 0.0
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                value = values.get((row, col), self.values.get((row, col)))
+                try:
+                    total += float(value)
+                except (TypeError, ValueError):
+                    continue
+        return total
+
+_layout_lock = threading.Lock()
+_layout_cache = {}
+
+def _get_layout():
+    """(layout, compressed background stream), built once per template version"""
+    mtime = os.path.getmtime(get_template_path(PACKING_SLIP_TEMPLATE))
+    with _layout_lock:
+        cached = _layout_cache.get(PACKING_SLIP_TEMPLATE)
+        if cached is None or cached[0] != mtime:
+            with open_template(PACKING_SLIP_TEMPLATE) as draft:
+                layout = SlipLayout(draft.sheet, draft.manifest)
+                background = zlib.compress(layout.background(draft.sheet).encode("latin-1"))
+            cached = (mtime, layout, background)
+            _layout_cache[PACKING_SLIP_TEMPLATE] = cached
+        return cached[1], cached[2]
+
+def _stream(body, extra=""):
+    return (f"<< /Length {len(body)} /Filter /FlateDecode {extra}>>\nstream\n").encode("latin-1") + body + b"\nendstream"
+
+def render_packing_slips(slips, pdf_path):
+    """
+    Write one PDF page per slip. slips is a list of {coordinate: value} dicts
+    (see packing_slip.packing_slip_cells). Returns pdf_path.
+    """
+    layout, background = _get_layout()
+    fonts = "<< /F1 3 0 R /F2 4 0 R >>"
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page objects are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+        _stream(background, f"/Type /XObject /Subtype /Form /BBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                            f"/Resources << /Font {fonts} >> "),
+    ]
+    page_ids = []
+    for cells in slips:
+        content = "q /Bg Do Q\n" + layout.overlay(cells)
+        objects.append(_stream(zlib.compress(content.encode("latin-1"))))
+        content_id = len(objects)
+        objects.append((f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                        f"/Resources << /Font {fonts} /XObject << /Bg 5 0 R >> >> "
+                        f"/Contents {content_id} 0 R >>").encode("latin-1"))
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode("latin-1")
+
+    output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode("latin-1")
+    output += (f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+               f"startxref\n{xref_offset}\n%%EOF\n").encode("latin-1")
+
+    with open(pdf_path, "wb") as f:
+        f.write(output)
+    return pdf_path
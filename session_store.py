@@ -0,0 +1,104 @@
+"""
+Persist the authenticated browser session between runs.
+
+Playwright's storage_state (cookies + localStorage) is saved under
+~/.decopress after a successful login, so later runs can go straight to the
+page they need and only show the login dialog when the server sends us back
+to the login form.
+"""
+import os
+import time
+from utils import get_login_info, LOGIN_URL
+from tracer import span, traced
+
+# Saved sessions older than this are ignored (the intranet expires them anyway)
+SESSION_MAX_AGE_HOURS = 12
+
+def get_session_state_path():
+    """Get the path of the saved session state file"""
+    app_data_dir = os.path.join(os.path.expanduser("~"), ".decopress")
+    os.makedirs(app_data_dir, exist_ok=True)
+    return os.path.join(app_data_dir, "session_state.json")
+
+def load_session_state():
+    """Return the saved session state path if it exists and is recent enough"""
+    state_path = get_session_state_path()
+    if not os.path.exists(state_path):
+        return None
+
+    age_hours = (time.time() - os.path.getmtime(state_path)) / 3600
+    if age_hours > SESSION_MAX_AGE_HOURS:
+        print(f"Saved session is {age_hours:.1f} hours old - ignoring it")
+        return None
+
+    return state_path
+
+def save_session_state(context):
+    """Save the cookies/localStorage of a logged-in context"""
+    try:
+        context.storage_state(path=get_session_state_path())
+        print("✅ Session saved")
+    except Exception as e:
+        print(f"Error saving session: {str(e)}")
+
+def clear_session_state():
+    """Remove the saved session so the next run logs in again"""
+    state_path = get_session_state_path()
+    if os.path.exists(state_path):
+        os.remove(state_path)
+        return True
+    return False
+
+def new_session_context(browser, **context_options):
+    """Create a browser context that starts from the saved session, if any"""
+    state_path = load_session_state()
+    if state_path:
+        print("Found saved session - reusing it")
+        try:
+            return browser.new_context(storage_state=state_path, **context_options)
+        except Exception as e:
+            print(f"Could not load saved session: {str(e)}")
+    return browser.new_context(**context_options)
+
+def is_login_page(page):
+    """Check whether the server sent us to the login form"""
+    return page.query_selector("#txt_Username") is not None
+
+@traced("login")
+def ensure_logged_in(page, target_url, login_info=get_login_info):
+    """
+    Open target_url, logging in first only if the saved session is not valid.
+    Returns True when the page is on target_url with a valid session.
+    """
+    with span("goto target page", cat="navigation"):
+        page.goto(target_url)
+        page.wait_for_load_state('domcontentloaded')
+
+    if not is_login_page(page):
+        print("✅ Saved session is still valid - skipping login")
+        return True
+
+    print("Session expired or missing - logging in")
+    if page.url.rstrip('/') != LOGIN_URL.rstrip('/'):
+        page.goto(LOGIN_URL)
+
+    with span("login dialog"):
+        username, password = login_info()
+
+    # Check if login was cancelled
+    if not username or not password:
+        print("Login cancelled by user")
+        return False
+
+    page.wait_for_selector("#txt_Username", timeout=60000)
+    page.fill("#txt_Username", username)
+    page.fill("#txt_Password", password)
+    with span("submit login", cat="navigation"):
+        page.click("#btn_Login")
+        page.wait_for_selector("#jobStatusListResults", timeout=10000)
+
+    save_session_state(page.context)
+
+    # Login lands on the dashboard; go on to the page we actually wanted
+    page.goto(target_url)
+    return True
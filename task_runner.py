@@ -0,0 +1,144 @@
+"""
+Run the long jobs (daily scrape, packing slips) on a worker thread so the
+Tk window stays responsive.
+
+The worker talks to the UI through one queue that the Tk loop polls:
+
+- report_progress() sends phase and row counts to the loading screen
+- functions decorated with @run_on_ui_thread (the login, job number and
+  shipment dialogs) are queued, run by the poll on the main thread, and
+  their result is handed back to the waiting worker
+- check_cancelled() raises TaskCancelled in the worker once Cancel was
+  pressed, at points where the scrape can stop cleanly
+
+Outside a BackgroundTask (command line runs) all of these act as if there
+were no UI: progress is ignored, dialogs are shown directly and nothing is
+ever cancelled.
+"""
+import queue
+import functools
+import threading
+from concurrent.futures import Future
+
+POLL_INTERVAL_MS = 100
+
+class TaskCancelled(BaseException):
+    """
+    Raised by check_cancelled() in a task that was cancelled. It is a
+    BaseException so the per-row "except Exception" handlers of the scrapers
+    do not swallow it; their finally blocks still close the browser.
+    """
+
+_current = None
+
+def _current_task():
+    """The running task, when called from its worker thread"""
+    task = _current
+    if task is not None and threading.current_thread() is task.thread:
+        return task
+    return None
+
+def report_progress(phase, done=None, total=None):
+    """Show what the running task is doing, e.g. ("Reading page 2", 40) or ("Checking HW jobs", 3, 12)"""
+    task = _current_task()
+    if task is None:
+        return
+    if total:
+        text = f"{phase} ({done} of {total})"
+    elif done is not None:
+        text = f"{phase} ({done} so far)"
+    else:
+        text = phase
+    task.messages.put(("progress", text))
+
+def check_cancelled():
+    """Stop the running task here if Cancel was pressed"""
+    task = _current_task()
+    if task is not None and task.cancelled.is_set():
+        raise TaskCancelled()
+
+def is_cancelled():
+    task = _current_task()
+    return task is not None and task.cancelled.is_set()
+
+def run_on_ui_thread(func):
+    """Run a dialog function on the Tk main thread when it is called from a task"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        task = _current_task()
+        if task is None:
+            return func(*args, **kwargs)
+        future = Future()
+        task.messages.put(("call", (future, func, args, kwargs)))
+        return future.result()
+    return wrapper
+
+def is_busy():
+    return _current is not None
+
+class BackgroundTask:
+    """
+    One job on a worker thread. on_progress(text) and on_done(result, error)
+    are called on the Tk thread; error is None, an exception, or TaskCancelled.
+    """
+
+    def __init__(self, root, func, on_done, on_progress=None):
+        self.root = root
+        self.func = func
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.messages = queue.Queue()
+        self.cancelled = threading.Event()
+        self.thread = None
+        self._outcome = None
+
+    def start(self):
+        global _current
+        if _current is not None:
+            raise RuntimeError("Another task is already running")
+        _current = self
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.root.after(POLL_INTERVAL_MS, self._poll)
+        return self
+
+    def cancel(self):
+        """Ask the task to stop at its next check_cancelled()"""
+        if not self.cancelled.is_set():
+            print("Cancelling...")
+            self.cancelled.set()
+            self.messages.put(("progress", "Cancelling..."))
+
+    def _run(self):
+        try:
+            self._outcome = (self.func(), None)
+        except TaskCancelled as e:
+            print("⚠️ Task cancelled")
+            self._outcome = (None, e)
+        except Exception as e:
+            self._outcome = (None, e)
+
+    def _poll(self):
+        global _current
+        while True:
+            try:
+                kind, payload = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                if self.on_progress:
+                    self.on_progress(payload)
+            else:
+                future, func, args, kwargs = payload
+                try:
+                    future.set_result(func(*args, **kwargs))
+                except Exception as e:
+                    future.set_exception(e)
+
+        if self.thread.is_alive() or not self.messages.empty():
+            self.root.after(POLL_INTERVAL_MS, self._poll)
+            return
+
+        _current = None
+        result, error = self._outcome or (None, RuntimeError("task ended without a result"))
+        self.on_done(result, error)
@@ -0,0 +1,256 @@
+"""
+Report templates parsed once and kept in memory.
+
+Every packing slip and daily report used to copy its template file and parse
+the copy with load_workbook. Here each template is parsed once per process.
+A job gets a TemplateDraft of the cached workbook: writes remember the
+original value of every cell they touch, and when the draft is done the
+workbook is put back exactly as it was. A clone therefore costs as much as the
+cells a job writes, not a file copy plus a full parse, and the result is
+written to its destination in one save. Rows a draft inserts (a report with
+more orders than the template has rows) are taken out again the same way.
+
+Drafts of one template are handed out one at a time, which matches how
+slips and reports are written (one after another).
+
+Each cached template also has a TemplateManifest, built once: every cell of a
+merged range mapped to the range's top-left cell, and the named cells the
+writers fill in. Writes never scan the merged ranges.
+"""
+import os
+import copy
+import threading
+from contextlib import contextmanager
+from openpyxl import load_workbook
+from openpyxl.cell.cell import MergedCell
+from openpyxl.utils.cell import coordinate_to_tuple, get_column_letter
+
+PACKING_SLIP_TEMPLATE = "PackingSlipTemplate.xlsx"
+DAILY_REPORT_TEMPLATE = "DECOPRESS DAILY Template.xlsx"
+
+# The cells each writer fills in, by name
+TEMPLATE_TARGETS = {
+    PACKING_SLIP_TEMPLATE: {
+        "date": "G2",
+        "partial_shipment": "G5",
+        "ship_to": "E6",
+        "ship_date": "A13",
+        "job_number": "B13",
+        "order_number": "D13",
+        "contact": "G13",
+        "first_asset": "A16",
+        "first_asset_description": "B16",
+        "order_qty": "F16",
+        "ship_qty": "H16",
+        "num_boxes": "I16",
+        "total_order_qty": "F28",
+        "total_ship_qty": "H28",
+        "total_boxes": "I28",
+        "comments_label": "A25",
+        "comments": "B25",
+    },
+    DAILY_REPORT_TEMPLATE: {
+        "date": "A3",
+        "first_job": "B5",
+        "change": "J4",
+    },
+}
+
+class TemplateManifest:
+    """Merged-cell map and named target cells of a template sheet"""
+
+    def __init__(self, sheet, targets):
+        # (row, col) of every merged cell -> (row, col) of its range's top-left cell
+        self.merged = {}
+        for merged_range in sheet.merged_cells.ranges:
+            top_left = (merged_range.min_row, merged_range.min_col)
+            for row in range(merged_range.min_row, merged_range.max_row + 1):
+                for col in range(merged_range.min_col, merged_range.max_col + 1):
+                    self.merged[(row, col)] = top_left
+        # Named cells, already resolved to the cell that can hold a value
+        self.targets = {name: self.resolve(coordinate) for name, coordinate in targets.items()}
+
+    def is_merged(self, row, col):
+        return (row, col) in self.merged
+
+    def resolve_cell(self, row, col):
+        """The (row, col) a value for this cell has to be written to"""
+        return self.merged.get((row, col), (row, col))
+
+    def resolve(self, coordinate):
+        """Same as resolve_cell, for "A1"-style coordinates"""
+        row, col = self.resolve_cell(*coordinate_to_tuple(coordinate))
+        return f"{get_column_letter(col)}{row}"
+
+    def target_row(self, name):
+        return coordinate_to_tuple(self.targets[name])[0]
+
+class _CachedTemplate:
+    def __init__(self, path, targets):
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        self.workbook = load_workbook(path)
+        self.manifest = TemplateManifest(self.workbook.active, targets)
+        self.lock = threading.Lock()
+
+# Marks cells a draft created, so restoring removes them again
+_NEW = object()
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+def get_template_path(template_name):
+    """Templates live next to the scripts"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, template_name)
+
+def _get_template(template_name):
+    """Parse a template on first use (or after the file changed) and cache it"""
+    path = get_template_path(template_name)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Template file not found: {path}")
+
+    with _templates_lock:
+        template = _templates.get(path)
+        if template is None or template.mtime != os.path.getmtime(path):
+            print(f"Loading template {template_name}")
+            template = _CachedTemplate(path, TEMPLATE_TARGETS.get(template_name, {}))
+            _templates[path] = template
+        return template
+
+def get_manifest(template_name):
+    """The manifest of a template, for code that needs target cells without writing a draft"""
+    return _get_template(template_name).manifest
+
+class TemplateDraft:
+    """One job's writes on top of a cached template"""
+
+    def __init__(self, workbook, manifest):
+        self.workbook = workbook
+        self.sheet = workbook.active
+        self.manifest = manifest
+        # (row, col) -> original value, or _NEW for cells the template did not have
+        self._originals = {}
+        # (row, amount) of every insert_rows call, and the row heights before the first one
+        self._inserts = []
+        self._heights = None
+
+    def _remember(self, row, col):
+        if (row, col) not in self._originals:
+            cell = self.sheet._cells.get((row, col))
+            self._originals[(row, col)] = cell.value if cell is not None else _NEW
+
+    def set_cell(self, row, col, value):
+        """Write a cell; returns False (and writes nothing) for cells inside a merged range"""
+        if isinstance(self.sheet._cells.get((row, col)), MergedCell):
+            print(f"{get_column_letter(col)}{row} is inside a merged range - skipping")
+            return False
+        self._remember(row, col)
+        self.sheet.cell(row=row, column=col).value = value
+        return True
+
+    def get_cell(self, row, col):
+        cell = self.sheet._cells.get((row, col))
+        return cell.value if cell is not None else None
+
+    def set_value(self, coordinate, value):
+        row, col = coordinate_to_tuple(coordinate)
+        self.set_cell(row, col, value)
+
+    def last_content_row(self):
+        """The last row with a value or a merged range in it"""
+        rows = [merged_range.max_row for merged_range in self.sheet.merged_cells.ranges]
+        rows += [row for (row, col), cell in self.sheet._cells.items() if cell.value is not None]
+        return max(rows, default=0)
+
+    def insert_rows(self, row, amount=1):
+        """
+        Insert empty rows before row, styled like the row above it. Everything
+        below (values, styles, merged ranges, row heights) moves down; the
+        rows are taken out again when the draft is done.
+        """
+        sheet = self.sheet
+        if self._heights is None:
+            self._heights = {index: dimension.height for index, dimension in sheet.row_dimensions.items()}
+        heights = {index: sheet.row_dimensions[index].height for index in range(row, sheet.max_row + 1)}
+
+        sheet.insert_rows(row, amount)
+        for merged_range in sheet.merged_cells.ranges:
+            if merged_range.min_row >= row:
+                merged_range.shift(row_shift=amount)
+        for index, height in heights.items():
+            sheet.row_dimensions[index + amount].height = height
+        # Cells remembered below the new rows moved with them
+        self._originals = {
+            (cell_row + amount if cell_row >= row else cell_row, col): value
+            for (cell_row, col), value in self._originals.items()
+        }
+
+        above = row - 1
+        for new_row in range(row, row + amount):
+            sheet.row_dimensions[new_row].height = sheet.row_dimensions[above].height
+            for col in range(1, sheet.max_column + 1):
+                source = sheet._cells.get((above, col))
+                if source is not None and source.has_style and not isinstance(source, MergedCell):
+                    sheet.cell(row=new_row, column=col)._style = copy.copy(source._style)
+        self._inserts.append((row, amount))
+
+    def save(self, path):
+        self.workbook.save(path)
+
+    def _remove_inserted_rows(self):
+        sheet = self.sheet
+        for row, amount in reversed(self._inserts):
+            sheet.delete_rows(row, amount)
+            for merged_range in sheet.merged_cells.ranges:
+                if merged_range.min_row >= row + amount:
+                    merged_range.shift(row_shift=-amount)
+        for index in list(sheet.row_dimensions):
+            if index not in self._heights:
+                del sheet.row_dimensions[index]
+        for index, height in self._heights.items():
+            sheet.row_dimensions[index].height = height
+        self._inserts.clear()
+        self._heights = None
+
+    def _restore(self):
+        """Put back every remembered cell; returns False if any of them could not be restored"""
+        restored = True
+        for (row, col), value in self._originals.items():
+            try:
+                if value is _NEW:
+                    self.sheet._cells.pop((row, col), None)
+                else:
+                    self.sheet._cells[(row, col)].value = value
+            except (KeyError, AttributeError) as e:
+                print(f"Could not restore {get_column_letter(col)}{row} of the template: {str(e)}")
+                restored = False
+        self._originals.clear()
+        if self._inserts:
+            try:
+                self._remove_inserted_rows()
+            except Exception as e:
+                print(f"Could not remove the rows added to the template: {str(e)}")
+                restored = False
+        return restored
+
+@contextmanager
+def open_template(template_name):
+    """
+    Check out a draft of a template:
+
+        with open_template(PACKING_SLIP_TEMPLATE) as draft:
+            draft.set_value("B13", job_number)
+            draft.save(path)
+    """
+    template = _get_template(template_name)
+    with template.lock:
+        draft = TemplateDraft(template.workbook, template.manifest)
+        try:
+            yield draft
+        finally:
+            if not draft._restore():
+                # Parse the template again next time rather than reuse a dirty copy
+                with _templates_lock:
+                    if _templates.get(template.path) is template:
+                        del _templates[template.path]
@@ -0,0 +1,87 @@
+"""Daily report writing, including more orders than the template has rows for"""
+import pytest
+from openpyxl import load_workbook
+
+import daily_orders
+from template_cache import open_template, DAILY_REPORT_TEMPLATE
+
+TEMPLATE_DATA_ROWS = 30
+LEGEND = ["LEGEND:", "S-U", "RFP", "SUB", "LASER", "RTS", "FILL INS", "EMB"]
+
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    # Reports go to ~/Desktop/Decopress_Downloads
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    return tmp_path
+
+def make_orders(count):
+    return [{
+        "Job Number": str(1000 + i),
+        "Short Description": f"job {i}",
+        "Letter Code": "SUB",
+        "Location": "rfp",
+        "Quantity": i + 1,
+        "Has Patch Apply": i % 2 == 0,
+        "Days Remaining": (i * 7) % 5,
+        "Change": "NEW" if i % 3 == 0 else "",
+    } for i in range(count)]
+
+def read_report(path):
+    sheet = load_workbook(path).active
+    # Legend rows have nothing in the job number column
+    return sheet, {sheet.cell(row, 4).value: row for row in range(1, sheet.max_row + 1)
+                   if sheet.cell(row, 4).value in LEGEND and sheet.cell(row, 2).value is None}
+
+def job_rows(sheet):
+    return [row for row in range(5, sheet.max_row + 1)
+            if str(sheet.cell(row, 2).value or "").isdigit()]
+
+@pytest.mark.parametrize("count", [TEMPLATE_DATA_ROWS - 1, TEMPLATE_DATA_ROWS, TEMPLATE_DATA_ROWS + 1, 45])
+def test_orders_stay_above_the_legend(count):
+    orders = make_orders(count)
+    dropped = [{"Job Number": "999", "Short Description": "gone"}]
+    path = daily_orders.create_daily_report(orders, dropped)
+    assert path is not None
+
+    sheet, legend = read_report(path)
+    rows = job_rows(sheet)
+    assert len(rows) == count
+    assert rows == list(range(5, 5 + count))
+    # Sorted by days remaining
+    days = [sheet.cell(row, 9).value for row in rows]
+    assert days == sorted(days)
+
+    # The whole legend is there, below the last order, with its merged cells
+    assert list(legend) == LEGEND
+    legend_row = legend["LEGEND:"]
+    assert legend_row == max(5 + count, 5 + TEMPLATE_DATA_ROWS)
+    merged = {str(merged_range) for merged_range in sheet.merged_cells.ranges}
+    assert f"D{legend_row}:I{legend_row}" in merged
+    assert f"E{legend['EMB']}:I{legend['EMB']}" in merged
+    assert sheet.row_dimensions[legend["S-U"]].height == 39.0
+
+    # Dropped jobs come after the legend
+    dropped_rows = [row for row in range(1, sheet.max_row + 1) if sheet.cell(row, 10).value == "DROPPED"]
+    assert len(dropped_rows) == 1 and dropped_rows[0] > legend["EMB"]
+    assert sheet.cell(dropped_rows[0], 11).value == "999"
+
+def test_template_is_clean_after_a_large_report():
+    daily_orders.create_daily_report(make_orders(45), [])
+    with open_template(DAILY_REPORT_TEMPLATE) as draft:
+        assert draft.get_cell(35, 4) == "LEGEND:"
+        assert draft.get_cell(5, 2) is None
+        assert draft.get_cell(50, 4) is None
+        assert draft.sheet.row_dimensions[36].height == 39.0
+        assert "D35:I35" in {str(merged_range) for merged_range in draft.sheet.merged_cells.ranges}
+
+def test_stream_matches_batch():
+    orders = make_orders(40)
+    batch_sheet, _ = read_report(daily_orders.create_daily_report(orders, []))
+    batch = [[cell.value for cell in row] for row in batch_sheet.iter_rows()]
+
+    stream = daily_orders.ReportStream(show_changes=True, maxsize=4)
+    for order in orders:
+        stream.put(order)
+    stream_sheet, _ = read_report(stream.close([]))
+    assert [[cell.value for cell in row] for row in stream_sheet.iter_rows()] == batch
@@ -0,0 +1,42 @@
+"""Scrape snapshot reuse, including jobs whose HW check failed"""
+import pytest
+
+import daily_orders
+from daily_snapshot import ScrapeSnapshot, HW_CHECK_FAILED
+
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    # The snapshot lives in ~/.decopress
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    return tmp_path
+
+def make_record(job_number):
+    return {"Job Number": job_number, "Customer": "ACME", "Process Codes": "HW", "Days Text": "2 days"}
+
+def scrape(snapshot, material_code):
+    """One run over a single HW job; returns the order and whether it had to be enriched"""
+    record = make_record("1001")
+    order = {"Job Number": "1001", "Letter Code": "HW"}
+    needs_check = snapshot.apply(order, record)
+    if needs_check:
+        daily_orders.apply_hw_material_code(order, material_code)
+    snapshot.save([order])
+    return order, needs_check
+
+def test_failed_hw_check_is_redone_next_run():
+    order, needs_check = scrape(ScrapeSnapshot.load(), None)
+    assert needs_check
+    assert order["Letter Code"] == "SUB"
+    assert order[HW_CHECK_FAILED]
+
+    order, needs_check = scrape(ScrapeSnapshot.load(), "EMB")
+    assert needs_check
+    assert order["Letter Code"] == "EMB"
+    assert order.get("Change") == ""
+
+    # Once the check worked, the stored code is reused
+    order, needs_check = scrape(ScrapeSnapshot.load(), None)
+    assert not needs_check
+    assert order["Letter Code"] == "EMB"
+    assert HW_CHECK_FAILED not in order
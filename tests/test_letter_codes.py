@@ -0,0 +1,68 @@
+"""Letter codes from process codes and garment materials, checked against known answers"""
+import pytest
+
+import daily_orders
+import letter_codes
+
+def final_code(process_codes, materials=()):
+    """The code a job ends up with in the report, HW garment check included"""
+    order = {"Job Number": "1", "Letter Code": letter_codes.letter_code(process_codes)}
+    if "HW" in order["Letter Code"]:
+        flags = {flag: flag in materials for flag in letter_codes.MATERIAL_FLAGS}
+        daily_orders.apply_hw_material_code(order, letter_codes.material_code(flags))
+    return order["Letter Code"]
+
+@pytest.mark.parametrize("process_codes, expected", [
+    (["AP", "EM"], "SUB/EMB"),
+    (["AP"], "SUB"),
+    (["EM"], "EMB"),
+    (["DS"], "ETCH"),
+    (["AP", "DS"], "SUB"),
+    (["EM", "DS"], "EMB"),
+    (["em", "ap"], "SUB/EMB"),
+    (["PA"], ""),
+    (["SP"], ""),
+    ([], ""),
+    # HW jobs stay pending until their garments are checked
+    (["HW"], "HW"),
+    (["HW", "AP", "EM"], "HW/EMB"),
+    (["HW", "AP"], "HW/SUB"),
+    (["HW", "EM"], "HW/EMB"),
+    (["hw", "DS"], "HW/ETCH"),
+])
+def test_letter_code(process_codes, expected):
+    assert letter_codes.letter_code(process_codes) == expected
+
+@pytest.mark.parametrize("process_codes, materials, expected", [
+    (["HW", "EM"], {"ETCH"}, "EMB/ETCH"),
+    (["HW", "EM"], {"EMB", "ETCH"}, "EMB/ETCH"),
+    (["HW", "EM"], {"EMB"}, "EMB"),
+    (["HW", "AP", "EM"], set(), "EMB"),
+    (["HW", "AP"], {"ETCH"}, "SUB/ETCH"),
+    (["HW", "AP"], {"EMB"}, "SUB"),
+    (["HW", "DS"], {"EMB"}, "ETCH"),
+    (["HW", "DS"], set(), "ETCH"),
+    (["HW"], {"EMB", "ETCH"}, "EMB/ETCH"),
+    (["HW"], {"EMB"}, "EMB"),
+    (["HW"], {"ETCH"}, "ETCH"),
+    (["HW"], {"SUB"}, "SUB"),
+    (["HW"], set(), "SUB"),
+    # Jobs without HW ignore the garments
+    (["EM"], {"ETCH"}, "EMB"),
+])
+def test_hw_jobs_merge_the_garment_material(process_codes, materials, expected):
+    assert final_code(process_codes, materials) == expected
+
+@pytest.mark.parametrize("process_codes, expected", [
+    (["PA"], True),
+    (["pa", "EM"], True),
+    (["HW", "PA", "AP"], True),
+    (["AP"], False),
+    (["SP"], False),
+    ([], False),
+])
+def test_patch_apply(process_codes, expected):
+    assert letter_codes.has_patch_apply(process_codes) is expected
+
+def test_patch_apply_does_not_change_the_letter_code():
+    assert letter_codes.letter_code(["PA", "EM"]) == letter_codes.letter_code(["EM"]) == "EMB"
@@ -0,0 +1,62 @@
+"""Garment material matching (letter_codes.MaterialMatcher) and its keyword file"""
+import json
+import pytest
+
+import letter_codes
+from letter_codes import MaterialMatcher, DEFAULT_MATERIAL_KEYWORDS
+
+@pytest.fixture
+def matcher():
+    return MaterialMatcher(DEFAULT_MATERIAL_KEYWORDS)
+
+@pytest.mark.parametrize("text, expected", [
+    ("NIKE EMBROIDERED CAP", {"EMB"}),
+    ("Richardson 112 faux leather patch", {"ETCH"}),
+    ("LEATHERETTE", {"ETCH"}),
+    ("DECO TWILL", {"SUB"}),
+    ("SIMWOVEN LABEL", {"SUB"}),
+    ("EMB ON DENIM", {"EMB", "ETCH"}),
+    ("BLACK MESH TRUCKER", set()),
+    ("", set()),
+    (None, set()),
+])
+def test_default_keywords(matcher, text, expected):
+    assert matcher.match(text) == expected
+
+def test_keyword_starting_inside_another(matcher):
+    # EMB starts inside SUEDE, which the scan already consumed
+    assert matcher.match("SUEDEMB") == {"ETCH", "EMB"}
+    assert matcher.match("TWILLEATHER") == {"SUB", "ETCH"}
+
+def test_longest_keyword_stands_for_the_ones_inside_it():
+    matcher = MaterialMatcher({"LONG": ["EMBROIDERY"], "SHORT": ["BROID"]})
+    assert matcher.match("EMBROIDERY") == {"LONG", "SHORT"}
+    assert matcher.match("BROIDERY") == {"SHORT"}
+
+def test_overlapping_keywords_of_different_materials():
+    matcher = MaterialMatcher({"X": ["ABC"], "Y": ["BCD"], "Z": ["CDEF"]})
+    assert matcher.match("ABCDEF") == {"X", "Y", "Z"}
+    assert matcher.match("abcd") == {"X", "Y"}
+    assert matcher.match("BCDE") == {"Y"}
+
+def test_flags_combine_every_text(matcher):
+    assert matcher.flags(["NIKE CAP", "woven patch", "emb logo"]) == {"EMB": True, "ETCH": False, "SUB": True}
+
+def test_no_keywords():
+    assert MaterialMatcher({}).match("EMBROIDERY") == set()
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    (tmp_path / ".decopress").mkdir()
+    return tmp_path
+
+def test_user_keyword_file_wins(home):
+    (home / ".decopress" / letter_codes.KEYWORDS_FILE).write_text(json.dumps({"emb": ["stitch"]}))
+    assert letter_codes.load_material_keywords() == {"EMB": ["STITCH"]}
+
+def test_unreadable_user_file_falls_back(home):
+    (home / ".decopress" / letter_codes.KEYWORDS_FILE).write_text("{not json")
+    keywords = letter_codes.load_material_keywords()
+    assert set(keywords) == {"EMB", "ETCH", "SUB"}
@@ -0,0 +1,50 @@
+"""The job list update check (waits.LIST_UPDATED_JS), run in Node against a fake document"""
+import json
+import shutil
+import subprocess
+import pytest
+
+from waits import LIST_UPDATED_JS
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+
+# Each state is what the page shows at one poll: is the old first row still
+# attached, which page is active, and how many rows the table has
+FAKE_PAGE_JS = """
+const states = %s;
+const marker = {isConnected: true};
+let state;
+global.document = {
+    querySelector: selector => state.active === null ? null : {getAttribute: () => String(state.active)},
+    querySelectorAll: selector => new Array(state.rows),
+};
+const listUpdated = %s;
+console.log(JSON.stringify(states.map(current => {
+    state = current;
+    marker.isConnected = current.old_rows;
+    return listUpdated([marker, current.expected === undefined ? 2 : current.expected]);
+})));
+"""
+
+def poll(*states):
+    script = FAKE_PAGE_JS % (json.dumps(states), LIST_UPDATED_JS)
+    result = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+def test_active_page_changes_before_the_rows():
+    assert poll(
+        {"old_rows": True, "active": 1, "rows": 20},   # before the click
+        {"old_rows": True, "active": 2, "rows": 20},   # page 2 marked active, page 1 rows still shown
+        {"old_rows": False, "active": 2, "rows": 0},   # old rows removed, new ones not in yet
+        {"old_rows": False, "active": 2, "rows": 20},  # page 2 rows in
+    ) == [False, False, False, True]
+
+def test_rows_replaced_on_the_wrong_page():
+    assert poll({"old_rows": False, "active": 3, "rows": 20}) == [False]
+
+def test_without_expected_page_or_pagination():
+    assert poll(
+        {"old_rows": True, "active": None, "rows": 20, "expected": None},
+        {"old_rows": False, "active": None, "rows": 20, "expected": None},
+        {"old_rows": False, "active": None, "rows": 20},
+    ) == [False, True, True]
@@ -0,0 +1,150 @@
+"""
+Nested timing spans for the scrapers, written as a Chrome trace.
+
+Tracing is off unless DECOPRESS_TRACE=1 is set (or --trace is passed on the
+command line). When it is off, span() hands back one shared do-nothing object
+and @traced calls the function straight through, so the wrapped code costs
+a flag check.
+
+When it is on, every span becomes a complete ("X") event with its thread, and
+a run decorated with @trace_run writes ~/.decopress/trace.json at the end.
+Open it in chrome://tracing or https://ui.perfetto.dev to see which phase,
+navigation or save took the time.
+"""
+import os
+import sys
+import json
+import time
+import functools
+import threading
+
+TRACE_ENV = "DECOPRESS_TRACE"
+
+_enabled = os.environ.get(TRACE_ENV, "") not in ("", "0") or "--trace" in sys.argv
+_events = []
+_thread_names = {}
+_origin = time.perf_counter()
+
+def get_trace_path():
+    """Get the path the last run's trace is written to"""
+    app_data_dir = os.path.join(os.path.expanduser("~"), ".decopress")
+    os.makedirs(app_data_dir, exist_ok=True)
+    return os.path.join(app_data_dir, "trace.json")
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+def is_enabled():
+    return _enabled
+
+def add_span(name, started, elapsed, cat="phase", **args):
+    """Record a span that was timed elsewhere (started is a perf_counter value, elapsed in seconds)"""
+    if not _enabled:
+        return
+    thread = threading.current_thread()
+    _thread_names.setdefault(thread.ident, thread.name)
+    event = {
+        "name": name,
+        "cat": cat,
+        "ph": "X",
+        "ts": round((started - _origin) * 1e6),
+        "dur": round(elapsed * 1e6),
+        "pid": os.getpid(),
+        "tid": thread.ident,
+    }
+    if args:
+        event["args"] = args
+    _events.append(event)
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "started")
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        add_span(self.name, self.started, time.perf_counter() - self.started, self.cat, **self.args)
+        return False
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NO_SPAN = _NoSpan()
+
+def span(name, cat="phase", **args):
+    """
+    Time a block:
+
+        with span("apply filter"):
+            apply_patch_supply_filter(page)
+    """
+    if not _enabled:
+        return _NO_SPAN
+    return _Span(name, cat, args)
+
+def traced(name=None, cat="phase"):
+    """Decorator form of span(), named after the function by default"""
+    def decorate(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, cat, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def start_trace():
+    """Forget the spans of earlier runs"""
+    _events.clear()
+
+def write_trace(path=None):
+    """Write the spans recorded so far as a Chrome trace; returns the path"""
+    if not _enabled or not _events:
+        return None
+    path = path or get_trace_path()
+    pid = os.getpid()
+    metadata = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "decopress"}}]
+    metadata += [
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}}
+        for tid, thread_name in _thread_names.items()
+    ]
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + list(_events), "displayTimeUnit": "ms"}, f)
+        print(f"🧵 Trace with {len(_events)} spans written to {path}")
+        return path
+    except OSError as e:
+        print(f"Error writing trace: {str(e)}")
+        return None
+
+def trace_run(func):
+    """Trace a whole run: start a fresh trace, time the run and write trace.json at the end"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        start_trace()
+        try:
+            with _Span(f"{func.__module__}.{func.__name__}", "run", {}):
+                return func(*args, **kwargs)
+        finally:
+            write_trace()
+    return wrapper
@@ -1,9 +1,11 @@
 import tkinter as tk
-from tkinter import simpledialog, messagebox
+from tkinter import simpledialog, messagebox, filedialog
 import os
+import re
 from datetime import datetime
 import json
 import base64
+from task_runner import run_on_ui_thread
 
 def _simple_encrypt(text):
     """Simple encoding to avoid storing plaintext passwords"""
@@ -58,6 +60,7 @@ def load_credentials():
     
     return None, None
 
+@run_on_ui_thread
 def get_login_info():
     """Get username and password from user, with option to save"""
     # Try to load saved credentials first
@@ -144,6 +147,7 @@ def get_current_date_formatted(format="%Y-%m-%d"):
     """Get current date in specified format"""
     return datetime.now().strftime(format)
 
+@run_on_ui_thread
 def get_job_number():
     """Get job number from user"""
     root = tk.Tk()
@@ -154,6 +158,59 @@ def get_job_number():
         return job_number.strip()
     return None
 
+def parse_job_numbers(text):
+    """Get the job numbers out of pasted text (any separators), without duplicates"""
+    return list(dict.fromkeys(re.findall(r"\d+", text or "")))
+
+def get_daily_report_path():
+    """Path of today's daily report (it may not exist yet)"""
+    return os.path.join(get_download_path(), f"{get_current_date_formatted()}_DECOPRESS_DAILY.xlsx")
+
+def read_job_numbers_file(file_path):
+    """Read job numbers from a text/CSV file or a daily report workbook"""
+    if file_path.lower().endswith((".xlsx", ".xlsm")):
+        from openpyxl import load_workbook
+        workbook = load_workbook(file_path, read_only=True)
+        try:
+            # Daily reports have the job numbers in column B from row 5
+            values = [row[0] for row in workbook.active.iter_rows(min_row=5, min_col=2, max_col=2, values_only=True)]
+        finally:
+            workbook.close()
+        return parse_job_numbers(" ".join(str(value) for value in values if value is not None))
+
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        return parse_job_numbers(f.read())
+
+@run_on_ui_thread
+def get_job_numbers():
+    """Get a list of job numbers from the user: pasted, from today's report, or from a file"""
+    root = tk.Tk()
+    root.withdraw()  # Hide the main window
+    
+    try:
+        text = simpledialog.askstring(
+            "Job Numbers", "Paste the job numbers (leave empty to load them from a file):", parent=root
+        )
+        if text is None:
+            return []
+        job_numbers = parse_job_numbers(text)
+        if job_numbers:
+            return job_numbers
+        
+        report_path = get_daily_report_path()
+        if os.path.exists(report_path) and messagebox.askyesno(
+                "Job Numbers", "Use the jobs from today's daily report?", parent=root):
+            return read_job_numbers_file(report_path)
+        
+        file_path = filedialog.askopenfilename(
+            title="Choose a file with job numbers", parent=root,
+            filetypes=[("Job lists", "*.txt *.csv *.xlsx"), ("All files", "*.*")]
+        )
+        return read_job_numbers_file(file_path) if file_path else []
+    finally:
+        root.destroy()
+
+@run_on_ui_thread
 def get_shipment_details(job_number):
     """Get shipment details from user"""
     root = tk.Tk()
@@ -192,7 +249,8 @@ def get_shipment_details(job_number):
     
     return shipment_details
 
-# URLs
-LOGIN_URL = "https://intranet.decopress.com"
-DASHBOARD_URL = "https://intranet.decopress.com/JobStatusList/JobStatusList.aspx"
-JOB_URL_TEMPLATE = "https://intranet.decopress.com/Jobs/job.aspx?ID={}" 
\ No newline at end of file
+# URLs - DECOPRESS_INTRANET_URL points the tools at another server (e.g. fake_intranet.py)
+INTRANET_URL = os.environ.get("DECOPRESS_INTRANET_URL", "https://intranet.decopress.com").rstrip("/")
+LOGIN_URL = INTRANET_URL
+DASHBOARD_URL = f"{INTRANET_URL}/JobStatusList/JobStatusList.aspx"
+JOB_URL_TEMPLATE = f"{INTRANET_URL}/Jobs/job.aspx?ID={{}}" 
\ No newline at end of file
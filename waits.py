@@ -0,0 +1,125 @@
+"""
+Event-driven waits for the intranet pages.
+
+Instead of fixed wait_for_timeout sleeps and networkidle polling, these
+helpers wait for the concrete thing that tells us the page is ready: the
+job list rows being replaced, the active pagination item changing, or a
+specific element appearing. Every wait records how long it actually took so
+slow steps show up in the run summary.
+"""
+import time
+from job_list import ROW_SELECTOR, is_list_response
+from tracer import add_span
+
+DEFAULT_TIMEOUT = 15000  # ms
+
+# (label, seconds) for every wait in this process
+WAIT_LOG = []
+
+# True once the old rows are gone, new rows are present and, when we know
+# which page we asked for, the pagination shows it as active. The pagination
+# marks the clicked page active before the rows are swapped, so the active
+# page alone does not mean the new rows are in.
+LIST_UPDATED_JS = """([marker, expectedPage]) => {
+    if (marker && marker.isConnected) {
+        return false;
+    }
+    if (expectedPage !== null) {
+        const active = document.querySelector('ul.pagination li.active[data-lp]');
+        if (active && active.getAttribute('data-lp') !== String(expectedPage)) {
+            return false;
+        }
+    }
+    return document.querySelectorAll('table.data-results tbody tr').length > 0;
+}"""
+
+def _record(label, started):
+    elapsed = time.perf_counter() - started
+    WAIT_LOG.append((label, elapsed))
+    add_span(label, started, elapsed, cat="navigation")
+    print(f"⏱ {label}: {elapsed * 1000:.0f} ms")
+
+def reset_wait_log():
+    WAIT_LOG.clear()
+
+def print_wait_summary():
+    """Print how long the waits of this run took in total"""
+    if not WAIT_LOG:
+        return
+    total = sum(elapsed for _, elapsed in WAIT_LOG)
+    slowest_label, slowest = max(WAIT_LOG, key=lambda entry: entry[1])
+    print(f"⏱ {len(WAIT_LOG)} waits took {total:.1f} s in total (slowest: {slowest_label}, {slowest:.1f} s)")
+
+def wait_for_rows(page, label="job list rows", timeout=DEFAULT_TIMEOUT):
+    """Wait until the job list table has rows"""
+    started = time.perf_counter()
+    page.wait_for_selector(ROW_SELECTOR, state="attached", timeout=timeout)
+    _record(label, started)
+
+def run_and_wait_for_list(page, action, label, expected_page=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Run an action that re-renders the job list (a pagination click, a filter,
+    a list mode change) and wait until the new rows are in. Errors from the
+    action itself are raised; returns False if the list never updated.
+    """
+    marker = page.query_selector(ROW_SELECTOR)
+    responses = []
+
+    def on_response(response):
+        if is_list_response(response):
+            responses.append(time.perf_counter())
+
+    page.on("response", on_response)
+    started = time.perf_counter()
+    updated = True
+    try:
+        action()
+        try:
+            page.wait_for_function(LIST_UPDATED_JS, arg=[marker, expected_page], timeout=timeout)
+        except Exception as e:
+            if "context was destroyed" in str(e) or "navigat" in str(e):
+                # A full postback throws away the document (and our marker) - wait for the new one
+                page.wait_for_load_state("domcontentloaded", timeout=timeout)
+                page.wait_for_selector(ROW_SELECTOR, state="attached", timeout=timeout)
+            else:
+                print(f"⚠️ {label}: job list did not update: {str(e)}")
+                updated = False
+    finally:
+        page.remove_listener("response", on_response)
+
+    if responses:
+        print(f"⏱ {label}: list data arrived after {(responses[0] - started) * 1000:.0f} ms")
+    _record(label, started)
+    return updated
+
+def click_and_wait_for_list(page, element, label, expected_page=None, timeout=DEFAULT_TIMEOUT):
+    """Click an element that re-renders the job list and wait for the new rows"""
+    return run_and_wait_for_list(page, element.click, label, expected_page=expected_page, timeout=timeout)
+
+def back_to_first_page(page):
+    """Put the job list back on page 1 (after a request capture moved it on)"""
+    if page.query_selector("ul.pagination li.active[data-lp='1']"):
+        return
+    first_page = page.query_selector("ul.pagination li[data-lp='1'] a.page-link")
+    if first_page:
+        click_and_wait_for_list(page, first_page, "back to page 1", expected_page=1)
+
+def wait_for_element(page, selector, label, state="visible", timeout=DEFAULT_TIMEOUT):
+    """Wait for one element; returns False instead of raising when it never shows up"""
+    started = time.perf_counter()
+    try:
+        page.wait_for_selector(selector, state=state, timeout=timeout)
+        return True
+    except Exception as e:
+        print(f"{label}: {selector} did not become {state}: {str(e)}")
+        return False
+    finally:
+        _record(label, started)
+
+def goto_and_wait(page, url, selector, label, timeout=30000):
+    """Navigate and wait for the element the caller needs, not for network idle"""
+    started = time.perf_counter()
+    response = page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+    page.wait_for_selector(selector, state="attached", timeout=timeout)
+    _record(label, started)
+    return response